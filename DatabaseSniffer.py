@@ -1,15 +1,40 @@
 
-import arcpy, os, sys
+import os, sys, time, zlib
 from datetime import datetime
 import argparse
-import xlwt
-import pandas as pd
 import codecs
 sys.path.append('./helpers')
-from MessageLogger import MessageLogger
+# Helpers needing numpy (FieldProfiler, CrossTabEngine, ChunkedReader & RowSampler), xlwt, openpyxl & pyarrow are
+# imported by the stages that use them, so schema-only runs & --plan start without them
+from MessageLogger import MessageLogger, ErrorCountHandler
 from DatabaseHelper import DatabaseHelper
+from FieldMatcher import FieldMatcher
+from DomainCatalog import DomainCatalog
+from JobScheduler import JobScheduler
+from SqlAggregator import SqlAggregator
+from WorkspaceBackend import createBackend
+from StageTimer import StageTimer
+from ExcelStreamWriter import ExcelStreamWriter, CsvExcelSink
+from ColumnarWriter import ColumnarWriter, toText
+from RunManifest import RunManifest
+from RunJournal import RunJournal
+from MetadataCache import MetadataCache, CachingBackend
+from ResultRecords import FeatureClassResult, FieldCountResult, SubtypeResult, SubtypeCountResult, DomainViolationResult, \
+    GeometryProfileResult, DuplicateKeyResult, ResultWriter, OUTPUT_BUFFER_BYTES, CROSSTAB_SEPARATOR
 
 ## ---- Set Globals ---- ##
+# Output files written per feature class, in write order
+OUTPUT_NAMES = ["featureCounts", "fieldCounts", "subtypes", "subtypeCounts", "domainViolations", "geometryProfile", "duplicateKeys"]
+# Output name -> (file writer attribute, CSV filepath attribute)
+OUTPUT_FILE_ATTRIBUTES = {
+    "featureCounts": ("featureCountFileWriter", "featureCountCsvFilepath"),
+    "fieldCounts": ("fieldCountFileWriter", "fieldCountCsvFilepath"),
+    "subtypes": ("subtypeFileWriter", "subtypeCsvFilepath"),
+    "subtypeCounts": ("subtypeCountFileWriter", "subtypeCountCsvFilepath"),
+    "domainViolations": ("domainViolationFileWriter", "domainViolationCsvFilepath"),
+    "geometryProfile": ("geometryProfileFileWriter", "geometryProfileCsvFilepath"),
+    "duplicateKeys": ("duplicateKeyFileWriter", "duplicateKeyCsvFilepath")
+}
 
 class DatabaseSnifferDb:
     """
@@ -27,6 +52,8 @@ class DatabaseSnifferDb:
     """
     
     def __init__(self, config, dbParams): 
+        self.config = config
+        self.dbParams = dbParams
         globals = config["globals"]
         domainSchemaConfig = globals["domainSchemaConfig"]
         featureCountConfig = globals["featureCountConfig"]
@@ -39,7 +66,15 @@ class DatabaseSnifferDb:
         self.outDir = globals["outDir"]
         self.csvLoggingFilepath = globals["csvLoggingFilepath"]
         self.mergeCsvsToExcel = globals["mergeCsvsToExcel"].upper()
+        # xlsx files are streamed while the CSVs are written (no re-read of the CSVs)
+        self.excelOutput = globals.get("excelOutput", "YES").upper()
+        self.mergedExcelWriter = None
         self.skipSystemFieldTypes = globals["skipSystemFieldTypes"]
+        # Rows per chunk read by the shared batched reader & memory ceiling per chunk
+        self.chunkSize = int(globals.get("chunkSize", 50000))
+        self.maxChunkMemoryMB = globals.get("maxChunkMemoryMB", 256)
+        # Number of worker processes for feature class profiling (1 = serial, 0 = all cores)
+        self.workers = int(globals.get("workers", 1)) or os.cpu_count()
                 
         # Opens write files for read/write (w) of append (a) from config
         self.overWriteOption = "w" if globals["overWriteOption"] == "YES" else "a"
@@ -60,6 +95,13 @@ class DatabaseSnifferDb:
         self.fieldCountLimit = fieldCountConfig["fieldCountLimit"]
         self.includeFieldCountFields = fieldCountConfig["includeFieldCountFields"] if dbParams["includeFieldCountFields"] == "GLOBAL" else dbParams["includeFieldCountFields"]        
         self.excludeFieldCountFields = fieldCountConfig["excludeFieldCountFields"] if dbParams["excludeFieldCountFields"] == "GLOBAL" else dbParams["excludeFieldCountFields"]
+        self.fieldCountMatcher = FieldMatcher(self.includeFieldCountFields, self.excludeFieldCountFields)
+
+        # Config database aggregation (GROUP BY) params for enterprise & SQLite workspaces
+        sqlPushdownConfig = globals.get("sqlPushdownConfig", {})
+        self.sqlPushdownRun = sqlPushdownConfig.get("run", "NO").upper()
+        self.sqlPushdownTableSuffix = sqlPushdownConfig.get("tableSuffix", "")
+        self.sqlAggregator = None
 
         # Config Subtype file params
         self.subtypeRun = subtypeConfig["run"].upper()    
@@ -70,8 +112,34 @@ class DatabaseSnifferDb:
         self.subtypeCountHeaders = subtypeCountConfig["subtypeCountHeaders"]
         self.includeSubtypeCountFields = subtypeCountConfig["includeSubtypeCountFields"] if dbParams["includeSubtypeCountFields"] == "GLOBAL" else dbParams["includeSubtypeCountFields"]        
         self.excludeSubtypeCountFields = subtypeCountConfig["excludeSubtypeCountFields"] if dbParams["excludeSubtypeCountFields"] == "GLOBAL" else dbParams["excludeSubtypeCountFields"]
+        self.subtypeCountMatcher = FieldMatcher(self.includeSubtypeCountFields, self.excludeSubtypeCountFields)
         self.subtypeShowMarginCount = subtypeCountConfig["subtypeShowMarginCount"]
         self.subtypeCountCategoryLimit = subtypeCountConfig["subtypeCountCategoryLimit"]
+
+        # Config domain conformance checks of the field & subtype domains (checked in the field counts pass)
+        domainValidationConfig = globals.get("domainValidationConfig", {})
+        self.domainValidationRun = domainValidationConfig.get("run", "NO").upper()
+        self.domainViolationHeaders = domainValidationConfig.get("domainViolationHeaders", {})
+        self.domainSampleValueLimit = int(domainValidationConfig.get("sampleValueLimit", 5))
+        self.domainValidator = None # DomainValidator of the current feature class (None = no domain checks)
+
+        # Config geometry profile (SHAPE@ vertex & part counts, NULL/empty/degenerate geometries & extent per subtype)
+        geometryProfileConfig = globals.get("geometryProfileConfig", {})
+        self.geometryProfileRun = geometryProfileConfig.get("run", "NO").upper()
+        self.geometryProfileHeaders = geometryProfileConfig.get("geometryProfileHeaders", {})
+        self.geometrySampleRate = float(geometryProfileConfig.get("geometrySampleRate", 1.0))
+        self.geometrySampleThresholdRowCount = int(geometryProfileConfig.get("sampleThresholdRowCount", 1000000))
+
+        # Config duplicate checks of single & composite keys (hashed in the field counts pass when it reads every row)
+        duplicateKeyConfig = globals.get("duplicateKeyConfig", {})
+        self.duplicateKeyRun = duplicateKeyConfig.get("run", "NO").upper()
+        self.duplicateKeyHeaders = duplicateKeyConfig.get("duplicateKeyHeaders", {})
+        self.duplicateKeys = [[key] if isinstance(key, str) else list(key) for key in duplicateKeyConfig.get("keys", [])]
+        self.duplicateKeyMemoryBudgetMB = float(duplicateKeyConfig.get("memoryBudgetMB", 64))
+        self.duplicateKeySpillPartitions = int(duplicateKeyConfig.get("spillPartitions", 16))
+        self.duplicateKeySpillDir = duplicateKeyConfig.get("spillDir") or None
+        self.duplicateSampleKeyLimit = int(duplicateKeyConfig.get("sampleKeyLimit", 5))
+        self.duplicateKeyFinder = None # DuplicateKeyFinder of the current feature class (None = no key checks)
                 
         # Config database params
         self.sourceDir = dbParams["sourceDir"]
@@ -80,35 +148,121 @@ class DatabaseSnifferDb:
         self.fcList = [w.upper() for w in dbParams["fcList"]] if len(dbParams["fcList"]) > 0 else []
         self.skipFcList = [w.upper() for w in dbParams["skipFcList"]] if len(dbParams["skipFcList"]) > 0 else []
         
-        # Dynamically-generated params
-        #Pandas field count data frame object
-        self.fieldCountdf = None
+        # Concurrent jobs get their own logger & log file so output does not interleave
+        self.maxConcurrentJobs = int(globals.get("maxConcurrentJobs", 1))
+        self.loggerName = "FeatureCounter{0}".format(self.keyword)
+        if self.maxConcurrentJobs > 1:
+            logRoot, logExt = os.path.splitext(self.csvLoggingFilepath)
+            self.csvLoggingFilepath = '{0}{1}{2}'.format(logRoot, self.keyword, logExt)
         
+        # Dynamically-generated params
         self.outExcelFilepath = None
 
         self.featureCountCsvFilepath = None
-        self.featureCountFileWriter = None # Output file object for CSV summaries (until converted to pandas df)       
+        self.featureCountFileWriter = None # Output file object for CSV summaries (streams the rows to Excel too)       
         
         self.fieldCountCsvFilepath = None
-        self.fieldCountFileWriter = None # Output file object for CSV summaries (until converted to pandas df)
+        self.fieldCountFileWriter = None # Output file object for CSV summaries (streams the rows to Excel too)
         
         self.subtypeCsvFilepath = None
-        self.subtypeFileWriter = None # Output file object for CSV subtype summaries (until converted to pandas df)
+        self.subtypeFileWriter = None # Output file object for CSV subtype summaries (streams the rows to Excel too)
         
         self.subtypeCountCsvFilepath = None
-        self.subtypeCountFileWriter = None # Output file object for CSV subtype summaries (until converted to pandas df)
+        self.subtypeCountFileWriter = None # Output file object for CSV subtype summaries (streams the rows to Excel too)
+
+        self.domainViolationCsvFilepath = None
+        self.domainViolationFileWriter = None # Output file object for CSV domain violations (streams the rows to Excel too)
+
+        self.geometryProfileCsvFilepath = None
+        self.geometryProfileFileWriter = None # Output file object for CSV geometry profiles (streams the rows to Excel too)
+
+        self.duplicateKeyCsvFilepath = None
+        self.duplicateKeyFileWriter = None # Output file object for CSV duplicate keys (streams the rows to Excel too)
+
+        # ResultWriter per output of the feature class being profiled (records are serialized to CSV text)
+        self.resultWriters = {}
+
+        # Config run profile (wall time, rows read & bytes written per stage, feature class & field)
+        instrumentationConfig = globals.get("instrumentationConfig", {})
+        self.instrumentationRun = instrumentationConfig.get("run", "NO").upper()
+        self.instrumentationTopN = int(instrumentationConfig.get("topN", 10))
+        self.cProfileRun = instrumentationConfig.get("cProfile", "NO").upper()
+        self.stageTimer = StageTimer(self.instrumentationRun == "YES")
 
-        # Set environment
-        arcpy.env.workspace = self.sourceDir
+        # Config typed columnar output (Parquet/Arrow IPC), one row group per feature class
+        columnarOutputConfig = globals.get("columnarOutputConfig", {})
+        self.columnarOutputRun = columnarOutputConfig.get("run", "NO").upper()
+        self.columnarOutputFormat = columnarOutputConfig.get("format", "parquet").lower()
+        self.columnarWriters = {}
+        self.columnarRecords = dict((outputName, []) for outputName in OUTPUT_NAMES)
+        self.datasetRecord = {}
+
+        # Config incremental runs (results of feature classes with an unchanged fingerprint are reused)
+        incrementalConfig = globals.get("incrementalConfig", {})
+        self.incrementalRun = incrementalConfig.get("run", "NO").upper()
+        self.incrementalMaxAgeDays = incrementalConfig.get("maxAgeDays", 0)
+        manifestDir = incrementalConfig.get("manifestDir") or self.outDir
+        self.manifestFilepath = os.path.join(manifestDir, '{0}_RunManifest.json'.format(dbParams["keyword"]))
+        self.runManifest = None
+
+        # Config per feature class checkpoint journal (a failed run continues with the --resume flag)
+        checkpointConfig = globals.get("checkpointConfig", {})
+        self.checkpointRun = checkpointConfig.get("run", "NO").upper()
+        self.journalFilepath = os.path.join(self.outDir, '{0}_RunJournal.jsonl'.format(dbParams["keyword"]))
+        self.resume = False
+        self.runJournal = None
+        self.journaledKeys = set()
+        self.resumeFileSizes = {}
+
+        # Config fixed memory sketches (distinct count estimate & top values) of fields that are not counted exactly
+        fieldSketchConfig = globals.get("fieldSketchConfig", {})
+        self.fieldSketchRun = fieldSketchConfig.get("run", "NO").upper()
+        self.sketchPrecision = int(fieldSketchConfig.get("precision", 14))
+        self.topValuesCapacity = int(fieldSketchConfig.get("topValuesCapacity", 100))
+
+        # Config min/max/mean/standard deviation, quantiles & histogram of numeric & date fields (read in the same pass)
+        numericStatsConfig = globals.get("numericStatsConfig", {})
+        self.numericStatsRun = numericStatsConfig.get("run", "NO").upper()
+        self.statsQuantiles = [float(q) for q in numericStatsConfig.get("quantiles", [0.05, 0.25, 0.5, 0.75, 0.95])]
+        self.statsHistogramBins = int(numericStatsConfig.get("histogramBins", 10))
+        self.statsMaxCentroids = int(numericStatsConfig.get("maxCentroids", 1000))
+
+        # Config approximate profiling of very large feature classes from a random OID sample
+        samplingConfig = globals.get("samplingConfig", {})
+        self.samplingRun = samplingConfig.get("run", "NO").upper()
+        self.samplingThresholdRowCount = int(samplingConfig.get("thresholdRowCount", 1000000))
+        self.sampleRows = int(samplingConfig.get("sampleRows", 100000))
+        self.sampleFraction = float(samplingConfig.get("sampleFraction", 0))
+        self.sampleConfidenceLevel = float(samplingConfig.get("confidenceLevel", 0.95))
+        self.sampleSeed = int(samplingConfig.get("seed", 42))
+        self.samplePlan = None # SamplePlan of the current feature class (None = exact counts)
+
+        # Job summary counters
+        self.errorCounter = ErrorCountHandler()
+        self.rowsScanned = 0
+        self.featureClassesProfiled = 0
+        self.featureClassesReused = 0
+
+        # Config on-disk metadata cache (schema reads are reused while the workspace schema fingerprint is unchanged)
+        metadataCacheConfig = globals.get("metadataCacheConfig", {})
+        self.metadataCacheRun = metadataCacheConfig.get("run", "NO").upper()
+        self.metadataCacheFilepath = os.path.join(metadataCacheConfig.get("cacheDir") or self.outDir, 'DatabaseSniffer_MetadataCache.sqlite')
+        self.gdbItemsTable = metadataCacheConfig.get("gdbItemsTable", "sde.GDB_ITEMS")
+
+        # Set environment. All workspace reads go through the backend (arcpy or SQLite/GeoPackage).
+        self.backend = createBackend(globals.get("workspaceBackend", "auto"), self.sourceDir)
+        if self.metadataCacheRun == "YES":
+            self.backend = CachingBackend(self.backend, MetadataCache(self.metadataCacheFilepath), self.gdbItemsTable)
 
     def _exportDomainSchemaToExcel(self):
+        import xlwt
         workbook = xlwt.Workbook()
 
         # Applying multiple styles
         style = xlwt.easyxf('font: bold 1')  #, color red;')
 
         # Domain list in workspace
-        domains = arcpy.da.ListDomains(arcpy.env.workspace)
+        domains = self._getDomainCatalog().domains
         counter = 0
 
         try:
@@ -175,53 +329,45 @@ class DatabaseSnifferDb:
                         
             domainOutExcelFilepath = os.path.join(self.outDir, '{0}_DomainsOnly.xls'.format(self.keyword))
             workbook.save(domainOutExcelFilepath)
-            arcpy.AddMessage("Finished exporting domains\n")
+            self.backend.addMessage("Finished exporting domains\n")
             self.logger.info("Finished exporting domains\n")     
                    
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in exportDomainSchemaToExcel():\n\t{}".format(ex))
+            self.backend.addMessage("Exception Thrown in exportDomainSchemaToExcel():\n\t{}".format(ex))
+
+    def _getDomainCatalog(self):
+        # Domains are listed once per workspace & shared by all domain consumers
+        return DomainCatalog.forWorkspace(self.sourceDir, self.backend.listDomains)
 
     def _getFieldDomains(self, field):
         try:
-            domains = arcpy.da.ListDomains(arcpy.env.workspace)
-            domainStr = ''
-            # Run through domain values.
-            for domain in domains:
-                if '{0}'.format(field.domain) == '{0}'.format(
-                        domain.name):
-                    # IF THE DOMAIN IN THE FIELD MATCHES A DOMAIN IN THE SDE, IT PRINTS THE VALUES
-                    domainStr += '{0}'.format(domain.name)
-                    if domain.domainType == 'CodedValue':
-                        coded_values = domain.codedValues
-                        domainStr += ',IsCodedValueDomain,'
-                        for val, desc in coded_values.items():
-                            if "," in desc:
-                                desc = desc.replace(",", "'")
-                            domainStr += '{0} : {1}'.format(val, desc) +' | '
-                    
-                    elif domain.domainType == 'Range':
-                        domainStr += ',IsRangeDomain,Min: {0} | Max: {1} |'.format(
-                            domain.range[0], 
-                            domain.range[1])
-                    else:
-                        print('No Domain')
-                        self.logger.info('No Domain')
-            return domainStr
+            # IF THE DOMAIN IN THE FIELD MATCHES A DOMAIN IN THE SDE, RETURNS THE MEMOIZED VALUES
+            return self._getDomainCatalog().domainColumns(field.domain)
                     
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _writeFieldDomains: {0}\n\t".format(ex))
+            self.backend.addMessage("Exception Thrown in _writeFieldDomains: {0}\n\t".format(ex))
             self.logger.error("Exception Thrown in _writeFieldDomains: {0}\n\t".format(ex))
-    
-    def _calcUniqueCounts(self, fc, setDict, fieldName):
-        # counts unique values in field
-        data = [row[0] for row in arcpy.da.SearchCursor(fc, fieldName)]
-        
-        for val in set(data):
-            valCount = data.count(val)
-            setDict[val] = valCount
+            return ['', '', '']
 
-        # Clean up setDict for printing
-        setDict = self._cleanAndLimitSetDict(setDict, fieldName)
+    def _getColumnarFieldDomain(self, field):
+        '''Domain columns of the columnar FieldCounts output (coded values as a list column)'''
+        domain = self._getDomainCatalog().getDomain(field.domain)
+        if domain is None:
+            return {}
+        record = {"domainName": domain.name, "domainType": domain.domainType}
+        if domain.domainType == 'CodedValue':
+            record["domainCodedValues"] = [{"code": toText(code), "name": toText(name)} for code, name in domain.codedValues.items()]
+        elif domain.domainType == 'Range':
+            # Date ranges have no numeric bounds
+            if all(isinstance(val, (int, float)) for val in domain.range[:2]):
+                record["domainRangeMin"] = float(domain.range[0])
+                record["domainRangeMax"] = float(domain.range[1])
+        return record
+
+    def _calcUniqueCounts(self, accumulator):
+        # Unique value counts were filled during the single profiling pass.
+        # Clean up & limit to the most frequent values for printing
+        setDict = self._cleanAndLimitSetDict(accumulator.valueCounter, accumulator.fieldName)
         return setDict
     
     def _checkIfSystemField(self, fieldName, fieldType):
@@ -233,131 +379,609 @@ class DatabaseSnifferDb:
             return True    
         return False     
     
-    def _checkIfCalcSummary(self, fieldName, includeList, excludeList):
-        #Skip any system-generated fields to remove from data sheet entirely
-        # Limits unique values for configured fields (if present)
-        if len(includeList) > 0:
-            if any(f in fieldName for f in includeList):
-                return True
-            # Only calculate unique if include fields count fields is populated. 
-            return False
-          
-        elif fieldName in excludeList: 
-            return False  
-        else: 
-            for exField in excludeList:
-                if exField.upper() in fieldName:
-                    return False                     
+    def _createFieldAccumulators(self, fields):
+        from FieldProfiler import FieldAccumulator
+        from NumericStats import NUMERIC_FIELD_TYPES, DATE_FIELD_TYPES
+        accumulators = []
+        for field in fields:
+            statsField = self.numericStatsRun == "YES" and field.type in NUMERIC_FIELD_TYPES + DATE_FIELD_TYPES
+            if field.type in self.skipSystemFieldTypes:
+                # System fields are never read. Skipped numeric & date types (i.e. Date) are read for their statistics only.
+                if statsField is False:
+                    continue
+                accumulator = FieldAccumulator(field, False)
+                accumulator.statsOnly = True
+            else:
+                calculateUnique = self.fieldCountMatcher.decide(field.name).counted
+                accumulator = FieldAccumulator(field, calculateUnique)
+                if calculateUnique is False and self.fieldSketchRun == "YES":
+                    accumulator.enableSketches(self.sketchPrecision, self.topValuesCapacity)
+            if statsField:
+                accumulator.enableNumericStats(self.statsMaxCentroids)
+            accumulators.append(accumulator)
+        return accumulators
+
+    def _createDomainValidator(self, fields, accumulators, subtypes=None):
+        '''
+            Purpose: domain checks of the profiled fields that have a field domain or a subtype domain (the ListSubtypes
+            FieldValues domains), or None when domain validation isn't run or no profiled field has a domain. The domain
+            rules (coded value sets & range bounds) are shared by every feature class of the workspace.
+        '''
+        if self.domainValidationRun != "YES":
+            return None
+        from DomainValidator import DomainValidator, FieldDomainCheck
+        domainCatalog = self._getDomainCatalog()
+
+        # Subtype field, subtype names & the domain name of every field per subtype code
+        subtypeFieldName = None
+        subtypeNames = {}
+        subtypeDomainNames = {}
+        for subtypeCode, subtypeDict in (subtypes or {}).items():
+            if subtypeDict['SubtypeField'] == '':
+                continue
+            subtypeFieldName = subtypeDict['SubtypeField'].upper()
+            subtypeNames[subtypeCode] = subtypeDict['Name']
+            for fieldName, fieldvals in subtypeDict['FieldValues'].items():
+                subtypeDomainNames.setdefault(fieldName.upper(), {})[subtypeCode] = fieldvals[1].name if fieldvals[1] is not None else None
 
-        for includeField in includeList:
-            if includeField.upper() in fieldName:
-                return False
+        checks = []
+        for accumulator in accumulators:
+            fieldName = str(accumulator.fieldName).upper()
+            if fieldName == subtypeFieldName:
+                continue
+            fieldRule = domainCatalog.domainRule(accumulator.field.domain) if accumulator.field.domain else None
+            subtypeRules = dict((subtypeCode, domainCatalog.domainRule(domainName) if domainName else None)
+                for subtypeCode, domainName in subtypeDomainNames.get(fieldName, {}).items())
+            if fieldRule is not None or any(rule is not None for rule in subtypeRules.values()):
+                checks.append(FieldDomainCheck(accumulator.fieldName, fieldRule, subtypeRules))
+        if len(checks) == 0:
+            return None
+
+        subtypeField = next((f for f in fields if str(f.name).upper() == subtypeFieldName), None)
+        return DomainValidator(checks, subtypeField, subtypeNames)
+
+    def _writeDomainViolations(self, fc, featureClassResult):
+        '''DomainViolations rows of the feature class: values checked & values outside the domain per checked field & subtype'''
+        from CrossTabEngine import NULL_LABEL
+        try:
+            domainValidator = self.domainValidator
+            if domainValidator is None:
+                return
+            sampled = domainValidator.sampled
+            subtypeFieldName = domainValidator.subtypeFieldName
+            for check in domainValidator.checks:
+                charactersWritten = 0
+                rowsChecked = 0
+                for subtypeCode, rule, checkedCount, violationCount, violationValues in check.results(self.domainSampleValueLimit):
+                    rowsChecked += checkedCount
+                    # Rows whose subtype code isn't a subtype are checked against the field domain
+                    if subtypeFieldName is None:
+                        subtypeLabel, subtypeName = '', ''
+                    elif subtypeCode is None:
+                        subtypeLabel, subtypeName = NULL_LABEL, 'NO SUBTYPE (FIELD DOMAIN)'
+                    else:
+                        subtypeLabel, subtypeName = str(subtypeCode), str(domainValidator.subtypeNames.get(subtypeCode, 'NOT A SUBTYPE (FIELD DOMAIN)'))
+
+                    result = DomainViolationResult(featureClassResult, str(check.fieldName), str(subtypeFieldName or ''), subtypeLabel,
+                        subtypeName, rule.domainName, rule.domainType)
+                    result.violationPercent = round(violationCount / float(checkedCount) * 100.0, 4) if checkedCount > 0 else 0
+                    if sampled:
+                        # Sample counts are scaled up to estimated counts
+                        result.sampleStatus = self.samplePlan.describe()
+                        violationValues = [(val, self.samplePlan.countBounds(low)[0], self.samplePlan.countBounds(high)[1]) for val, low, high in violationValues]
+                    result.checkedCount = self.samplePlan.estimateCount(checkedCount) if sampled else checkedCount
+                    result.violationCount = self.samplePlan.estimateCount(violationCount) if sampled else violationCount
+                    if len(violationValues) > 0:
+                        # Count ranges only once the counts are estimates (sampled rows or more distinct values than counted exactly)
+                        result.sampleValues = str(dict((val, high if low == high else '{0} - {1}'.format(low, high)) for val, low, high in violationValues))
+                    charactersWritten += self.resultWriters["domainViolations"].write(result)
+
+                    self._addColumnarRecord("domainViolations", {
+                        "fieldName": check.fieldName,
+                        "subtypeField": subtypeFieldName,
+                        "subtypeCode": toText(subtypeCode),
+                        "subtypeName": subtypeName or None,
+                        "domainName": rule.domainName,
+                        "domainType": rule.domainType,
+                        "checkedCount": result.checkedCount,
+                        "violationCount": result.violationCount,
+                        "violationPercent": float(result.violationPercent),
+                        "sampled": sampled,
+                        "sampleRows": self.samplePlan.sampleRows if sampled else None,
+                        "sampleValues": [{"value": toText(val), "count": high, "low": low, "high": high} for val, low, high in violationValues]
+                    })
+                self.stageTimer.add("domainViolations", fc, check.fieldName, check.seconds, rowsChecked, charactersWritten)
+
+        except Exception as ex:
+            self.backend.addMessage("Exception Thrown in _writeDomainViolations: {0}\n\t".format(ex))
+            self.logger.error("Exception Thrown in _writeDomainViolations: {0}\n\t".format(ex))
+
+    def _writeGeometryProfile(self, fc, featureCount, featureClassResult, shapeType, subtypes=None):
+        '''
+            Purpose: GeometryProfile rows of the feature class. The SHAPE@ geometries are streamed once through the
+            batched reader & summarized per subtype in constant memory: NULL, empty, zero length, zero area & multipart
+            geometries, vertex & part counts & the extent. Feature classes at or over the sample threshold are read
+            from a geometrySampleRate OID sample & their counts are scaled up to estimated counts.
+        '''
+        from CrossTabEngine import NULL_LABEL
+        from GeometryProfiler import GeometryProfiler, GEOMETRY_TOKEN, VERTEX_QUANTILES, vertexBinLabel
+        try:
+            subtypeFieldName = None
+            subtypeNames = {}
+            for subtypeCode, subtypeDict in (subtypes or {}).items():
+                if subtypeDict['SubtypeField'] != '':
+                    subtypeFieldName = subtypeDict['SubtypeField'].upper()
+                    subtypeNames[subtypeCode] = subtypeDict['Name']
+            subtypeField = next((f for f in self.backend.listFields(fc) if str(f.name).upper() == subtypeFieldName), None) if subtypeFieldName else None
+            profiler = GeometryProfiler(shapeType, subtypeField, subtypeNames)
+
+            samplePlan = self._createGeometrySamplePlan(fc, featureCount)
+            reader = self._createChunkedReader(fc, profiler.fields, samplePlan=samplePlan)
+            profiler.profile(reader)
+            self.rowsScanned += reader.rowsRead
+            sampled = samplePlan is not None
+            if sampled:
+                samplePlan.sampleRows = reader.rowsRead
+            # Sample counts are scaled up to estimated counts
+            estimateCount = samplePlan.estimateCount if sampled else int
+
+            charactersWritten = 0
+            for subtypeCode, stats in profiler.results():
+                if subtypeField is None:
+                    subtypeLabel, subtypeName = '', ''
+                elif subtypeCode is None:
+                    subtypeLabel, subtypeName = NULL_LABEL, 'NO SUBTYPE'
+                else:
+                    subtypeLabel, subtypeName = str(subtypeCode), str(subtypeNames.get(subtypeCode, 'NOT A SUBTYPE'))
+
+                result = GeometryProfileResult(featureClassResult, str(subtypeField.name) if subtypeField is not None else '', subtypeLabel, subtypeName)
+                result.geometryCount = estimateCount(stats.rowCount)
+                result.nullCount = estimateCount(stats.nullCount)
+                result.emptyCount = estimateCount(stats.emptyCount)
+                result.zeroLengthCount = estimateCount(stats.zeroLengthCount) if profiler.hasLength else ''
+                result.zeroAreaCount = estimateCount(stats.zeroAreaCount) if profiler.hasArea else ''
+                result.multipartCount = estimateCount(stats.multipartCount)
+                vertexStats, partStats = stats.vertexStats, stats.partStats
+                vertexQuantiles = vertexStats.quantiles(VERTEX_QUANTILES)
+                vertexDistribution = [(low, high, estimateCount(binCount)) for low, high, binCount in stats.vertexDistribution()]
+                hasVertices = vertexStats.count > 0
+                if hasVertices:
+                    result.vertexMinimum = self._formatStat(vertexStats.minValue, False)
+                    result.vertexMaximum = self._formatStat(vertexStats.maxValue, False)
+                    result.vertexMean = self._formatStat(vertexStats.mean, False)
+                    result.vertexQuantiles = str(dict(('p{0:g}'.format(q * 100), self._formatStat(val, False)) for q, val in zip(VERTEX_QUANTILES, vertexQuantiles)))
+                    result.vertexDistribution = str(dict((vertexBinLabel(low, high), binCount) for low, high, binCount in vertexDistribution))
+                    result.partMaximum = self._formatStat(partStats.maxValue, False)
+                    result.partMean = self._formatStat(partStats.mean, False)
+                if stats.extent is not None:
+                    result.xMin, result.yMin, result.xMax, result.yMax = [self._formatStat(val, False) for val in stats.extent]
+                if sampled:
+                    result.sampleStatus = samplePlan.describe()
+                charactersWritten += self.resultWriters["geometryProfile"].write(result)
+
+                self._addColumnarRecord("geometryProfile", {
+                    "subtypeField": subtypeField.name if subtypeField is not None else None,
+                    "subtypeCode": toText(subtypeCode),
+                    "subtypeName": subtypeName or None,
+                    "geometryCount": result.geometryCount,
+                    "nullCount": result.nullCount,
+                    "emptyCount": result.emptyCount,
+                    "zeroLengthCount": result.zeroLengthCount if profiler.hasLength else None,
+                    "zeroAreaCount": result.zeroAreaCount if profiler.hasArea else None,
+                    "multipartCount": result.multipartCount,
+                    "vertexMinimum": int(vertexStats.minValue) if hasVertices else None,
+                    "vertexMaximum": int(vertexStats.maxValue) if hasVertices else None,
+                    "vertexMean": vertexStats.mean if hasVertices else None,
+                    "vertexQuantiles": [{"probability": q, "value": val} for q, val in zip(VERTEX_QUANTILES, vertexQuantiles)] if hasVertices else [],
+                    "vertexDistribution": [{"low": low, "high": high, "count": binCount} for low, high, binCount in vertexDistribution],
+                    "partMaximum": int(partStats.maxValue) if hasVertices else None,
+                    "partMean": partStats.mean if hasVertices else None,
+                    "xMin": stats.extent[0] if stats.extent is not None else None,
+                    "yMin": stats.extent[1] if stats.extent is not None else None,
+                    "xMax": stats.extent[2] if stats.extent is not None else None,
+                    "yMax": stats.extent[3] if stats.extent is not None else None,
+                    "sampled": sampled,
+                    "sampleRows": samplePlan.sampleRows if sampled else None
+                })
+            self.stageTimer.add("geometryProfile", fc, GEOMETRY_TOKEN, profiler.seconds, reader.rowsRead, charactersWritten)
+
+        except Exception as ex:
+            self.backend.addMessage("Exception Thrown in _writeGeometryProfile: {0}\n\t".format(ex))
+            self.logger.error("Exception Thrown in _writeGeometryProfile: {0}\n\t".format(ex))
+
+    def _createDuplicateKeyFinder(self, fields):
+        '''
+            Purpose: duplicate checks of the configured keys whose fields are all in the feature class (matched
+            case-insensitively), or None when duplicate keys aren't run or no configured key is in the feature class.
+        '''
+        if self.duplicateKeyRun != "YES":
+            return None
+        from DuplicateKeyFinder import DuplicateKeyFinder, KeyCheck
+        fieldsByName = dict((str(f.name).upper(), f) for f in fields)
+        checks = []
+        for key in self.duplicateKeys:
+            keyFields = [fieldsByName.get(str(fieldName).upper()) for fieldName in key]
+            if len(keyFields) > 0 and None not in keyFields:
+                checks.append(KeyCheck(keyFields, self.duplicateSampleKeyLimit, self.duplicateKeyMemoryBudgetMB,
+                    self.duplicateKeySpillPartitions, self.duplicateKeySpillDir))
+        if len(checks) == 0:
+            return None
+        return DuplicateKeyFinder(checks)
+
+    def _writeDuplicateKeys(self, fc, featureClassResult):
+        '''
+            Purpose: DuplicateKeys rows of the feature class: rows checked, rows with a NULL key field, distinct &
+            duplicate key counts & sample duplicate keys per configured key. Every row is checked (keys aren't
+            sampled): the keys are hashed in the field counts pass when it reads every row, else by a read of the key
+            fields only. Sample keys of the hashes spilled to disk take a second read of the key fields.
+        '''
+        try:
+            duplicateKeyFinder = self.duplicateKeyFinder
+            if duplicateKeyFinder is None:
+                return
+            if duplicateKeyFinder.scanned is False:
+                # Not read by the field counts pass (not run, sampled or aggregated in the database). A new finder in
+                # case a failed field counts pass added part of the rows.
+                duplicateKeyFinder.close()
+                duplicateKeyFinder = self.duplicateKeyFinder = self._createDuplicateKeyFinder(self.backend.listFields(fc))
+                reader = self._createChunkedReader(fc, duplicateKeyFinder.fields)
+                duplicateKeyFinder.profile(reader)
+                self.rowsScanned += reader.rowsRead
+
+            summaries = duplicateKeyFinder.summarize()
+            if duplicateKeyFinder.needsSampleRead:
+                reader = self._createChunkedReader(fc, duplicateKeyFinder.fields)
+                duplicateKeyFinder.readSamples(reader)
+                self.rowsScanned += reader.rowsRead
+
+            for check, summary in summaries:
+                if check.hashSet.spillCount > 0:
+                    self.logger.info("Spilled the {0} key hashes of {1} to disk {2} times".format(check.keyLabel, fc, check.hashSet.spillCount))
+                sampleKeys = check.samples(summary)
+                result = DuplicateKeyResult(featureClassResult, check.keyLabel)
+                result.rowCount = check.rowCount
+                result.nullKeyCount = check.nullKeyCount
+                result.distinctKeyCount = summary.distinctKeyCount
+                result.duplicateKeyCount = summary.duplicateKeyCount
+                result.duplicateRowCount = summary.duplicateRowCount
+                result.maxOccurrences = summary.maxOccurrences
+                result.isUnique = "YES" if summary.duplicateKeyCount == 0 else "NO"
+                result.sampleKeys = str(dict(sampleKeys))
+                charactersWritten = self.resultWriters["duplicateKeys"].write(result)
+
+                self._addColumnarRecord("duplicateKeys", {
+                    "keyFields": [str(fieldName) for fieldName in check.fieldNames],
+                    "rowCount": check.rowCount,
+                    "nullKeyCount": check.nullKeyCount,
+                    "distinctKeyCount": summary.distinctKeyCount,
+                    "duplicateKeyCount": summary.duplicateKeyCount,
+                    "duplicateRowCount": summary.duplicateRowCount,
+                    "maxOccurrences": summary.maxOccurrences,
+                    "isUnique": summary.duplicateKeyCount == 0,
+                    "sampleKeys": [{"value": toText(keyValue), "count": keyCount, "low": None, "high": None} for keyValue, keyCount in sampleKeys]
+                })
+                self.stageTimer.add("duplicateKeys", fc, check.keyLabel, check.seconds, check.rowCount, charactersWritten)
+
+        except Exception as ex:
+            self.backend.addMessage("Exception Thrown in _writeDuplicateKeys: {0}\n\t".format(ex))
+            self.logger.error("Exception Thrown in _writeDuplicateKeys: {0}\n\t".format(ex))
+
+    def _getSqlAggregator(self):
+        '''GROUP BY aggregation inside the database for enterprise (.sde) & SQLite workspaces. None for file geodatabases.'''
+        if self.sqlPushdownRun != "YES":
+            return None
+        if self.sqlAggregator is None:
+            sqlExecutor = self.backend.createSqlExecutor()
+            # Client-side counting for file geodatabases
+            self.sqlAggregator = SqlAggregator(sqlExecutor, self.sqlPushdownTableSuffix) if sqlExecutor is not None else False
+        return self.sqlAggregator or None
+
+    def _profileFcFieldsInDatabase(self, fc, accumulators):
+        '''Fills the field accumulators from GROUP BY & COUNT queries. Returns False if the database could not aggregate.'''
+        try:
+            sqlAggregator = self._getSqlAggregator()
+            for accumulator in accumulators:
+                if accumulator.countValues:
+                    start = time.perf_counter()
+                    accumulator.addCounts(sqlAggregator.valueCounts(fc, accumulator.fieldName))
+                    accumulator.seconds += time.perf_counter() - start
             
-        return True
-    
-    def _writeFcFields(self, fc, featureCount, datasetValues):
+            # Null counts for all non-counted fields come back from one query
+            nullCountAccumulators = [acc for acc in accumulators if acc.countValues is False]
+            rowCount, nullCounts = sqlAggregator.nullCounts(fc, [acc.fieldName for acc in nullCountAccumulators])
+            for accumulator in nullCountAccumulators:
+                accumulator.rowCount = rowCount
+                accumulator.nullCount = nullCounts[accumulator.fieldName]
+
+            # The database counts distinct values exactly in place of the sketches
+            sketchAccumulators = [acc for acc in nullCountAccumulators if acc.distinctSketch is not None]
+            distinctCounts = sqlAggregator.distinctCounts(fc, [acc.fieldName for acc in sketchAccumulators])
+            for accumulator in sketchAccumulators:
+                accumulator.databaseDistinctCount = distinctCounts[accumulator.fieldName]
+
+            # Count, min, max, mean & variance of the non-counted numeric & date fields from one aggregate query (their
+            # distinct values aren't fetched, so they have no quantiles or histogram)
+            statsAccumulators = [acc for acc in nullCountAccumulators if acc.numericStats is not None]
+            summaries = sqlAggregator.numericSummaries(fc, [acc.fieldName for acc in statsAccumulators],
+                [acc.fieldName for acc in statsAccumulators if acc.numericStats.isDate])
+            for accumulator in statsAccumulators:
+                accumulator.numericStats.addSummary(*summaries[accumulator.fieldName])
+
+            # Domain checks from the subtype x value counts of each domain field. Without subtypes the value counts of the
+            # counted fields are reused & only the non-counted fields are queried.
+            if self.domainValidator is not None:
+                subtypeFieldName = self.domainValidator.subtypeFieldName
+                countedAccumulators = dict((acc.fieldName, acc) for acc in accumulators if acc.countValues)
+                for check in self.domainValidator.checks:
+                    if subtypeFieldName is not None and len(check.subtypeRules) > 0:
+                        check.addCounts(sqlAggregator.crossTabCounts(fc, subtypeFieldName, check.fieldName))
+                    elif check.fieldName in countedAccumulators:
+                        check.addCounts((None, val, valCount) for val, valCount in countedAccumulators[check.fieldName].valueCounter.counts.items())
+                    else:
+                        check.addCounts((None, val, valCount) for val, valCount in sqlAggregator.valueCounts(fc, check.fieldName))
+            return True
+
+        except Exception as ex:
+            self.backend.addMessage("Exception Thrown in _profileFcFieldsInDatabase, counting client-side: {0}\n\t".format(ex))
+            self.logger.warning("Exception Thrown in _profileFcFieldsInDatabase, counting client-side: {0}\n\t".format(ex))
+            return False
+
+    def _profileFcFields(self, fc, fields, subtypes=None):
+        '''
+            Reads the feature class once with a single cursor over every eligible field & fills each field accumulator.
+            The domain checks (self.domainValidator) are filled from the same read & the duplicate key checks
+            (self.duplicateKeyFinder) too when it reads every row.
+        '''
+        accumulators = self._createFieldAccumulators(fields)
+        self.domainValidator = self._createDomainValidator(fields, accumulators, subtypes)
+
+        aggregatedInDatabase = False
+        if len(accumulators) > 0 and self._getSqlAggregator() is not None:
+            aggregatedInDatabase = self._profileFcFieldsInDatabase(fc, accumulators)
+            if aggregatedInDatabase is False:
+                accumulators = self._createFieldAccumulators(fields)
+                self.domainValidator = self._createDomainValidator(fields, accumulators, subtypes)
+
+        from FieldProfiler import FieldProfiler
+        # Keys are only hashed from a read of every row (a sample can't tell if a key is unique)
+        profiler = FieldProfiler(accumulators, self.domainValidator, self.duplicateKeyFinder if self.samplePlan is None else None)
+        if len(accumulators) > 0:
+            if aggregatedInDatabase is False:
+                reader = self._createChunkedReader(fc, profiler.fields, samplePlan=self.samplePlan)
+                profiler.profile(reader)
+                if self.samplePlan is not None:
+                    self.samplePlan.sampleRows = reader.rowsRead
+                    for accumulator in accumulators:
+                        accumulator.sampled = True
+                    if self.domainValidator is not None:
+                        self.domainValidator.sampled = True
+            self.rowsScanned += accumulators[0].rowCount
+
+        return dict((acc.fieldName, acc) for acc in accumulators)
+
+    def _writeFcFields(self, fc, featureCount, featureClassResult, subtypes=None):
         try:
-            # Dictionary of unique value with their counts per field
-            fields = arcpy.ListFields(fc)
+            fields = self.backend.listFields(fc)
 
-            # For each field in fc, count unique values & describe of fields
-            for field in fields:
-                # Set defaults
-                upperCaseField = str(field.name).upper()
-                isSystemSkipField = False        
-                # Skip field if configured to skip
-                if field.type in self.skipSystemFieldTypes:
-                    isSystemSkipField = True    
-                
-                calculateUnique = self._checkIfCalcSummary(upperCaseField, self.includeFieldCountFields, self.excludeFieldCountFields)
+            # Dictionary of field accumulators (unique value counts & null counts) from one pass over the fc
+            accumulators = self._profileFcFields(fc, fields, subtypes)
 
+            # For each field in fc, write unique values & describe of fields
+            for field in fields:
+                fieldStart = time.perf_counter()
                 # Set defaults
+                result = FieldCountResult(featureClassResult, str(field.name), str(field.aliasName), str(field.type),
+                    str(field.length), str(field.precision))
                 setDict = {}  
                 nullPercent = ''                
-                domainStr = ''
-                
-                if isSystemSkipField is False: 
-                    if calculateUnique:
-                        setDict = self._calcUniqueCounts(fc, setDict, upperCaseField)
-                        nullPercent = self._calcNullPercent(fc, field, featureCount, setDict, True)
-                        setDict = str(setDict).replace(',', ';')               
+                distinctCount = ''
+                tailCount = ''
+                nullPercentBounds = ''
+                uniquenessRatio = ''
+                topValues = None
+                valueCounts = None
+                valueBounds = None
+                accumulator = accumulators.get(field.name)
+                sampled = accumulator is not None and accumulator.sampled
+                # Percentages of a sample are over the rows read, not the feature count
+                profiledRows = accumulator.rowCount if sampled else featureCount
+
+                if accumulator is not None and accumulator.statsOnly is False:
+                    if accumulator.countValues:
+                        setDict = self._calcUniqueCounts(accumulator)
+                        nullPercent = self._calcNullPercent(accumulator, profiledRows, setDict)
+                        if isinstance(setDict, dict):
+                            # Distinct non-NULL values, as the estimated distinct count & uniqueness ratio
+                            distinctCount = accumulator.distinctCount
+                            tailCount = accumulator.valueCounter.total - sum(setDict.values())
+                            if sampled:
+                                # Sample counts are scaled up to estimated counts. Distinct values of a sample are a lower bound.
+                                valueBounds = dict((val, self.samplePlan.countBounds(valCount)) for val, valCount in setDict.items())
+                                setDict = dict((val, self.samplePlan.estimateCount(valCount)) for val, valCount in setDict.items())
+                                tailCount = self.samplePlan.estimateCount(tailCount)
+                                distinctCount = '>={0}'.format(distinctCount)
+                                result.valueCountBounds = str(dict((val, '{0} - {1}'.format(low, high)) for val, (low, high) in valueBounds.items()))
+                            valueCounts = setDict
+                        setDict = str(setDict)
                     else:
-                        nullPercent = self._calcNullPercent(fc, field, featureCount, setDict, False)                                    
+                        nullPercent = self._calcNullPercent(accumulator, profiledRows, setDict)                                    
                         setDict = "SKIPPED COUNT"
+
+                    # Distinct count & uniqueness (distinct / non-NULL rows) of every field, exact or estimated. The estimate
+                    # is left blank when the exact Distinct Count is written.
+                    fieldDistinctCount = accumulator.distinctCount
+                    if fieldDistinctCount is not None:
+                        if valueCounts is None or sampled:
+                            result.estimatedDistinct = '>={0}'.format(fieldDistinctCount) if sampled else fieldDistinctCount
+                        nonNullRows = accumulator.rowCount - accumulator.nullCount
+                        uniquenessRatio = round(fieldDistinctCount / float(nonNullRows), 4) if nonNullRows > 0 else ''
+                    if accumulator.topValuesSketch is not None and accumulator.databaseDistinctCount is None:
+                        # Only values that are known to repeat (a unique ID field has no top values)
+                        topValues = accumulator.topValuesSketch.topN(self.fieldCountLimit, minCount=2)
+                        result.topValues = self._formatTopValues(topValues, sampled)
+
+                    if sampled:
+                        result.sampleStatus = self.samplePlan.describe()
+                        if isinstance(nullPercent, (int, float)):
+                            nullPercentBounds = '{0:.2f} - {1:.2f}'.format(*self.samplePlan.percentBounds(nullPercent / 100.0 * accumulator.rowCount))
                     
                     # Calculate domains for all fields for reference
-                    domainStr = self._getFieldDomains(field)
+                    result.domainName, result.domainType, result.domainValues = self._getFieldDomains(field)
                 else:
                     setDict = "SYSTEM FIELD SKIPPED"
                     nullPercent = "NA"
-                    domainStr = ""
+                    distinctCount = "NA"
+                    tailCount = "NA"
+                    result.estimatedDistinct = "NA"
+                    uniquenessRatio = "NA"
+
+                if accumulator is not None and accumulator.numericStats is not None:
+                    self._setNumericStats(result, accumulator.numericStats, sampled)
                     
                 # Appends to CSV file        
-                self.fieldCountFileWriter.write('\n{0},{1},{2},{3},{4},{5},{6},{7},{8}'.format(
-                    datasetValues,
-                    str(field.name), 
-                    str(field.aliasName), 
-                    str(field.type), 
-                    str(field.length), 
-                    str(field.precision), 
-                    setDict, 
-                    nullPercent,
-                    domainStr)
-                )
+                result.fieldCounts = setDict
+                result.nullPercent = nullPercent
+                result.distinctCount = distinctCount
+                result.tailCount = tailCount
+                result.nullPercentBounds = nullPercentBounds
+                result.uniquenessRatio = uniquenessRatio
+                charactersWritten = self.resultWriters["fieldCounts"].write(result)
+
+                if self.columnarOutputRun == "YES":
+                    record = {
+                        "fieldName": field.name,
+                        "fieldAlias": field.aliasName,
+                        "fieldType": field.type,
+                        "fieldLength": field.length,
+                        "fieldPrecision": field.precision,
+                        "countStatus": "COUNTED" if valueCounts is not None else setDict,
+                        "valueCounts": [{"value": toText(val), "count": valCount,
+                            "low": valueBounds[val][0] if valueBounds is not None else None,
+                            "high": valueBounds[val][1] if valueBounds is not None else None} for val, valCount in valueCounts.items()] if valueCounts is not None else None,
+                        "nullPercent": float(nullPercent) if isinstance(nullPercent, (int, float)) else None,
+                        "distinctCount": int(distinctCount) if valueCounts is not None and not sampled else None,
+                        "tailCount": int(tailCount) if valueCounts is not None else None,
+                        "sampled": sampled,
+                        "sampleRows": accumulator.rowCount if sampled else None,
+                        "estimatedDistinct": accumulator.distinctCount if accumulator is not None and (valueCounts is None or sampled) else None,
+                        "uniquenessRatio": uniquenessRatio if isinstance(uniquenessRatio, float) else None,
+                        "topValues": [{"value": toText(val), "count": high, "low": low, "high": high} for val, low, high in topValues] if topValues is not None else None
+                    }
+                    if nullPercentBounds != '':
+                        record["nullPercentLow"], record["nullPercentHigh"] = self.samplePlan.percentBounds(nullPercent / 100.0 * accumulator.rowCount)
+                    if accumulator is not None and accumulator.numericStats is not None:
+                        record.update(self._getColumnarNumericStats(accumulator.numericStats, sampled))
+                    if accumulator is not None and accumulator.statsOnly is False:
+                        record.update(self._getColumnarFieldDomain(field))
+                    self._addColumnarRecord("fieldCounts", record)
+
+                if accumulator is not None:
+                    # Counting time from the shared pass plus formatting & domain lookup time
+                    self.stageTimer.add("fieldCounts", fc, field.name, accumulator.seconds + time.perf_counter() - fieldStart,
+                        accumulator.rowCount, charactersWritten)
                                 
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _writeFcFields: {0}\n\t".format(ex))
+            self.backend.addMessage("Exception Thrown in _writeFcFields: {0}\n\t".format(ex))
             self.logger.error("Exception Thrown in _writeFcFields: {0}\n\t".format(ex))
             
-    def _cleanAndLimitSetDict(self, setDict, upperCaseField):
-        '''Pair down the full list of unique values to the uniqueCountLimit'''
+    def _cleanAndLimitSetDict(self, valueCounter, fieldName):
+        '''Pair down the full list of unique values to the most frequent fieldCountLimit values'''
         try:
-            setDictUpdate = {}
-            
+            fieldDecision = self.fieldCountMatcher.decide(fieldName)
             # Skip if summaryField is configured to be skipped
-            if upperCaseField in self.excludeFieldCountFields: 
+            if fieldDecision.excluded:
                 return "EXCLUDED"
             
-            else: 
-                for exField in self.excludeFieldCountFields:
-                    if exField.upper() in upperCaseField:
-                        return "EXCLUDED"
-            
             # Limits unique values for configured fields (if present)
-            if any(f in upperCaseField for f in self.includeFieldCountFields):
-                return setDict
-            else:
-                for includeField in self.includeFieldCountFields:
-                    if includeField.upper() in upperCaseField:
-                        return setDict
+            if fieldDecision.included:
+                return dict(valueCounter.topN())
 
-            # limit count to the threshold
-            for key in list(setDict)[0:self.fieldCountLimit]:
-                setDictUpdate[key] = setDict[key]
-            # return str(setDictUpdate).replace(",", ";")
-            return setDictUpdate
+            # limit count to the top N most frequent values
+            return dict(valueCounter.topN(self.fieldCountLimit))
 
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _cleanAndLimitSetDict: {0}\n\t".format(ex))
+            self.backend.addMessage("Exception Thrown in _cleanAndLimitSetDict: {0}\n\t".format(ex))
             self.logger.error("Exception Thrown in _cleanAndLimitSetDict: {0}\n\t".format(ex))
         
-    def _calcNullPercent(self, fc, field, featureCount, setDict, calculateUnique):
+    def _scaleStatsCount(self, statsCount, sampled):
+        '''Histogram count of a sampled field as an estimated feature class count'''
+        return self.samplePlan.estimateCount(statsCount) if sampled else statsCount
+
+    def _formatStat(self, val, isDate):
+        '''Statistic as output text/number: dates as ISO date times, numbers to 10 significant digits'''
+        from NumericStats import fromNumber
+        if val is None:
+            return ''
+        if isDate:
+            return fromNumber(val, True).isoformat(sep=' ', timespec='seconds')
+        return int(val) if float(val).is_integer() else float('{0:.10g}'.format(val))
+
+    def _setNumericStats(self, result, numericStats, sampled):
+        '''Minimum, maximum, mean, standard deviation, quantile & histogram columns of a numeric or date field'''
+        from NumericStats import MICROSECONDS_PER_DAY
+        if numericStats.count == 0:
+            return
+        isDate = numericStats.isDate
+        result.minimum = self._formatStat(numericStats.minValue, isDate)
+        result.maximum = self._formatStat(numericStats.maxValue, isDate)
+        if numericStats.hasMoments:
+            result.mean = self._formatStat(numericStats.mean, isDate)
+            standardDeviation = numericStats.standardDeviation
+            if standardDeviation is not None:
+                # Spread of dates in days
+                result.standardDeviation = '{0:.4g} days'.format(standardDeviation / MICROSECONDS_PER_DAY) if isDate else self._formatStat(standardDeviation, False)
+        if numericStats.hasDistribution is False:
+            return
+        result.quantiles = str(dict(('p{0:g}'.format(q * 100), self._formatStat(val, isDate))
+            for q, val in zip(self.statsQuantiles, numericStats.quantiles(self.statsQuantiles))))
+        result.histogram = str(dict(('{0} - {1}'.format(self._formatStat(low, isDate), self._formatStat(high, isDate)), self._scaleStatsCount(binCount, sampled))
+            for low, high, binCount in numericStats.histogram(self.statsHistogramBins)))
+
+    def _getColumnarNumericStats(self, numericStats, sampled):
+        '''Statistics columns of the columnar FieldCounts output (date statistics in the timestamp columns)'''
+        from NumericStats import fromNumber, MICROSECONDS_PER_DAY
+        if numericStats.count == 0:
+            return {}
+        isDate = numericStats.isDate
+        standardDeviation = numericStats.standardDeviation if numericStats.hasMoments else None
+        valueKey, minKey, maxKey, meanKey = ("dateValue", "minimumDate", "maximumDate", "meanDate") if isDate else ("value", "minimum", "maximum", "mean")
+        return {
+            minKey: fromNumber(numericStats.minValue, isDate),
+            maxKey: fromNumber(numericStats.maxValue, isDate),
+            meanKey: fromNumber(numericStats.mean, isDate) if numericStats.hasMoments else None,
+            "standardDeviation": standardDeviation / MICROSECONDS_PER_DAY if isDate and standardDeviation is not None else standardDeviation,
+            "statsExact": numericStats.exact,
+            "quantiles": [{"probability": q, valueKey: fromNumber(val, isDate)}
+                for q, val in zip(self.statsQuantiles, numericStats.quantiles(self.statsQuantiles))],
+            "histogram": [dict([("count", self._scaleStatsCount(binCount, sampled))] + list(zip(["lowDate", "highDate"] if isDate else ["low", "high"],
+                [fromNumber(low, isDate), fromNumber(high, isDate)])))
+                for low, high, binCount in numericStats.histogram(self.statsHistogramBins)]
+        }
+
+    def _formatTopValues(self, topValues, sampled):
+        '''Top values of a sketch as value: count (Space-Saving upper bound) or value: low - high when the counts are not exact'''
+        topValuesDict = {}
+        for val, low, high in topValues:
+            if sampled:
+                low, high = self.samplePlan.countBounds(low)[0], self.samplePlan.countBounds(high)[1]
+            topValuesDict[val] = high if low == high else '{0} - {1}'.format(low, high)
+        return str(topValuesDict)
+
+    def _calcNullPercent(self, accumulator, featureCount, setDict):
         featureCountFloat = None
         nullPercent = 0
         
         try:
-            featureCountFloat = float(featureCount[0])
+            featureCountFloat = float(featureCount)
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in calNullPercent: {0}\n\t".format(ex))
+            self.backend.addMessage("Exception Thrown in calNullPercent: {0}\n\t".format(ex))
             self.logger.error("Exception Thrown in _calcNullPercent: {0}\n\t".format(ex))          
         
-        if calculateUnique is False:
-            whereClause = '"{0}" IS NULL'.format(field.name)
-            nullData = [row[0] for row in arcpy.da.SearchCursor(fc, field.name, where_clause=whereClause)]
-            if float(featureCount[0]) == 0:
+        if accumulator.countValues is False:
+            if featureCountFloat == 0:
                 return 100
             else:
-                return (len(nullData) / float(featureCount[0])) * 100
+                return (accumulator.nullCount / featureCountFloat) * 100
         
         if isinstance(setDict, dict):
             if (len(setDict) == 0):
@@ -365,9 +989,9 @@ class DatabaseSnifferDb:
             elif (len(setDict) > 0):
                 totalNullTypes = 0.0
             
-                for countKey in setDict.keys():
-                    if (countKey in [None, u'None', 'None', '', ' ']):
-                        totalNullTypes += setDict[countKey]
+                # Null-like values are read from the full counts, not the limited setDict
+                for countKey in [None, 'None', '', ' ']:
+                    totalNullTypes += accumulator.valueCounter.get(countKey)
                         
                 nullPercent = (totalNullTypes/featureCountFloat) * 100.0
                 return nullPercent
@@ -375,138 +999,152 @@ class DatabaseSnifferDb:
         else: 
             return "NULL % COUNT SKIPPED"
             
-    def _calcCrossTab(self, inTable, fieldDict, whereClause=None):       
-        crosstab = ''
- 
-        try:            
-            # Skip if summaryField is any datetime field
-            if fieldDict['summaryField'].upper() in self.excludeSubtypeCountFields: 
-                return 'FIELD EXCLUDED'
-            
-            else: 
-                for exField in self.excludeSubtypeCountFields:
-                    if exField.upper() in fieldDict['summaryField'].upper():
-                        return 'FIELD EXCLUDED'
-                        
-            if crosstab == '':            
-                # inFields = [fieldDict['subtypeField'], fieldDict['summaryField']]
-                inFields = [fieldDict['subtypeField'], fieldDict['summaryField']]
-                
-                data = [row for row in arcpy.da.SearchCursor(inTable, inFields, where_clause=whereClause)]
-                
-                # if None in data value row[1]. Continues to throw 'No objects to concatenate'
-                newData = []
-                for i in data:
-                    newVal = []
-                    if i[1] is None:
-                        newVal = [i[0], 'Null']
-                    else:
-                        newVal = i
-                    newData.append(newVal)
-                    data = newData
-                                    
-                df = pd.DataFrame(data, columns=inFields)
-                                    
-                crosstabObj = pd.crosstab(index=df[inFields[0]], columns=df[inFields[1]], dropna=False, margins=True, margins_name="Total")
-                
-                if isinstance(crosstabObj, pd.DataFrame):
-                    # Converts to str type
-                    numColumns = len(crosstabObj.columns.to_list())
-                    if numColumns > self.subtypeCountCategoryLimit:
-                        crosstab = "EXCEEDED {0} CATEGORY LIMIT. Found {1}".format(self.subtypeCountCategoryLimit, numColumns)
-                    else:
-                        crosstab = crosstabObj.to_csv(sep=",")
-                
-            return str(crosstab)  
-                     
+    def _calcCrossTabCountsInDatabase(self, inTable, inFields, whereClause=None):
+        '''(subtype, value, count) rows from a GROUP BY query, or None to read & count client-side'''
+        sqlAggregator = self._getSqlAggregator()
+        if sqlAggregator is None:
+            return None
+        try:
+            return sqlAggregator.crossTabCounts(inTable, inFields[0], inFields[1], whereClause)
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _calcCrossTab: {0}\n\t".format(ex))
-            self.logger.error("Exception Thrown in _calcCrossTab: {0}\n\t".format(ex))
+            self.backend.addMessage("Exception Thrown in _calcCrossTabCountsInDatabase, counting client-side: {0}\n\t".format(ex))
+            self.logger.warning("Exception Thrown in _calcCrossTabCountsInDatabase, counting client-side: {0}\n\t".format(ex))
+            return None
 
-    def _formatCrossTab(self, fc, field, formattedHeaderVals, subtypeDict):       
-        crosstabObj = ''
-        # Only check fields that are not the subtype field
-        if field != subtypeDict['SubtypeField']:
-                
-            # Summarize field by subtype field (if there is a subtype)
-            if subtypeDict['SubtypeField'] not in [u'', None]:
-                fieldDict = {'subtypeField': subtypeDict['SubtypeField'], 'summaryField': field}
+    def _checkIfExcludedCrossTab(self, summaryField):
+        # Skip if summaryField is any datetime field
+        return self.subtypeCountMatcher.decide(summaryField).excluded
 
-                try:
-                    # crosstab = self._formatCrossTab(fc, fieldDict, whereClause)
-                    crosstabObj = self._calcCrossTab(fc, fieldDict)
-                        
-                except Exception as ex:
-                    arcpy.AddMessage("Exception Thrown in crosstab: {0}\n\t".format(ex))
-                    
+    def _createChunkedReader(self, inTable, fields, whereClause=None, samplePlan=None):
+        '''Shared batched reader used by every profiling stage (chunkSize rows per chunk within maxChunkMemoryMB)'''
+        from ChunkedReader import ChunkedReader
+        if samplePlan is not None:
+            from RowSampler import SampledCursor
+            # Only the rows of the feature class's sample are read (see _createSamplePlan)
+            cursorFactory = lambda fieldNames: SampledCursor(self.backend.searchCursor, inTable, fieldNames, samplePlan, whereClause)
+        else:
+            cursorFactory = lambda fieldNames: self.backend.searchCursor(inTable, fieldNames, whereClause)
+        return ChunkedReader(cursorFactory, fields, self.chunkSize, self.maxChunkMemoryMB)
+
+    def _calcCrossTabs(self, inTable, subtypeField, summaryFields, whereClause=None):
+        '''
+            Purpose: cross-tabulates every summary field against the subtype field. Returns a dictionary of CrossTab 
+            (or 'FIELD EXCLUDED') per summary field.
+        '''
+        from CrossTabEngine import CrossTabEngine
+        crossTabs = {}
+        clientSideFields = []
+        # Rows of the feature class (each database crosstab counts every row once)
+        databaseRowsCounted = 0
+        try:
+            for summaryField in summaryFields:
+                if self._checkIfExcludedCrossTab(summaryField):
+                    crossTabs[summaryField] = 'FIELD EXCLUDED'
+                    continue
+
+                start = time.perf_counter()
+                crossTabCounts = self._calcCrossTabCountsInDatabase(inTable, [subtypeField, summaryField], whereClause)
+                if crossTabCounts is not None:
+                    # Subtype x value counts were aggregated in the database
+                    rowsCounted = sum(row[2] for row in crossTabCounts)
+                    databaseRowsCounted = max(databaseRowsCounted, rowsCounted)
+                    crossTabs[summaryField] = CrossTabEngine.fromCounts(subtypeField, summaryField, crossTabCounts)
+                    self.stageTimer.add("subtypeCounts", inTable, summaryField, time.perf_counter() - start, rowsCounted)
+                else:
+                    clientSideFields.append(summaryField)
+
+            if len(clientSideFields) > 0:
+                # Subtype field & every remaining summary field are read once, chunk by chunk
+                fieldsByName = dict((str(f.name).upper(), f) for f in self.backend.listFields(inTable))
+                readFields = [fieldsByName[f.upper()] for f in [subtypeField] + clientSideFields]
+                reader = self._createChunkedReader(inTable, readFields, whereClause, self.samplePlan)
+                engine = CrossTabEngine(subtypeField, clientSideFields)
+                for columnChunks in reader.chunks():
+                    engine.addChunk(columnChunks[0], columnChunks[1:])
+                self.rowsScanned += reader.rowsRead
+                if self.samplePlan is not None:
+                    self.samplePlan.sampleRows = reader.rowsRead
+                    crossTabs.update((f, crossTab.scaled(self.samplePlan.scale)) for f, crossTab in engine.crossTabs().items())
+                else:
+                    crossTabs.update(engine.crossTabs())
+                for summaryField in clientSideFields:
+                    self.stageTimer.add("subtypeCounts", inTable, summaryField, engine.fieldSeconds[summaryField], reader.rowsRead)
             else:
-                crosstabObj = 'NO SUBTYPE ASSIGNED'
-             
-        crosstabFrmt = ''                   
-        if crosstabObj in [None, 'None', '', 'NO SUBTYPE ASSIGNED']:
-            crosstabFrmt = 'NO SUBTYPE ASSIGNED'
-        elif crosstabObj == 'FIELD EXCLUDED':
-            crosstabFrmt = 'FIELD EXCLUDED IN CONFIG'            
-        else:        
-            # Remove line breaks
-            crosstabFrmt = crosstabObj.rstrip('\r\n')
-            # crosstabFrmt = crosstabObj.replace('\r\n', '\n')
-            
-            if self.subtypeShowMarginCount == 'YES':
-                # Re-format 1st occurance of VERTICAL Total crosstab str
-                crosstabFrmt = crosstabFrmt.replace('Total\r\n', 'Total\n{0},'.format(formattedHeaderVals), 1)
-                                    
-                # Re-format 1st occurance of HORIZONTAL Total crosstab str
-                crosstabFrmt = crosstabFrmt.replace('\r\nTotal', '\n{0},Total'.format(formattedHeaderVals), 1)  
-                
-            # Replace double returns with single
-            crosstabFrmt = crosstabFrmt.replace('\r\n', '\n' + formattedHeaderVals)
-            
-            # Replace all misaligned cells ,| to
-        
-        
-        allData = '{0},{1}\n'.format(formattedHeaderVals, crosstabFrmt)   
-        allData = allData.replace('|,,', '|,')
-        return allData
+                self.rowsScanned += databaseRowsCounted
+                     
+        except Exception as ex:
+            self.backend.addMessage("Exception Thrown in _calcCrossTabs: {0}\n\t".format(ex))
+            self.logger.error("Exception Thrown in _calcCrossTabs: {0}\n\t".format(ex))
+        return crossTabs
+
+    def _getCrossTabStatus(self, field, subtypeField, crossTab):
+        '''Status written in place of a field's crosstab, or None when the crosstab itself is written'''
+        if field == subtypeField or crossTab is None:
+            return 'NO SUBTYPE ASSIGNED'
+        elif crossTab == 'FIELD EXCLUDED':
+            return 'FIELD EXCLUDED IN CONFIG'
+
+        # The Total margin column counts against the limit whether or not it is written (as the pandas crosstab did)
+        numColumns = crossTab.categoryCount + 1
+        if numColumns > self.subtypeCountCategoryLimit:
+            return 'EXCEEDED {0} CATEGORY LIMIT. Found {1}'.format(self.subtypeCountCategoryLimit, numColumns)
+        return None
 
-    def _writeSubtypeCounts(self, fc, subtypes, datasetValues): 
+    def _formatCrossTab(self, field, featureClassResult, subtypeField, crossTab):
+        '''Output records for one field's crosstab: its rows, or the status written in place of the crosstab'''
+        status = self._getCrossTabStatus(field, subtypeField, crossTab)
+        if status is not None:
+            return [SubtypeCountResult(featureClassResult, field, [status])]
+
+        records = [SubtypeCountResult(featureClassResult, field, row) for row in crossTab.rows(self.subtypeShowMarginCount == 'YES')]
+        if crossTab.sampled:
+            records.append(SubtypeCountResult(featureClassResult, field, ['ESTIMATED COUNTS. {0}'.format(self.samplePlan.describe())]))
+        return records
+
+    def _writeSubtypeCounts(self, fc, subtypes, featureClassResult): 
         try: 
-            # Write subtypes only if configured
-            continueSubtypeCounts = True
-            
             for subtypeCode, subtypeDict in subtypes.items():   
-                if continueSubtypeCounts is False: break              
-                fields = subtypeDict['FieldValues']
+                fields = list(subtypeDict['FieldValues'].keys())
+                subtypeField = subtypeDict['SubtypeField'] if subtypeDict['SubtypeField'] != '' else False
                 
-                
-                # Iterate through each subtype dictionary & writes subtype name (field) & list of values (fieldvals)                
-                for field, fieldvals in fields.items():   
-                
-                    subtypeField = subtypeDict['SubtypeField'] if subtypeDict['SubtypeField'] != '' else False
-                                                        
-                    formattedHeaderVals = '{0},{1},|,'.format(datasetValues,field)
-                    
-                    if subtypeField is False:
-                        self.subtypeCountFileWriter.write(formattedHeaderVals + 'NO SUBTYPE ASSIGNED\n')
-                        # continueSubtypeCounts = False # end writing for no subtypes
-                        break
-                    else:
-                        # Only run subtype comparisons for configured fields
-                        calcSubtypeCrossTab = self._checkIfCalcSummary(field.upper(), self.includeSubtypeCountFields, self.excludeSubtypeCountFields)
-                        if calcSubtypeCrossTab:
-                            data = self._formatCrossTab(fc, field, formattedHeaderVals, subtypeDict)
-                            self.subtypeCountFileWriter.write(data)
-                            continueSubtypeCounts = False
-                            continue
+                if subtypeField is False:
+                    if len(fields) > 0:
+                        self.resultWriters["subtypeCounts"].write(SubtypeCountResult(featureClassResult, fields[0], ['NO SUBTYPE ASSIGNED']))
+                        self._addColumnarRecord("subtypeCounts", {"fieldName": fields[0], "status": "NO SUBTYPE ASSIGNED"})
+                    continue
+
+                # Only run subtype comparisons for configured fields
+                countFields = [f for f in fields if self.subtypeCountMatcher.decide(f).counted]
+                if len(countFields) == 0:
+                    continue
+
+                # All fields share one read of the feature class (the field list is the same for every subtype)
+                crossTabs = self._calcCrossTabs(fc, subtypeField, [f for f in countFields if f != subtypeField])
+                for field in countFields:
+                    self.resultWriters["subtypeCounts"].writeRecords(self._formatCrossTab(field, featureClassResult, subtypeField, crossTabs.get(field)))
+                    if self.columnarOutputRun == "YES":
+                        self._addColumnarCrossTab(field, subtypeField, crossTabs.get(field))
                                             
                 print('\nCompleted with SubtypeField: {0} - {1}'.format(str(subtypeCode), str(subtypeDict['Name'])))
                 self.logger.info('Completed with SubtypeField: {0} - {1}'.format(str(subtypeCode), str(subtypeDict['Name']))) 
+                break
                 
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _writeSubtypeCounts: {0}\n\t".format(ex))
+            self.backend.addMessage("Exception Thrown in _writeSubtypeCounts: {0}\n\t".format(ex))
             self.logger.error("Exception Thrown in _writeSubtypeCounts: {0}\n\t".format(ex))
 
-    def _writeSubtypes(self, subtypes, datasetValues): 
+    def _addColumnarCrossTab(self, field, subtypeField, crossTab):
+        '''Crosstab as its non-zero (subtype, value, count) cells. Crosstabs over the category limit keep their cells.'''
+        record = {"fieldName": field, "subtypeField": subtypeField, "status": self._getCrossTabStatus(field, subtypeField, crossTab)}
+        if field != subtypeField and crossTab is not None and crossTab != 'FIELD EXCLUDED':
+            record["categoryCount"] = crossTab.categoryCount
+            record["sampled"] = crossTab.sampled
+            record["sampleRows"] = self.samplePlan.sampleRows if crossTab.sampled else None
+            record["crossTab"] = [{"subtype": toText(subtypeLabel), "value": toText(valueLabel), "count": cellCount}
+                for subtypeLabel, valueLabel, cellCount in crossTab.cells()]
+        self._addColumnarRecord("subtypeCounts", record)
+
+    def _writeSubtypes(self, subtypes, featureClassResult):
         try:   
             # Write subtypes only if configured
             continueSubtypeCounts = True   
@@ -528,60 +1166,116 @@ class DatabaseSnifferDb:
                         domainName = str(fieldvals[1].name) if fieldvals[1] is not None else 'NO FIELD DOMAIN'
                         
                         # Format pre freuquency header values
-                        formattedSubtypeVals = '{0},{1},{2},{3},{4},{5},{6}\n'.format(
-                            datasetValues,
+                        self.resultWriters["subtypes"].write(SubtypeResult(
+                            featureClassResult,
                             str(subtypeCode), 
                             str(subtypeDesc),
-                            subtypeField, 
+                            str(subtypeField), 
                             field, 
-                            defaultVals,
+                            str(defaultVals),
                             domainName
-                        )
-                        self.subtypeFileWriter.write(formattedSubtypeVals)                    
+                        ))
+                        self._addColumnarRecord("subtypes", {
+                            "subtypeCode": toText(subtypeCode),
+                            "subtypeName": toText(subtypeDesc),
+                            "subtypeField": subtypeField or None,
+                            "fieldName": field,
+                            "defaultValue": toText(defaultVals),
+                            "domainName": str(fieldvals[1].name) if fieldvals[1] is not None else None
+                        })
                         
                         if subtypeField is False:
                             break
                         
-                # self.subtypeFileWriter.write(",\n")
                 print('\nCompleted with SubtypeField: {0} - {1}'.format(str(subtypeCode), str(subtypeDict['Name'])))
                 self.logger.info('Completed with SubtypeField: {0} - {1}'.format(str(subtypeCode), str(subtypeDict['Name']))) 
                 
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _writeSubtypes: {0}\n\t".format(ex))
+            self.backend.addMessage("Exception Thrown in _writeSubtypes: {0}\n\t".format(ex))
             self.logger.error("Exception Thrown in _writeSubtypes: {0}\n\t".format(ex))
     
+    def _addColumnarRecord(self, outputName, record):
+        '''Adds one output row (with the feature class columns) to the current feature class's columnar row group'''
+        if self.columnarOutputRun == "YES":
+            columnarRecord = dict(self.datasetRecord)
+            columnarRecord.update(record)
+            self.columnarRecords[outputName].append(columnarRecord)
+
+    def _runStage(self, stage, fc, stageFunction, *args):
+        '''Runs one stage of a feature class, recording its wall time & rows read in the run profile'''
+        rowsScanned = self.rowsScanned
+        with self.stageTimer.measure(stage, fc) as record:
+            stageFunction(*args)
+        record.rowsRead = self.rowsScanned - rowsScanned
+
     def _writeData(self, datasetIndex, fc):
         '''
             Purpose: method creates output formatted file with headers just for the feature class feature count.
         '''
+        self.samplePlan = None
+        self.domainValidator = None
+        self.duplicateKeyFinder = None
         try:
-            featureCount = arcpy.GetCount_management(fc)
+            # GetCount & Describe are timed with the featureCounts stage (every other stage needs them)
+            with self.stageTimer.measure("featureCounts", fc):
+                featureCount = self.backend.getCount(fc)
+                if featureCount is not None:
+                    properties = self.backend.describe(fc)
+                    
+                    featureClassResult = FeatureClassResult(
+                        str(self.dataSetsToCheck[datasetIndex]), 
+                        str(fc),
+                        str(properties.featureType), 
+                        str(properties.shapeType),
+                        str(featureCount)
+                    )                
+                    
+                    self.datasetRecord = {
+                        "featureDataset": str(self.dataSetsToCheck[datasetIndex]),
+                        "featureClass": str(fc),
+                        "featureType": str(properties.featureType),
+                        "shapeType": str(properties.shapeType),
+                        "featureCount": int(featureCount)
+                    }
+
+                    if self.featureCountRun == "YES":
+                        self.resultWriters["featureCounts"].write(featureClassResult)
+                        self._addColumnarRecord("featureCounts", {})
+
             if featureCount is not None:
-                properties = arcpy.Describe(fc)
-                
-                datasetValues = '{0},{1},{2},{3},{4}'.format(
-                    str(self.dataSetsToCheck[datasetIndex]), 
-                    str(fc),
-                    str(properties.featureType), 
-                    str(properties.shapeType),
-                    str(featureCount)
-                )                
-                
-                if self.featureCountRun == "YES":
-                    self.featureCountFileWriter.write('{0}\n'.format(datasetValues))
-                
+                if self.samplingRun == "YES":
+                    with self.stageTimer.measure("samplePlan", fc):
+                        self.samplePlan = self._createSamplePlan(fc, featureCount)
+
+                # Subtypes are listed once for the domain checks (subtype domains), the geometry profile & the subtype outputs
+                subtypes = None
+                if self.subtypeRun == "YES" or self.subtypeCountRun == "YES" or (self.domainValidationRun == "YES" and self.fieldCountRun == "YES") \
+                        or self.geometryProfileRun == "YES":
+                    with self.stageTimer.measure("listSubtypes", fc):
+                        subtypes = self.backend.listSubtypes(fc)       
+
+                # Key checks are made first so the field counts pass can hash the key fields
+                if self.duplicateKeyRun == "YES":
+                    self.duplicateKeyFinder = self._createDuplicateKeyFinder(self.backend.listFields(fc))
+
                 if self.fieldCountRun == "YES":
-                    # self.fieldCountFileWriter.write(datasetValues)
-                    self._writeFcFields(fc, featureCount, datasetValues)
+                    self._runStage("fieldCounts", fc, self._writeFcFields, fc, featureCount, featureClassResult, subtypes)
+                    if self.domainValidationRun == "YES":
+                        self._runStage("domainViolations", fc, self._writeDomainViolations, fc, featureClassResult)
                     
                 if self.subtypeRun == "YES" or self.subtypeCountRun == "YES":
-                    subtypes = arcpy.da.ListSubtypes(fc)       
-
                     if self.subtypeRun == "YES":
-                        self._writeSubtypes(subtypes, datasetValues)
+                        self._runStage("subtypes", fc, self._writeSubtypes, subtypes, featureClassResult)
                     
                     if self.subtypeCountRun == "YES":
-                        self._writeSubtypeCounts(fc, subtypes, datasetValues)
+                        self._runStage("subtypeCounts", fc, self._writeSubtypeCounts, fc, subtypes, featureClassResult)
+
+                # Tables have no geometry
+                if self.geometryProfileRun == "YES" and properties.shapeType:
+                    self._runStage("geometryProfile", fc, self._writeGeometryProfile, fc, featureCount, featureClassResult, properties.shapeType, subtypes)
+
+                if self.duplicateKeyRun == "YES":
+                    self._runStage("duplicateKeys", fc, self._writeDuplicateKeys, fc, featureClassResult)
                 
                 if self.attributeRulesRun == "YES":
                     # Create attribute rules folder
@@ -591,101 +1285,375 @@ class DatabaseSnifferDb:
                         os.makedirs(attributeRulesDir)
                         
                     outFilepath = os.path.join(attributeRulesDir, fc + ".csv")
-                    arcpy.ExportAttributeRules_management(inTable, outFilepath)
+                    self._runStage("attributeRules", fc, self.backend.exportAttributeRules, inTable, outFilepath)
                     
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _writeData: {0}\n\t".format(ex))
+            self.backend.addMessage("Exception Thrown in _writeData: {0}\n\t".format(ex))
             self.logger.error("Exception Thrown in _writeData: {0}\n\t".format(ex))
+        finally:
+            # Spilled key hashes are removed even if a stage failed
+            if self.duplicateKeyFinder is not None:
+                self.duplicateKeyFinder.close()
                           
-    def _loopThroughFeatureClasses(self, datasetIndex):
+    def _createSamplePlan(self, fc, featureCount):
+        '''
+            Purpose: random OID sample of a feature class at or over the sampling threshold, or None to profile it exactly.
+            Feature classes without an OID field are profiled exactly. The seed is combined with the feature class name
+            so every feature class gets its own repeatable sample.
+        '''
+        if featureCount < self.samplingThresholdRowCount:
+            return None
+        sampleBudget = int(featureCount * self.sampleFraction) if self.sampleFraction > 0 else self.sampleRows
+        return self._drawSamplePlan(fc, featureCount, sampleBudget)
+
+    def _createGeometrySamplePlan(self, fc, featureCount):
+        '''Random OID sample of geometrySampleRate of the rows of a feature class at or over the geometry sample threshold, or None to read every geometry'''
+        if self.geometrySampleRate >= 1 or featureCount < self.geometrySampleThresholdRowCount:
+            return None
+        return self._drawSamplePlan(fc, featureCount, int(featureCount * self.geometrySampleRate))
+
+    def _drawSamplePlan(self, fc, featureCount, sampleBudget):
+        '''SamplePlan of sampleBudget rows, or None when the budget covers the feature class or it has no OID field'''
+        from RowSampler import SamplePlan
+        if sampleBudget <= 0 or sampleBudget >= featureCount:
+            return None
+        try:
+            oidRange = self.backend.oidRange(fc)
+            if oidRange is None:
+                self.logger.warning("No OID field in {0}, profiling all rows".format(fc))
+                return None
+            oidField, minOid, maxOid = oidRange
+            seed = [self.sampleSeed, zlib.crc32(str(fc).encode('utf-8'))]
+            return SamplePlan(oidField, minOid, maxOid, featureCount, sampleBudget, seed, self.sampleConfidenceLevel)
+        except Exception as ex:
+            self.backend.addMessage("Exception Thrown in _createSamplePlan, profiling all rows: {0}\n\t".format(ex))
+            self.logger.warning("Exception Thrown in _createSamplePlan, profiling all rows: {0}\n\t".format(ex))
+            return None
+
+    def _getConfigHash(self):
+        '''Hash of the config that shapes per feature class results (cached results of another config are not reused)'''
+        globals = self.config["globals"]
+        resultConfig = dict((key, globals.get(key)) for key in ["skipSystemFieldTypes", "featureCountConfig", "fieldCountConfig",
+            "subtypeConfig", "subtypeCountConfig", "attributeRulesConfig", "columnarOutputConfig", "samplingConfig", "fieldSketchConfig",
+            "numericStatsConfig", "domainValidationConfig", "geometryProfileConfig", "duplicateKeyConfig"])
+        resultConfig["dbParams"] = self.dbParams
+        return RunManifest.hashValue(resultConfig)
+
+    def _loadRunManifest(self):
+        '''Loads the previous run manifest for incremental runs. Without a readable manifest every feature class is scanned.'''
+        if self.incrementalRun != "YES":
+            return
+        self.runManifest = RunManifest(self.manifestFilepath, self._getConfigHash())
+        try:
+            self.runManifest.load()
+        except Exception as ex:
+            self.backend.addMessage("Exception Thrown in _loadRunManifest, scanning all feature classes: {0}\n\t".format(ex))
+            self.logger.warning("Exception Thrown in _loadRunManifest, scanning all feature classes: {0}\n\t".format(ex))
+
+    def _startRunJournal(self):
+        '''Starts the checkpoint journal. With --resume the feature classes completed by the failed run are loaded.'''
+        if self.checkpointRun != "YES":
+            if self.resume:
+                self.backend.addMessage("checkpointConfig is not run, nothing to resume. Profiling all feature classes\n\t")
+                self.logger.warning("checkpointConfig is not run, nothing to resume. Profiling all feature classes\n\t")
+            return
+        try:
+            self.runJournal = RunJournal(self.journalFilepath, self._getConfigHash())
+            resume = False
+            if self.resume:
+                try:
+                    resume = len(self.runJournal.load()) > 0
+                except Exception as ex:
+                    self.backend.addMessage("Exception Thrown in _startRunJournal, profiling all feature classes: {0}\n\t".format(ex))
+                    self.logger.warning("Exception Thrown in _startRunJournal, profiling all feature classes: {0}\n\t".format(ex))
+            self.runJournal.start(resume)
+            if resume is False:
+                return
+
+            self.backend.addMessage("Resuming after {0} completed feature classes\n\t".format(len(self.runJournal.entries)))
+            self.logger.info("Resuming after {0} completed feature classes\n\t".format(len(self.runJournal.entries)))
+            self.journaledKeys = self.runJournal.committedKeys()
+            self.resumeFileSizes = self.runJournal.lastFileSizes()
+            for entry in self.runJournal.entries:
+                self.featureClassesProfiled += 1
+                self.rowsScanned += entry["rowsScanned"]
+                self.errorCounter.count += entry["errors"]
+                if self.runManifest is not None and entry["fingerprint"] is not None and entry["errors"] == 0:
+                    self.runManifest.put(entry["key"], entry["fingerprint"], entry["results"])
+
+        except Exception as ex:
+            self.runJournal = None
+            self.backend.addMessage("Exception Thrown in _startRunJournal: {0}\n\t".format(ex))
+            self.logger.error("Exception Thrown in _startRunJournal: {0}\n\t".format(ex))
+
+    def _closeRunJournal(self, completed):
+        '''Closes the checkpoint journal. A completed run removes it so the next --resume starts over.'''
+        try:
+            if self.runJournal is not None:
+                self.runJournal.close(completed)
+                self.runJournal = None
+        except Exception as ex:
+            self.backend.addMessage("Exception Thrown in _closeRunJournal: {0}\n\t".format(ex))
+            self.logger.error("Exception Thrown in _closeRunJournal: {0}\n\t".format(ex))
+
+    def _saveRunManifest(self):
+        if self.runManifest is None:
+            return
+        try:
+            self.runManifest.save()
+            self.backend.addMessage("Reused cached results for {0} feature classes. Run manifest saved to {1}\n\t".format(self.featureClassesReused, self.manifestFilepath))
+            self.logger.info("Reused cached results for {0} feature classes. Run manifest saved to {1}\n\t".format(self.featureClassesReused, self.manifestFilepath))
+        except Exception as ex:
+            self.backend.addMessage("Exception Thrown in _saveRunManifest: {0}\n\t".format(ex))
+            self.logger.error("Exception Thrown in _saveRunManifest: {0}\n\t".format(ex))
+
+    def _getFingerprint(self, fc):
+        '''
+            Purpose: fingerprint of a feature class for incremental runs: row count, hash of the schema (fields,
+            field domains & subtypes) & the editor tracking last edit date when available. None if it can't be read,
+            so the feature class is scanned.
+        '''
+        try:
+            domainCatalog = self._getDomainCatalog()
+            schema = [[f.name, f.aliasName, f.type, f.length, f.precision, f.domain, domainCatalog.formatDomain(f.domain)]
+                for f in self.backend.listFields(fc)]
+            if self.subtypeRun == "YES" or self.subtypeCountRun == "YES" or self.domainValidationRun == "YES" or self.geometryProfileRun == "YES":
+                for subtypeCode, subtypeDict in self.backend.listSubtypes(fc).items():
+                    schema.append([subtypeCode, subtypeDict['Name'], subtypeDict['SubtypeField'],
+                        [[field, fieldvals[0], fieldvals[1].name if fieldvals[1] is not None else None,
+                        domainCatalog.formatDomain(fieldvals[1].name) if fieldvals[1] is not None else None] for field, fieldvals in subtypeDict['FieldValues'].items()]])
+            lastEditDate = self.backend.lastEditDate(fc)
+            return {
+                "rowCount": self.backend.getCount(fc),
+                "schemaHash": RunManifest.hashValue(schema),
+                "lastEditDate": str(lastEditDate) if lastEditDate is not None else None
+            }
+        except Exception as ex:
+            self.backend.addMessage("Exception Thrown in _getFingerprint, scanning {1}: {0}\n\t".format(ex, fc))
+            self.logger.warning("Exception Thrown in _getFingerprint, scanning {1}: {0}\n\t".format(ex, fc))
+            return None
+
+    def _getManifestKey(self, datasetIndex, fc):
+        '''Feature class key in the run manifest & checkpoint journal'''
+        return '{0}/{1}'.format(self.dataSetsToCheck[datasetIndex], fc)
+
+    def _profileFeatureClass(self, datasetIndex, fc):
+        '''
+            Purpose: runs all configured stages for one feature class into in-memory result writers & returns the CSV
+            output text per output file. Used by both the serial loop & the parallel worker processes.
+            In incremental runs the previous results are returned when the feature class fingerprint is unchanged.
+        '''
+        rowsScanned = self.rowsScanned
+        errorCount = self.errorCounter.count
+        timingIndex = len(self.stageTimer.records)
+
+        manifestKey = self._getManifestKey(datasetIndex, fc)
+        fingerprint = None
+        if self.runManifest is not None:
+            with self.stageTimer.measure("fingerprint", fc):
+                fingerprint = self._getFingerprint(fc)
+            cachedResults = self.runManifest.get(manifestKey, fingerprint, self.incrementalMaxAgeDays)
+            if cachedResults is not None:
+                print('\nUnchanged since the last run, reusing results:', fc)
+                self.logger.info('Unchanged since the last run, reusing results: ' + fc)
+                results = dict(cachedResults)
+                results.update({"manifestKey": manifestKey, "fingerprint": fingerprint, "cached": True, "rowsScanned": 0,
+                    "errors": self.errorCounter.count - errorCount, "timings": self.stageTimer.records[timingIndex:]})
+                return results
+
+        self.columnarRecords = dict((outputName, []) for outputName in OUTPUT_NAMES)
+        self.resultWriters = dict((outputName, ResultWriter()) for outputName in OUTPUT_NAMES)
+        self._writeData(datasetIndex, fc)
+        
+        results = dict((outputName, self.resultWriters[outputName].getvalue()) for outputName in OUTPUT_NAMES)
+        self.featureClassesProfiled += 1
+        # Output stages are named after their output files
+        for outputName in OUTPUT_NAMES:
+            if results[outputName]:
+                self.stageTimer.addBytes(outputName, fc, len(results[outputName].encode('utf-8')), timingIndex)
+        # Per feature class job summary counts & timings (merged by the parent process in parallel mode)
+        results["rowsScanned"] = self.rowsScanned - rowsScanned
+        results["errors"] = self.errorCounter.count - errorCount
+        results["timings"] = self.stageTimer.records[timingIndex:]
+        results["columnar"] = self.columnarRecords
+        results["manifestKey"] = manifestKey
+        results["fingerprint"] = fingerprint
+        return results
+
+    def _writeResults(self, results):
+        '''Writes one feature class's profiled results to the open output files'''
+        for outputName in OUTPUT_NAMES:
+            fileWriter = getattr(self, OUTPUT_FILE_ATTRIBUTES[outputName][0])
+            if fileWriter and results.get(outputName):
+                fileWriter.write(results[outputName])
+            # One row group per feature class
+            columnarWriter = self.columnarWriters.get(outputName)
+            if columnarWriter is not None:
+                columnarWriter.writeRecords(results["columnar"][outputName])
+
+        # Results with errors are not cached so the feature class is scanned again next run
+        if self.runManifest is not None:
+            if results.get("cached"):
+                self.runManifest.keep(results["manifestKey"])
+                self.featureClassesReused += 1
+            elif results["fingerprint"] is not None and results["errors"] == 0:
+                self.runManifest.put(results["manifestKey"], results["fingerprint"], results)
+
+        self._commitToRunJournal(results)
+
+    def _commitToRunJournal(self, results):
+        '''Flushes the outputs to disk & journals the feature class as completed with the output file sizes'''
+        if self.runJournal is None:
+            return
+        try:
+            fileSizes = {}
+            for outputName in OUTPUT_NAMES:
+                writerAttribute, filepathAttribute = OUTPUT_FILE_ATTRIBUTES[outputName]
+                fileWriter = getattr(self, writerAttribute)
+                if fileWriter:
+                    fileWriter.flush()
+                    os.fsync(fileWriter.fileno())
+                    fileSizes[outputName] = os.path.getsize(getattr(self, filepathAttribute))
+            self.runJournal.commit(results["manifestKey"], results, fileSizes)
+        except Exception as ex:
+            self.backend.addMessage("Exception Thrown in _commitToRunJournal: {0}\n\t".format(ex))
+            self.logger.error("Exception Thrown in _commitToRunJournal: {0}\n\t".format(ex))
+
+    def _listFeatureClassesToCheck(self, datasetIndex):
         featuresToCheck = []
-        try:   
-            if (self.dataSetsToCheck[datasetIndex] == 'STANDALONE'):
-                featuresToCheck = arcpy.ListFeatureClasses()
-                print('\nChecking standalone tables\n')
-            
-            elif self.dataSetsToCheck[datasetIndex] is not None and self.dataSetsToCheck[datasetIndex] != 'ALL':
-                featuresToCheck = arcpy.ListFeatureClasses(feature_dataset=self.dataSetsToCheck[datasetIndex])
-                print('\nStarting Dataset\n:', self.dataSetsToCheck[datasetIndex])
+        if (self.dataSetsToCheck[datasetIndex] == 'STANDALONE'):
+            featuresToCheck = self.backend.listFeatureClasses()
+            print('\nChecking standalone tables\n')
+        
+        elif self.dataSetsToCheck[datasetIndex] is not None and self.dataSetsToCheck[datasetIndex] != 'ALL':
+            featuresToCheck = self.backend.listFeatureClasses(self.dataSetsToCheck[datasetIndex])
+            print('\nStarting Dataset\n:', self.dataSetsToCheck[datasetIndex])
 
-            # Run if no feature datasets in db
-            else:
-                featuresToCheck = arcpy.ListFeatureClasses()
-                print('\nNo datasets found\n:')
+        # Run if no feature datasets in db
+        else:
+            featuresToCheck = self.backend.listFeatureClasses()
+            print('\nNo datasets found\n:')
+
+        fcsToCheck = []
+        for fc in featuresToCheck:
+            # Only check fcList if provided.
+            if len(self.fcList) > 0:
+                if fc.upper() not in self.fcList: continue   
+                            
+            # Skip listed feature classes                                             
+            if fc.upper() in self.skipFcList: continue
 
+            # Skip feature classes completed before the resumed run failed
+            if self._getManifestKey(datasetIndex, fc) in self.journaledKeys:
+                print('\nCompleted before resume, skipping:', fc)
+                continue
+            fcsToCheck.append(fc)
+        return fcsToCheck
+
+    def _loopThroughFeatureClasses(self, datasetIndex):
+        try:   
+            featuresToCheck = self._listFeatureClassesToCheck(datasetIndex)
 
             # Iterate through listed feature classes in dataset list, count # features, describe properties, & write properties in output file
             for fc in featuresToCheck:
                 try:
-                    # Only check fcList if provided.
-                    if len(self.fcList) > 0:
-                        if fc.upper() not in self.fcList: continue   
-                                    
-                    # Skip listed feature classes                                             
-                    if fc.upper() in self.skipFcList: continue
-
                     print('\nStarting Feature Class:', fc)
                     self.logger.info('Feature Class:' + fc)
-                    self._writeData(datasetIndex, fc)
+                    results = self._profileFeatureClass(datasetIndex, fc)
+                    self._writeResults(results)
                                                 
                 except Exception as ex:
-                    arcpy.AddMessage("Exception Thrown in _loopThroughFeatureClasses method for fc loop: {0}\n\t".format(ex, fc))
+                    self.backend.addMessage("Exception Thrown in _loopThroughFeatureClasses method for fc loop: {0}\n\t".format(ex, fc))
 
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _loopThroughFeatureClasses: {0}\n\t".format(ex))
+            self.backend.addMessage("Exception Thrown in _loopThroughFeatureClasses: {0}\n\t".format(ex))
             self.logger.error("Exception Thrown in _loopThroughFeatureClasses: {0}\n\t".format(ex))
 
+    def _loopThroughFeatureClassesParallel(self):
+        '''
+            Purpose: profiles feature classes in a pool of worker processes. Each worker opens its own workspace & 
+            returns formatted results, which are written here in the same order as the serial loop. A feature class
+            that fails in its worker is logged & skipped like in the serial loop. If a worker process dies (the pool
+            is broken), the feature classes that have no results yet are profiled in this process.
+        '''
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        tasks = []
+        for datasetIndex in range(len(self.dataSetsToCheck)):
+            try:
+                for fc in self._listFeatureClassesToCheck(datasetIndex):
+                    tasks.append((datasetIndex, fc))
+            except Exception as ex:
+                self.backend.addMessage("Exception Thrown in _loopThroughFeatureClassesParallel: {0}\n\t".format(ex))
+                self.logger.error("Exception Thrown in _loopThroughFeatureClassesParallel: {0}\n\t".format(ex))
+
+        print('\nProfiling {0} feature classes with {1} workers'.format(len(tasks), self.workers))
+        self.logger.info('Profiling {0} feature classes with {1} workers'.format(len(tasks), self.workers))
+
+        initArgs = (self.config, self.dbParams, self.dataSetsToCheck, self.csvLoggingFilepath)
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_initProfileWorker, initargs=initArgs) as executor:
+            # One future per feature class, read in submission order so output order matches the serial run
+            futures = [executor.submit(_profileFeatureClassWorker, task) for task in tasks]
+            for (datasetIndex, fc), future in zip(tasks, futures):
+                try:
+                    try:
+                        results = future.result()
+                    except BrokenProcessPool as ex:
+                        self.backend.addMessage("Worker pool stopped ({1}), profiling fc {0} in the main process\n\t".format(fc, ex))
+                        self.logger.warning("Worker pool stopped ({1}), profiling fc {0} in the main process\n\t".format(fc, ex))
+                        # Counts, errors & timings go straight to this instance, as in the serial loop
+                        self._writeResults(self._profileFeatureClass(datasetIndex, fc))
+                        continue
+                    print('\nFinished Feature Class:', fc)
+                    self.logger.info('Feature Class:' + fc)
+                    self._writeResults(results)
+                    if not results.get("cached"):
+                        self.featureClassesProfiled += 1
+                    self.rowsScanned += results["rowsScanned"]
+                    self.errorCounter.count += results["errors"]
+                    self.stageTimer.extend(results["timings"])
+                except Exception as ex:
+                    self.backend.addMessage("Exception Thrown in _loopThroughFeatureClassesParallel for fc {1}: {0}\n\t".format(ex, fc))
+                    self.logger.error("Exception Thrown in _loopThroughFeatureClassesParallel for fc {1}: {0}\n\t".format(ex, fc))
+
     def _loopThroughDatasets(self):            
         try:            
             # datasetIndex for # of feature classes in dataset
             datasetIndex = 0
 
             if (self.dataSetsToCheck[datasetIndex] == 'ALL'):
-                self.dataSetsToCheck = arcpy.ListDatasets()
+                self.dataSetsToCheck = self.backend.listDatasets()
                 print('\nChecking all feature datasets')          
                 # self.logger.info('Checking all feature datasets')          
 
+            if self.workers > 1:
+                self._loopThroughFeatureClassesParallel()
+                return
+
             while (datasetIndex < len(self.dataSetsToCheck)):
                 self._loopThroughFeatureClasses(datasetIndex)
                 datasetIndex += 1   
 
         
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _loopThroughDatasets: {0}\n\t".format(ex))
+            self.backend.addMessage("Exception Thrown in _loopThroughDatasets: {0}\n\t".format(ex))
             self.logger.error("Exception Thrown in _loopThroughDatasets: {0}\n\t".format(ex))
     
     def _formatFeatureCountHeaders(self):
         # Field header names for feature dataset & feature counts
         h = self.featureCountHeaders
-        headers = '{0},{1},{2},{3},{4}'.format(
+        headers = ResultWriter.formatRow([
             h["featureDataset"],
             h["featureClass"],
             h["featureType"],
             h["shapeType"],
             h["featureCount"]
-        )
+        ])
         return headers    
         
     def _formatFieldCountHeaders(self):
-        h = self.fieldCountHeaders
-        headers = '{0},{1},{2},{3},{4},{5},{6},{7},{8},{9},{10},{11},{12},{13},{14}'.format(
-            h["featureDataset"],
-            h["featureClass"],
-            h["featureType"],
-            h["shapeType"],
-            h["featureCount"],
-            h["fieldName"], 
-            h["fieldAlias"], 
-            h["fieldType"], 
-            h["fieldLength"], 
-            h["fieldPrecision"], 
-            h["fieldCounts"], 
-            h["nullPercent"], 
-            h["fieldDomain"], 
-            h["domainType"], 
-            h["domainValues"]
-        )
-        return headers
+        return ResultWriter.formatRow(self._formatFieldCountDfHeaders())
     
     def _formatFieldCountDfHeaders(self):
         h = self.fieldCountHeaders
@@ -702,6 +1670,20 @@ class DatabaseSnifferDb:
             h["fieldPrecision"], 
             h["fieldCounts"], 
             h["nullPercent"], 
+            h.get("distinctCount", "Distinct Count"), 
+            h.get("tailCount", "Values Outside Top N"), 
+            h.get("sampleStatus", "Sample"), 
+            h.get("nullPercentBounds", "Null Percent Bounds"), 
+            h.get("valueCountBounds", "Value Count Bounds"), 
+            h.get("estimatedDistinct", "Estimated Distinct"), 
+            h.get("uniquenessRatio", "Uniqueness Ratio"), 
+            h.get("topValues", "Estimated Top Values"), 
+            h.get("minimum", "Minimum"), 
+            h.get("maximum", "Maximum"), 
+            h.get("mean", "Mean"), 
+            h.get("standardDeviation", "Standard Deviation"), 
+            h.get("quantiles", "Quantiles"), 
+            h.get("histogram", "Histogram"), 
             h["fieldDomain"], 
             h["domainType"], 
             h["domainValues"]
@@ -710,7 +1692,7 @@ class DatabaseSnifferDb:
 
     def _formatSubtypeHeaders(self):
         s = self.subtypeHeaders
-        headers = '{0},{1},{2},{3},{4},{5},{6},{7},{8},{9},{10}'.format(
+        headers = ResultWriter.formatRow([
             s["featureDataset"],
             s["featureClass"],
             s["featureType"],
@@ -721,25 +1703,97 @@ class DatabaseSnifferDb:
             s["subtypeName"], 
             s["fieldName"], 
             s["defaultValues"], 
-            s["domain"],
-        )
+            s["domain"]
+        ])
         return headers
 
     def _formatSubtypeCountHeaders(self):
         s = self.subtypeCountHeaders
-        extraSpacers = ''
-        for i in range(self.subtypeCountCategoryLimit + 5):
-            extraSpacers += ',col{0}'.format(i)
-        headers = '{0},{1},{2},{3},{4},{5},|,{6}{7}'.format(
+        extraSpacers = ['col{0}'.format(i) for i in range(self.subtypeCountCategoryLimit + 5)]
+        headers = ResultWriter.formatRow([
             s["featureDataset"],
             s["featureClass"],
             s["featureType"],
             s["shapeType"],
             s["featureCount"],            
             s["fieldName"],
+            CROSSTAB_SEPARATOR,
             s["subtypeCount"]
-            ,extraSpacers
-        )
+        ] + extraSpacers)
+        return headers
+    
+    def _formatDomainViolationHeaders(self):
+        h = self.domainViolationHeaders
+        headers = ResultWriter.formatRow([
+            h.get("featureDataset", "Feature Dataset"),
+            h.get("featureClass", "Feature Class"),
+            h.get("featureType", "Feature Type"),
+            h.get("shapeType", "Shape Type"),
+            h.get("featureCount", "Feature Count"),
+            h.get("fieldName", "Field Name"),
+            h.get("subtypeField", "Subtype Field"),
+            h.get("subtypeCode", "Subtype Code"),
+            h.get("subtypeName", "Subtype Name"),
+            h.get("domainName", "Domain Name"),
+            h.get("domainType", "Domain Type"),
+            h.get("checkedCount", "Values Checked"),
+            h.get("violationCount", "Values Outside Domain"),
+            h.get("violationPercent", "Percent Outside Domain"),
+            h.get("sampleValues", "Sample Values Outside Domain"),
+            h.get("sampleStatus", "Sample")
+        ])
+        return headers
+    
+    def _formatGeometryProfileHeaders(self):
+        h = self.geometryProfileHeaders
+        headers = ResultWriter.formatRow([
+            h.get("featureDataset", "Feature Dataset"),
+            h.get("featureClass", "Feature Class"),
+            h.get("featureType", "Feature Type"),
+            h.get("shapeType", "Shape Type"),
+            h.get("featureCount", "Feature Count"),
+            h.get("subtypeField", "Subtype Field"),
+            h.get("subtypeCode", "Subtype Code"),
+            h.get("subtypeName", "Subtype Name"),
+            h.get("geometryCount", "Features"),
+            h.get("nullCount", "Null Geometries"),
+            h.get("emptyCount", "Empty Geometries"),
+            h.get("zeroLengthCount", "Zero Length Geometries"),
+            h.get("zeroAreaCount", "Zero Area Geometries"),
+            h.get("multipartCount", "Multipart Geometries"),
+            h.get("vertexMinimum", "Vertices Minimum"),
+            h.get("vertexMaximum", "Vertices Maximum"),
+            h.get("vertexMean", "Vertices Mean"),
+            h.get("vertexQuantiles", "Vertices Quantiles"),
+            h.get("vertexDistribution", "Vertices Distribution"),
+            h.get("partMaximum", "Parts Maximum"),
+            h.get("partMean", "Parts Mean"),
+            h.get("xMin", "Extent XMin"),
+            h.get("yMin", "Extent YMin"),
+            h.get("xMax", "Extent XMax"),
+            h.get("yMax", "Extent YMax"),
+            h.get("sampleStatus", "Sample")
+        ])
+        return headers
+    
+    def _formatDuplicateKeyHeaders(self):
+        h = self.duplicateKeyHeaders
+        headers = ResultWriter.formatRow([
+            h.get("featureDataset", "Feature Dataset"),
+            h.get("featureClass", "Feature Class"),
+            h.get("featureType", "Feature Type"),
+            h.get("shapeType", "Shape Type"),
+            h.get("featureCount", "Feature Count"),
+            h.get("keyFields", "Key Fields"),
+            h.get("rowCount", "Rows Checked"),
+            h.get("nullKeyCount", "Rows With Null Key"),
+            h.get("distinctKeyCount", "Distinct Keys"),
+            h.get("duplicateKeyCount", "Duplicate Keys"),
+            h.get("duplicateRowCount", "Rows With Duplicate Key"),
+            h.get("maxOccurrences", "Max Rows Per Key"),
+            h.get("isUnique", "Unique"),
+            h.get("sampleKeys", "Sample Duplicate Keys")
+        ])
         return headers
     
     def _formatDateTime(self):
@@ -760,15 +1814,10 @@ class DatabaseSnifferDb:
             
             # Output csv file to store exported data
             self.featureCountCsvFilepath = os.path.join(self.outDir, '{0}_FeatureCounts.csv'.format(self.keyword))
-            if self._checkPy27():
-                self.featureCountFileWriter = codecs.open(self.featureCountCsvFilepath, self.overWriteOption) # w = read/write or "a" = append
-            else:
-                self.featureCountFileWriter = open(self.featureCountCsvFilepath, self.overWriteOption, encoding='UTF-8') # w = read/write or "a" = append
-            
-            self.featureCountFileWriter.write(headers + formattedDateTime)
+            self.featureCountFileWriter = self._openOutputFile(self.featureCountCsvFilepath, "featureCounts", "FeatureCounts", headers + formattedDateTime)
 
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _createFeatureCountFiles: {0}\n\t".format(ex))
+            self.backend.addMessage("Exception Thrown in _createFeatureCountFiles: {0}\n\t".format(ex))
             self.logger.error("Exception Thrown in _createFeatureCountFiles: {0}\n\t".format(ex))
     
     def _createFieldCountFiles(self):
@@ -779,13 +1828,9 @@ class DatabaseSnifferDb:
 
             # Output csv file to store exported data
             self.fieldCountCsvFilepath = os.path.join(self.outDir, '{0}_FieldCounts.csv'.format(self.keyword))
-            if self._checkPy27():
-                self.fieldCountFileWriter = codecs.open(self.fieldCountCsvFilepath, self.overWriteOption) # w = read/write or "a" = append
-            else:            
-                self.fieldCountFileWriter = open(self.fieldCountCsvFilepath, self.overWriteOption, encoding='UTF-8') # w = read/write or "a" = append
-            self.fieldCountFileWriter.write(fieldCountHeaders + formattedDateTime)            
+            self.fieldCountFileWriter = self._openOutputFile(self.fieldCountCsvFilepath, "fieldCounts", "FieldCounts", fieldCountHeaders + formattedDateTime)
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _createFieldCountFiles: {0}\n\t".format(ex))
+            self.backend.addMessage("Exception Thrown in _createFieldCountFiles: {0}\n\t".format(ex))
             self.logger.error("Exception Thrown in _createFieldCountFiles: {0}\n\t".format(ex))
 
     def _createSubtypeFiles(self):
@@ -796,14 +1841,10 @@ class DatabaseSnifferDb:
 
             # Output csv file to store exported data
             self.subtypeCsvFilepath = os.path.join(self.outDir, '{0}_Subtypes.csv'.format(self.keyword))
-            if self._checkPy27():
-                self.subtypeFileWriter = codecs.open(self.subtypeCsvFilepath, self.overWriteOption) # w = read/write or "a" = append
-            else:            
-                self.subtypeFileWriter = open(self.subtypeCsvFilepath, self.overWriteOption, encoding='UTF-8') # w = read/write or "a" = append
-            self.subtypeFileWriter.write(formattedSubtypeHeaders + formattedDateTime)
+            self.subtypeFileWriter = self._openOutputFile(self.subtypeCsvFilepath, "subtypes", "Subtypes", formattedSubtypeHeaders + formattedDateTime)
 
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _createSubtypeFiles: {0}\n\t".format(ex))
+            self.backend.addMessage("Exception Thrown in _createSubtypeFiles: {0}\n\t".format(ex))
             self.logger.error("Exception Thrown in _createSubtypeFiles: {0}\n\t".format(ex))
     
     def _createSubtypeCountFiles(self):
@@ -814,129 +1855,221 @@ class DatabaseSnifferDb:
 
             # Output csv file to store exported data
             self.subtypeCountCsvFilepath = os.path.join(self.outDir, '{0}_SubtypeCounts.csv'.format(self.keyword))
-            if self._checkPy27():
-                self.subtypeCountFileWriter = codecs.open(self.subtypeCountCsvFilepath, self.overWriteOption) # w = read/write or "a" = append
-            else:            
-                self.subtypeCountFileWriter = open(self.subtypeCountCsvFilepath, self.overWriteOption, encoding='UTF-8') # w = read/write or "a" = append
-            self.subtypeCountFileWriter.write(formattedSubtypeCountHeaders + formattedDateTime)
+            self.subtypeCountFileWriter = self._openOutputFile(self.subtypeCountCsvFilepath, "subtypeCounts", "SubtypeCounts", formattedSubtypeCountHeaders + formattedDateTime)
 
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _createSubtypeCountFiles: {0}\n\t".format(ex))
+            self.backend.addMessage("Exception Thrown in _createSubtypeCountFiles: {0}\n\t".format(ex))
             self.logger.error("Exception Thrown in _createSubtypeCountFiles: {0}\n\t".format(ex))
     
-    def _mergeCsvToExcel(self):
+    def _createDomainViolationFiles(self):
         try:            
-            with pd.ExcelWriter(self.outExcelFilepath, mode="a", if_sheet_exists="replace", engine="openpyxl") as excelWriter:
-                try:
-                    if self.featureCountCsvFilepath and os.path.isfile(self.featureCountCsvFilepath):
-                        featureCountDf = pd.read_csv(self.featureCountCsvFilepath, sep=",", skip_blank_lines=True, warn_bad_lines=True)   
-                        featureCountDf.to_excel(excelWriter, sheet_name="FeatureCounts")
-                        
-                        arcpy.AddMessage("Finished Excel export of Feature Count File\n\t")
-                        self.logger.info("Finished Excel export of Feature Count File\n\t")
-                    
-                except Exception as ex:
-                    arcpy.AddMessage("Exception Thrown in _exportFilesToExcel/featureCountRun: {0}\n\t".format(ex))
-                    self.logger.error("Exception Thrown in _exportFilesToExcel/featureCountRun: {0}\n\t".format(ex))                
-        
-                try:
-                    if self.fieldCountCsvFilepath and os.path.isfile(self.fieldCountCsvFilepath):
-                        featureCountDf = pd.read_csv(self.fieldCountCsvFilepath, sep=",", skip_blank_lines=True, warn_bad_lines=True)   
-                        featureCountDf.to_excel(excelWriter, sheet_name="FieldCounts")
-                        
-                        arcpy.AddMessage("Finished Excel export of Field Count File\n\t")
-                        self.logger.info("Finished Excel export of Field Count File\n\t")
-                    
-                except Exception as ex:
-                    arcpy.AddMessage("Exception Thrown in _exportFilesToExcel/featureCountRun: {0}\n\t".format(ex))
-                    self.logger.error("Exception Thrown in _exportFilesToExcel/featureCountRun: {0}\n\t".format(ex))   
-                    
-                try:
-                    if self.subtypeCsvFilepath and os.path.isfile(self.subtypeCsvFilepath):
-                        featureCountDf = pd.read_csv(self.subtypeCsvFilepath, sep=",", skip_blank_lines=True, warn_bad_lines=True)  
-                        featureCountDf.to_excel(excelWriter, sheet_name="SubtypeCounts")
-                        
-                        arcpy.AddMessage("Finished Excel export of Subtypes File\n\t")
-                        self.logger.info("Finished Excel export of Subtypes File\n\t")
-                    
-                except Exception as ex:
-                    arcpy.AddMessage("Exception Thrown in _exportFilesToExcel/subtypeRun: {0}\n\t".format(ex))
-                    self.logger.error("Exception Thrown in _exportFilesToExcel/subtypeRun: {0}\n\t".format(ex))   
-                    
-                try:
-                    if self.subtypeCountCsvFilepath and os.path.isfile(self.subtypeCountCsvFilepath):
-                        featureCountDf = pd.read_csv(self.subtypeCountCsvFilepath, sep=",", skip_blank_lines=True, warn_bad_lines=True)
-                        featureCountDf.to_excel(excelWriter, sheet_name="SubtypeCounts")
-                        arcpy.AddMessage("Finished Excel export of Subtype Count File\n\t")
-                        self.logger.info("Finished Excel export of Subtype Count File\n\t")
-                    
-                except Exception as ex:
-                    arcpy.AddMessage("Exception Thrown in _exportFilesToExcel/featureCountRun: {0}\n\t".format(ex))
-                    self.logger.error("Exception Thrown in _exportFilesToExcel/featureCountRun: {0}\n\t".format(ex))                                                               
+            # Field header names for output CSV file:
+            formattedDomainViolationHeaders = self._formatDomainViolationHeaders()
+            formattedDateTime = self._formatDateTime()
+
+            # Output csv file to store exported data
+            self.domainViolationCsvFilepath = os.path.join(self.outDir, '{0}_DomainViolations.csv'.format(self.keyword))
+            self.domainViolationFileWriter = self._openOutputFile(self.domainViolationCsvFilepath, "domainViolations", "DomainViolations", formattedDomainViolationHeaders + formattedDateTime)
 
-                excelWriter.save()
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in mergeCsvToExcel: {0}\n\t".format(ex))
-            self.logger.error("Exception Thrown in mergeCsvToExcel: {0}\n\t".format(ex))
-                                
-    def _exportFilesToExcel(self):
-        try:
-            if self.featureCountRun == "YES":
-                featureCountExcelFilepath = os.path.splitext(self.featureCountCsvFilepath)[0] + '.xlsx'
-                featureCountDf = pd.read_csv(self.featureCountCsvFilepath, sep=",", skip_blank_lines=True, warn_bad_lines=True)  #header=None, prefix='Col', 
-                featureCountDf.to_excel(featureCountExcelFilepath, sheet_name="FeatureCounts")
-                                        
-                arcpy.AddMessage("Finished Excel export of Feature Count File\n\t")
-                self.logger.info("Finished Excel export of Feature Count File\n\t")
-                
+            self.backend.addMessage("Exception Thrown in _createDomainViolationFiles: {0}\n\t".format(ex))
+            self.logger.error("Exception Thrown in _createDomainViolationFiles: {0}\n\t".format(ex))
+    
+    def _createGeometryProfileFiles(self):
+        try:            
+            # Field header names for output CSV file:
+            formattedGeometryProfileHeaders = self._formatGeometryProfileHeaders()
+            formattedDateTime = self._formatDateTime()
+
+            # Output csv file to store exported data
+            self.geometryProfileCsvFilepath = os.path.join(self.outDir, '{0}_GeometryProfile.csv'.format(self.keyword))
+            self.geometryProfileFileWriter = self._openOutputFile(self.geometryProfileCsvFilepath, "geometryProfile", "GeometryProfile", formattedGeometryProfileHeaders + formattedDateTime)
+
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _exportFilesToExcel/featureCountRun: {0}\n\t".format(ex))
-            self.logger.error("Exception Thrown in _exportFilesToExcel/featureCountRun: {0}\n\t".format(ex))                
-            
-        try:
-            # Convert csv to excel file
-            if self.fieldCountRun == "YES":
-                fieldCountExcelFilepath = os.path.splitext(self.fieldCountCsvFilepath)[0] + '.xlsx'
-                with pd.ExcelWriter(fieldCountExcelFilepath, mode="w", engine="openpyxl") as fieldCountExcelWriter:
-                    fieldCountExcelDf = pd.read_csv(self.fieldCountCsvFilepath, sep=",", skip_blank_lines=True, warn_bad_lines=True) #header=None, prefix='Col', 
-                    fieldCountExcelDf.to_excel(fieldCountExcelWriter, sheet_name="FieldCounts")
-                    
-                    arcpy.AddMessage("Finished Excel export of Field Count File\n\t")
-                    self.logger.info("Finished Excel export of Field Count File\n\t")
-                
+            self.backend.addMessage("Exception Thrown in _createGeometryProfileFiles: {0}\n\t".format(ex))
+            self.logger.error("Exception Thrown in _createGeometryProfileFiles: {0}\n\t".format(ex))
+    
+    def _createDuplicateKeyFiles(self):
+        try:            
+            # Field header names for output CSV file:
+            formattedDuplicateKeyHeaders = self._formatDuplicateKeyHeaders()
+            formattedDateTime = self._formatDateTime()
+
+            # Output csv file to store exported data
+            self.duplicateKeyCsvFilepath = os.path.join(self.outDir, '{0}_DuplicateKeys.csv'.format(self.keyword))
+            self.duplicateKeyFileWriter = self._openOutputFile(self.duplicateKeyCsvFilepath, "duplicateKeys", "DuplicateKeys", formattedDuplicateKeyHeaders + formattedDateTime)
+
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _exportFilesToExcel/fieldCountRun: {0}\n\t".format(ex))
-            self.logger.error("Exception Thrown in _exportFilesToExcel/fieldCountRun: {0}\n\t".format(ex))                
-        
+            self.backend.addMessage("Exception Thrown in _createDuplicateKeyFiles: {0}\n\t".format(ex))
+            self.logger.error("Exception Thrown in _createDuplicateKeyFiles: {0}\n\t".format(ex))
+    
+    def _openOutputFile(self, csvFilepath, outputName, sheetName, headerText):
+        '''
+            Purpose: opens an output CSV (wrapped in its Excel sink) & writes the header. A resumed run keeps the rows of
+            the feature classes committed to the checkpoint journal: the CSV is truncated to its size after the last of
+            them & appended to, while the Excel sheet (which can't be appended to) is rebuilt from the journaled rows.
+        '''
+        if self._checkPy27():
+            fileWriter = codecs.open(csvFilepath, self.overWriteOption) # w = read/write or "a" = append
+            fileWriter.write(headerText)
+            return fileWriter
+
+        resumeFileSize = self.resumeFileSizes.get(outputName)
+        if resumeFileSize is None:
+            fileWriter = open(csvFilepath, self.overWriteOption, encoding='UTF-8', buffering=OUTPUT_BUFFER_BYTES) # w = read/write or "a" = append
+            fileWriter = self._createOutputSink(fileWriter, csvFilepath, sheetName)
+            fileWriter.write(headerText)
+            return fileWriter
+
+        # Drops the partly written rows of the feature class the failed run was writing
+        os.truncate(csvFilepath, resumeFileSize)
+        fileWriter = self._createOutputSink(open(csvFilepath, 'a', encoding='UTF-8', buffering=OUTPUT_BUFFER_BYTES), csvFilepath, sheetName)
+        if isinstance(fileWriter, CsvExcelSink):
+            fileWriter.writeExcel(headerText + ''.join(entry["results"][outputName] or '' for entry in self.runJournal.entries))
+        return fileWriter
+
+    def _createOutputSink(self, csvFile, csvFilepath, sheetName):
+        '''
+            Purpose: wraps an output CSV file so the same rows are streamed to Excel while the CSV is written. Each 
+            output gets its own xlsx next to the CSV, or a sheet of one merged workbook when mergeCsvsToExcel is YES.
+        '''
+        if self.excelOutput != "YES" or self._checkPy27():
+            return csvFile
+        if self.mergeCsvsToExcel == "YES":
+            if self.mergedExcelWriter is None:
+                self.mergedExcelWriter = ExcelStreamWriter(self.outExcelFilepath)
+            return CsvExcelSink(csvFile, self.mergedExcelWriter, sheetName)
+        excelWriter = ExcelStreamWriter(os.path.splitext(csvFilepath)[0] + '.xlsx')
+        return CsvExcelSink(csvFile, excelWriter, sheetName, ownsExcelWriter=True)
+
+    def _createColumnarWriters(self, outputNames):
+        '''Opens a Parquet/Arrow writer per configured output. Without pyarrow only the CSV & Excel outputs are written.'''
+        if self.columnarOutputRun != "YES":
+            return
+        for outputName in outputNames:
+            try:
+                filepath = ColumnarWriter.outputFilepath(self.outDir, self.keyword, outputName, self.columnarOutputFormat)
+                self.columnarWriters[outputName] = ColumnarWriter(outputName, filepath, self.columnarOutputFormat)
+                # A resumed run rewrites the row groups of the feature classes completed before it failed
+                if len(self.resumeFileSizes) > 0:
+                    for entry in self.runJournal.entries:
+                        self.columnarWriters[outputName].writeRecords(entry["results"]["columnar"][outputName])
+            except Exception as ex:
+                self.backend.addMessage("Exception Thrown in _createColumnarWriters/{0}: {1}\n\t".format(outputName, ex))
+                self.logger.error("Exception Thrown in _createColumnarWriters/{0}: {1}\n\t".format(outputName, ex))
+
+    def _closeOutputFiles(self):
+        '''Closes the CSV outputs (saving their streamed xlsx files) & saves the merged workbook'''
+        outputs = [
+            ("featureCountFileWriter", "Feature Count"),
+            ("fieldCountFileWriter", "Field Count"),
+            ("subtypeFileWriter", "Subtypes"),
+            ("subtypeCountFileWriter", "Subtype Count"),
+            ("domainViolationFileWriter", "Domain Violations"),
+            ("geometryProfileFileWriter", "Geometry Profile"),
+            ("duplicateKeyFileWriter", "Duplicate Keys")
+        ]
+        for attributeName, outputLabel in outputs:
+            try:
+                fileWriter = getattr(self, attributeName)
+                if fileWriter:
+                    fileWriter.close()
+                    setattr(self, attributeName, None)
+                    if isinstance(fileWriter, CsvExcelSink):
+                        self.backend.addMessage("Finished Excel export of {0} File\n\t".format(outputLabel))
+                        self.logger.info("Finished Excel export of {0} File\n\t".format(outputLabel))
+            except Exception as ex:
+                self.backend.addMessage("Exception Thrown in _closeOutputFiles/{0}: {1}\n\t".format(outputLabel, ex))
+                self.logger.error("Exception Thrown in _closeOutputFiles/{0}: {1}\n\t".format(outputLabel, ex))
+
+        for outputName, columnarWriter in list(self.columnarWriters.items()):
+            try:
+                columnarWriter.close()
+                self.backend.addMessage("Finished {0} export of {1} ({2} rows)\n\t".format(self.columnarOutputFormat, columnarWriter.filepath, columnarWriter.rowsWritten))
+                self.logger.info("Finished {0} export of {1} ({2} rows)\n\t".format(self.columnarOutputFormat, columnarWriter.filepath, columnarWriter.rowsWritten))
+            except Exception as ex:
+                self.backend.addMessage("Exception Thrown in _closeOutputFiles/{0}: {1}\n\t".format(outputName, ex))
+                self.logger.error("Exception Thrown in _closeOutputFiles/{0}: {1}\n\t".format(outputName, ex))
+        self.columnarWriters = {}
+
         try:
-            if self.subtypeRun == "YES":                
-                subtypeExcelFilepath = os.path.splitext(self.subtypeCsvFilepath)[0] + '.xlsx'
-                with pd.ExcelWriter(subtypeExcelFilepath, mode="a", if_sheet_exists="replace", engine="openpyxl") as subtypeExcelWriter:                    
-                    subtypeDf = pd.read_csv(self.subtypeCsvFilepath, sep=",", skip_blank_lines=True, warn_bad_lines=True) 
-                    subtypeDf.to_excel(subtypeExcelWriter, sheet_name="Subtypes")  
-
-                    arcpy.AddMessage("Finished Excel export of Subtype File\n\t")
-                    self.logger.info("Finished Excel export of Subtype File\n\t")
-                
+            if self.mergedExcelWriter is not None:
+                self.mergedExcelWriter.save()
+                self.mergedExcelWriter = None
+                self.backend.addMessage("Finished merged Excel export\n\t")
+                self.logger.info("Finished merged Excel export\n\t")
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _exportFilesToExcel/subtypeRun: {0}\n\t".format(ex))
-            self.logger.error("Exception Thrown in _exportFilesToExcel/subtypeRun: {0}\n\t".format(ex))
-    
-        try:        
-            if self.subtypeCountRun == "YES":
-                subtypeCountExcelFilepath = os.path.splitext(self.subtypeCountCsvFilepath)[0] + '.xlsx'
-                with pd.ExcelWriter(subtypeCountExcelFilepath, mode="w", if_sheet_exists="replace", engine="openpyxl") as subtypeCountExcelWriter:
-
-                    # skip_blank_lines = set to False when errors should be thrown
-                    subtypeCountDf = pd.read_csv(self.subtypeCountCsvFilepath, sep=",", skip_blank_lines=True, warn_bad_lines=True) # header=None, prefix='Col', 
-                    subtypeCountDf.to_excel(subtypeCountExcelWriter, sheet_name="SubtypeCounts")
-
-                    arcpy.AddMessage("Finished Excel export of Subtype Count File\n\t")
-                    self.logger.info("Finished Excel export of Subtype Count File\n\t")
-                                        
+            self.backend.addMessage("Exception Thrown in mergeCsvToExcel: {0}\n\t".format(ex))
+            self.logger.error("Exception Thrown in mergeCsvToExcel: {0}\n\t".format(ex))
+
+    def _startCProfile(self):
+        '''Starts cProfile capture of this process when configured (parallel workers are not captured)'''
+        if self.cProfileRun != "YES":
+            return None
+        import cProfile
+        cProfiler = cProfile.Profile()
+        cProfiler.enable()
+        return cProfiler
+
+    def _writeRunProfile(self, cProfiler=None):
+        '''Writes the run profile JSON/CSV, logs the top N slowest summary & saves the cProfile stats when captured'''
+        try:
+            if cProfiler is not None:
+                import pstats
+                cProfiler.disable()
+                cProfileFilepath = os.path.join(self.logsDir, '{0}_cProfile.prof'.format(self.keyword))
+                cProfiler.dump_stats(cProfileFilepath)
+                with open(os.path.join(self.logsDir, '{0}_cProfile.txt'.format(self.keyword)), 'w') as statsFile:
+                    pstats.Stats(cProfiler, stream=statsFile).sort_stats('cumulative').print_stats(50)
+                self.logger.info('cProfile stats written to {0}'.format(cProfileFilepath))
+
+            if self.instrumentationRun != "YES":
+                return
+            profileRoot = os.path.join(self.outDir, '{0}_RunProfile'.format(self.keyword))
+            self.stageTimer.writeProfile(profileRoot + '.json', profileRoot + '.csv', self.instrumentationTopN)
+            summary = self.stageTimer.formatSummary(self.instrumentationTopN)
+            print('\nRun Profile\n')
+            print(summary)
+            self.logger.info('Run Profile\n{0}'.format(summary))
+
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in _exportFilesToExcel/subtypeCountRun: {0}\n\t".format(ex))
-            self.logger.error("Exception Thrown in _exportFilesToExcel/subtypeCountRun: {0}\n\t".format(ex))                     
+            self.backend.addMessage("Exception Thrown in _writeRunProfile: {0}\n\t".format(ex))
+            self.logger.error("Exception Thrown in _writeRunProfile: {0}\n\t".format(ex))
+
+    def planRun(self):
+        '''
+            Purpose: lists what runDatabaseSnifferDb would do (enabled stages & the feature classes per dataset) from
+            the workspace schema only. No rows are read, no output, log or journal files are written & none of the
+            profiling modules (numpy...) are imported. The metadata cache is only read, never created or written.
+        '''
+        if self.metadataCacheRun == "YES":
+            self.backend.metadataCache.readOnly = True
+        stageRuns = [("domainSchema", self.domainSchemaRun), ("featureCounts", self.featureCountRun), ("fieldCounts", self.fieldCountRun),
+            ("subtypes", self.subtypeRun), ("subtypeCounts", self.subtypeCountRun), ("attributeRules", self.attributeRulesRun),
+            ("sqlPushdown", self.sqlPushdownRun), ("sampling", self.samplingRun), ("fieldSketches", self.fieldSketchRun),
+            ("numericStats", self.numericStatsRun), ("domainValidation", self.domainValidationRun), ("geometryProfile", self.geometryProfileRun),
+            ("duplicateKeys", self.duplicateKeyRun), ("columnarOutput", self.columnarOutputRun), ("incremental", self.incrementalRun), ("checkpoint", self.checkpointRun),
+            ("metadataCache", self.metadataCacheRun)]
+        planLines = ['Job: {0} ({1}, {2})'.format(self.keyword, self.sourceDir, type(getattr(self.backend, 'backend', self.backend)).__name__),
+            '  Stages: {0}'.format(', '.join(stage for stage, run in stageRuns if run == "YES") or 'none')]
+
+        dataSetsToCheck = self.backend.listDatasets() if self.dataSetsToCheck[0] == 'ALL' else self.dataSetsToCheck
+        featureClassCount = 0
+        for dataset in dataSetsToCheck:
+            if dataset is not None and dataset not in ['STANDALONE', 'ALL']:
+                featuresToCheck = self.backend.listFeatureClasses(dataset)
+            else:
+                featuresToCheck = self.backend.listFeatureClasses()
+            fcsToCheck = [fc for fc in featuresToCheck or [] if (len(self.fcList) == 0 or fc.upper() in self.fcList)
+                and fc.upper() not in self.skipFcList]
+            featureClassCount += len(fcsToCheck)
+            planLines.append('  Dataset {0}: {1} feature classes'.format(dataset, len(fcsToCheck)))
+            planLines.extend('    {0}'.format(fc) for fc in fcsToCheck)
+
+        planLines.append('  Total: {0} feature classes'.format(featureClassCount))
+        if self.metadataCacheRun == "YES":
+            planLines.append('  Metadata cache: {0} reads from cache, {1} from the workspace'.format(self.backend.hits, self.backend.misses))
+        return '\n'.join(planLines)
 
     def runDatabaseSnifferDb(self):
         try:           
@@ -951,17 +2084,25 @@ class DatabaseSnifferDb:
                 os.makedirs(self.logsDir)  
             
             # Make logger
-            self.logger = MessageLogger.configureLogger(self.csvLoggingFilepath, "FeatureCounter")
+            self.logger = MessageLogger.configureLogger(self.csvLoggingFilepath, self.loggerName)
+            self.logger.addHandler(self.errorCounter)
             
-            arcpy.AddMessage("Created/confirmed output & logs folders created")
+            self.backend.addMessage("Created/confirmed output & logs folders created")
             self.logger.info("Created/confirmed output & logs folders created")
                         
             self.outExcelFilepath = os.path.join(self.outDir, '{0}_MergedDatabaseSnifferResults.xlsx'.format(self.keyword))
+            cProfiler = self._startCProfile()
 
             if self.domainSchemaRun == "YES":
-                self._exportDomainSchemaToExcel()
+                with self.stageTimer.measure("domainExport"):
+                    self._exportDomainSchemaToExcel()
                 
-            if (self.featureCountRun == "YES" or self.fieldCountRun == "YES" or self.subtypeRun == "YES" or self.subtypeCountRun == "YES"):
+            if (self.featureCountRun == "YES" or self.fieldCountRun == "YES" or self.subtypeRun == "YES" or self.subtypeCountRun == "YES"
+                    or self.geometryProfileRun == "YES" or self.duplicateKeyRun == "YES"):
+                # Checkpoint journal first: a resumed run appends to the outputs
+                self._loadRunManifest()
+                self._startRunJournal()
+
                 if self.featureCountRun == "YES":
                     self._createFeatureCountFiles()
                     
@@ -973,38 +2114,106 @@ class DatabaseSnifferDb:
                     
                 if self.subtypeCountRun == "YES":
                     self._createSubtypeCountFiles()
-                
-                self._loopThroughDatasets()   
+
+                # Domains are checked in the field counts pass
+                domainViolationRun = "YES" if self.domainValidationRun == "YES" and self.fieldCountRun == "YES" else "NO"
+                if domainViolationRun == "YES":
+                    self._createDomainViolationFiles()
+
+                if self.geometryProfileRun == "YES":
+                    self._createGeometryProfileFiles()
+
+                if self.duplicateKeyRun == "YES":
+                    self._createDuplicateKeyFiles()
+
+                runFlags = [self.featureCountRun, self.fieldCountRun, self.subtypeRun, self.subtypeCountRun, domainViolationRun, self.geometryProfileRun,
+                    self.duplicateKeyRun]
+                self._createColumnarWriters([outputName for outputName, run in zip(OUTPUT_NAMES, runFlags) if run == "YES"])
+
+                with self.stageTimer.measure("featureClasses") as record:
+                    self._loopThroughDatasets()   
+                record.rowsRead = self.rowsScanned
             
-                # Release resources
-                if self.featureCountFileWriter: 
-                    self.featureCountFileWriter.close()
-                    del self.featureCountFileWriter
-                if self.fieldCountFileWriter: 
-                    self.fieldCountFileWriter.close()
-                    del self.fieldCountFileWriter 
-                if self.subtypeFileWriter: 
-                    self.subtypeFileWriter.close()
-                    del self.subtypeFileWriter    
-
-                if self._checkPy27() is False:
-                    if self.mergeCsvsToExcel == "YES":
-                        self._mergeCsvToExcel()
-                    else:
-                        self._exportFilesToExcel()
+                # Release resources. Streamed Excel rows are assembled into the xlsx files here.
+                with self.stageTimer.measure("excelExport"):
+                    self._closeOutputFiles()
+                self._saveRunManifest()
+                self._closeRunJournal(completed=True)
+
+            self._writeRunProfile(cProfiler)
+
+            if self.metadataCacheRun == "YES":
+                self.logger.info("Metadata cache: {0} reads from cache, {1} from the workspace".format(self.backend.hits, self.backend.misses))
 
             print('\nScript Completed\n')
             self.logger.info('\n Script Completed\n')
                         
         except Exception as ex:
-            arcpy.AddMessage("Exception Thrown in runDatabaseSnifferDb: {0}\n\t".format(ex))
+            self.backend.addMessage("Exception Thrown in runDatabaseSnifferDb: {0}\n\t".format(ex))
             self.logger.error("Exception Thrown in runDatabaseSnifferDb: {0}\n\t".format(ex))
+            # The journal is kept for --resume
+            self._closeRunJournal(completed=False)
+
+# Per-process instance used by the parallel feature class workers
+_workerInstance = None
+
+def _initProfileWorker(config, dbParams, dataSetsToCheck, csvLoggingFilepath):
+    '''Opens the workspace & a per-process logger once for each worker process'''
+    global _workerInstance
+    _workerInstance = DatabaseSnifferDb(config, dbParams)
+    _workerInstance.dataSetsToCheck = dataSetsToCheck
+    workerLogFilepath = '{0}_worker{1}.csv'.format(os.path.splitext(csvLoggingFilepath)[0], os.getpid())
+    _workerInstance.logger = MessageLogger.configureLogger(workerLogFilepath, _workerInstance.loggerName)
+    _workerInstance.logger.addHandler(_workerInstance.errorCounter)
+    _workerInstance._loadRunManifest()
+
+def _profileFeatureClassWorker(task):
+    datasetIndex, fc = task
+    print('\nStarting Feature Class:', fc)
+    _workerInstance.logger.info('Feature Class:' + fc)
+    return _workerInstance._profileFeatureClass(datasetIndex, fc)
+
+def runSnifferJob(config, dbParams, resume=False):
+    '''Runs one sourceDbDict job & returns its summary (duration, rows scanned & failures)'''
+    print("\n Running job for item: " + dbParams["keyword"])  
+    startTime = time.time()
+    instance = DatabaseSnifferDb(config, dbParams)
+    instance.resume = resume
+    instance.runDatabaseSnifferDb()
+    return {
+        "keyword": instance.keyword,
+        "sourceDir": instance.sourceDir,
+        "status": "COMPLETED" if instance.errorCounter.count == 0 else "COMPLETED WITH ERRORS",
+        "durationSeconds": round(time.time() - startTime, 2),
+        "featureClasses": instance.featureClassesProfiled,
+        "featureClassesReused": instance.featureClassesReused,
+        "rowsScanned": instance.rowsScanned,
+        "errors": instance.errorCounter.count,
+        "message": ""
+    }
+
+def planConfig(config):
+    '''--plan: prints the config problems & the plan of every job (schema reads only)'''
+    problems = DatabaseHelper.validateConfig(config)
+    print('\nConfig: {0}'.format('valid' if len(problems) == 0 else '{0} problems'.format(len(problems))))
+    for problem in problems:
+        print('  ' + problem)
+
+    for dbParams in config.get("sourceDbDict") or []:
+        try:
+            print('\n' + DatabaseSnifferDb(config, dbParams).planRun())
+        except Exception as ex:
+            print('\nJob: {0} cannot be planned: {1}'.format(dbParams.get("keyword"), ex))
 
 def getParser():
     """ The argument parser of the command-line version """
     parser = argparse.ArgumentParser(description='Runs database sniffer.')
     parser.add_argument('--config_file', '-C', dest='configFile', required=True, 
             help="Config file path (use quotes around file path, separated by 1 '\\'")
+    parser.add_argument('--resume', dest='resume', action='store_true',
+            help="Continue a failed run after its last completed feature class (requires checkpointConfig run YES)")
+    parser.add_argument('--plan', '--dry-run', dest='plan', action='store_true',
+            help="Validate the config & list the stages & feature classes of each job without reading rows or writing outputs")
 
     return parser.parse_args()
 
@@ -1025,16 +2234,25 @@ def main():
         
         # Load Config
         config = DatabaseHelper.loadConfig(configFilePath)
+
+        if args and args.plan:
+            planConfig(config)
+            return
         
         sourceDbList = config["sourceDbDict"]
         now = datetime.now()
         print(now.strftime("\n\Started %m/%d/%Y %H:%M:%S\n\n"))
 
-        # Load params        
-        for dbParams in sourceDbList:
-            print("\n Running job for item: " + dbParams["keyword"])  
-            instance = DatabaseSnifferDb(config, dbParams)
-            instance.runDatabaseSnifferDb()
+        # Run jobs, up to maxConcurrentJobs at a time
+        scheduler = JobScheduler(config["globals"].get("maxConcurrentJobs", 1))
+        resume = args.resume if args else False
+        jobs = [(config, dbParams, resume) for dbParams in sourceDbList]
+        summaries = scheduler.run(runSnifferJob, jobs, 
+            describeJob=lambda job: {"keyword": job[1]["keyword"], "sourceDir": job[1]["sourceDir"]})
+        
+        print('\nJob Summary\n')
+        print(JobScheduler.formatSummaryTable(summaries))
+        JobScheduler.writeSummaryCsv(summaries, os.path.join(config["globals"]["outDir"], 'DatabaseSniffer_JobSummary.csv'))
         
         now = datetime.now()
         print(now.strftime("\n\Ended %m/%d/%Y %H:%M:%S\n\n"))
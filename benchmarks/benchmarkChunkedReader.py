@@ -0,0 +1,97 @@
+'''
+Purpose: peak memory (RSS) of profiling a synthetic 5M row feature class two ways:
+"lists" materializes every column as a Python list before counting (how fields were read originally),
+"chunked" streams the same rows through the ChunkedReader & FieldProfiler.
+
+Each mode runs in its own subprocess so its peak RSS (resource.getrusage ru_maxrss) is measured on its own.
+'''
+
+import os, sys, time, json, subprocess, resource
+import argparse
+from contextlib import closing
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'helpers'))
+
+class Field:
+    def __init__(self, name, type):
+        self.name = name
+        self.type = type
+
+FIELDS = [Field('SUBTYPECD', 'SmallInteger'), Field('MATERIAL', 'String'), Field('DIAMETER', 'Double'),
+          Field('FACILITYID', 'String'), Field('INSTALLYEAR', 'Integer')]
+
+def syntheticCursor(rowCount, fieldNames):
+    '''Generator standing in for arcpy.da.SearchCursor over FIELDS (row tuples, None = NULL)'''
+    materials = ['PVC', 'DI', 'CI', 'HDPE', 'STEEL', None]
+    diameters = [2.0, 4.0, 6.0, 8.0, 12.0, 16.0, None]
+    for i in range(rowCount):
+        row = (i % 5, materials[i % 6], diameters[i % 7], 'FAC{0}'.format(i % 100000), 1950 + i % 70)
+        yield row[:len(fieldNames)]
+
+def peakRssMB():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux & bytes on macOS
+    return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+def runLists(rowCount, chunkSize):
+    from ValueCounter import ValueCounter
+    columns = [[] for f in FIELDS]
+    for row in syntheticCursor(rowCount, [f.name for f in FIELDS]):
+        for i, val in enumerate(row):
+            columns[i].append(val)
+    counters = []
+    for column in columns:
+        counter = ValueCounter()
+        counter.update(column)
+        counters.append(counter)
+    return [c.distinctCount for c in counters]
+
+def runChunked(rowCount, chunkSize):
+    from ChunkedReader import ChunkedReader
+    from FieldProfiler import FieldAccumulator, FieldProfiler
+    profiler = FieldProfiler([FieldAccumulator(f, True) for f in FIELDS])
+    profiler.profile(ChunkedReader(lambda fieldNames: closing(syntheticCursor(rowCount, fieldNames)), FIELDS, chunkSize))
+    return [acc.valueCounter.distinctCount for acc in profiler.accumulators]
+
+MODES = {'lists': runLists, 'chunked': runChunked}
+
+def runMode(mode, rowCount, chunkSize):
+    '''Runs one mode in this process & prints its result as JSON'''
+    baseline = peakRssMB()
+    start = time.perf_counter()
+    distinct = MODES[mode](rowCount, chunkSize)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "mode": mode,
+        "rows": rowCount,
+        "chunkSize": chunkSize if mode == 'chunked' else None,
+        "seconds": round(elapsed, 3),
+        "rowsPerSecond": int(rowCount / elapsed) if elapsed > 0 else None,
+        "peakRssMB": round(peakRssMB(), 1),
+        "peakRssAboveStartMB": round(peakRssMB() - baseline, 1),
+        "distinct": distinct
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks peak memory of the chunked reader.')
+    parser.add_argument('--rows', type=int, default=5 * 10 ** 6)
+    parser.add_argument('--chunkSize', type=int, default=50000)
+    parser.add_argument('--mode', choices=sorted(MODES), help="Internal: run a single mode in this process")
+    args = parser.parse_args()
+
+    if args.mode:
+        runMode(args.mode, args.rows, args.chunkSize)
+        return
+
+    results = []
+    for mode in ['lists', 'chunked']:
+        output = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--mode', mode,
+            '--rows', str(args.rows), '--chunkSize', str(args.chunkSize)])
+        result = json.loads(output.decode('utf-8').strip().splitlines()[-1])
+        results.append(result)
+        print('{0:>8}: {1:>8.1f} MB peak RSS | {2:.2f}s | {3} rows/s'.format(
+            mode, result["peakRssMB"], result["seconds"], result["rowsPerSecond"]))
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
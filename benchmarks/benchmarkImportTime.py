@@ -0,0 +1,112 @@
+'''
+Purpose: startup benchmark. Measures the import time of DatabaseSniffer with python -X importtime (each repeat in a
+fresh interpreter) & lists the slowest modules & the heavy optional modules (numpy, xlwt, openpyxl, pyarrow, pandas)
+loaded on import, which should be none since the profiling stages import them when they run.
+
+With --workspace it also times, end to end in a subprocess, a --plan run (schema only) & a featureCounts only run
+on a synthetic SQLite workspace (syntheticWorkspace.py), i.e. the startup cost of the schema only paths.
+
+python benchmarks/benchmarkImportTime.py --repeat 5 --workspace --rows 10000 --out importTimeResults.json
+'''
+
+import os, sys, time, json, subprocess, tempfile, shutil
+import argparse
+benchmarkDir = os.path.dirname(os.path.abspath(__file__))
+repoDir = os.path.abspath(os.path.join(benchmarkDir, '..'))
+sys.path.append(os.path.join(repoDir, 'helpers'))
+import syntheticWorkspace
+from benchmarkSuite import stageConfig, gitCommit
+
+HEAVY_MODULES = ["numpy", "xlwt", "openpyxl", "pyarrow", "pandas", "arcpy"]
+IMPORT_STATEMENT = "import sys; sys.path.append('./helpers'); import DatabaseSniffer"
+
+
+def measureImport():
+    '''(total import seconds of DatabaseSniffer, {module: (self seconds, cumulative seconds)}) from one fresh interpreter'''
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', IMPORT_STATEMENT], cwd=repoDir,
+        stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, check=True).stderr.decode('utf-8')
+    modules = {}
+    for line in output.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        selfTime, cumulativeTime, moduleName = line[len('import time:'):].split('|')
+        modules[moduleName.strip()] = (int(selfTime) / 1e6, int(cumulativeTime) / 1e6)
+    return modules["DatabaseSniffer"][1], modules
+
+
+def timeRun(configPath, extraArgs):
+    '''Wall seconds of a DatabaseSniffer.py run in a fresh interpreter'''
+    start = time.perf_counter()
+    subprocess.run([sys.executable, 'DatabaseSniffer.py', '-C', configPath] + extraArgs, cwd=repoDir,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks the DatabaseSniffer import & schema only run startup.')
+    syntheticWorkspace.addArguments(parser)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help="Slowest modules listed")
+    parser.add_argument('--workspace', action='store_true', help="Also time --plan & a featureCounts only run")
+    parser.add_argument('--workDir', help="Directory for the workspace & outputs (default: a temporary directory)")
+    parser.add_argument('--out', help="JSON results file")
+    args = parser.parse_args()
+
+    importSeconds = []
+    modules = {}
+    for i in range(args.repeat):
+        seconds, modules = measureImport()
+        importSeconds.append(seconds)
+    importSeconds.sort()
+    medianSeconds = importSeconds[len(importSeconds) // 2]
+    slowestModules = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    heavyModules = [m for m in HEAVY_MODULES if m in modules]
+
+    print('import DatabaseSniffer: {0:.1f} ms median of {1} ({2:.1f} - {3:.1f} ms)'.format(medianSeconds * 1000, args.repeat,
+        importSeconds[0] * 1000, importSeconds[-1] * 1000))
+    print('Heavy modules loaded on import: {0}'.format(', '.join(heavyModules) or 'none'))
+    for moduleName, (selfSeconds, cumulativeSeconds) in slowestModules:
+        print('{0:>40}: {1:>7.1f} ms self | {2:>7.1f} ms cumulative'.format(moduleName, selfSeconds * 1000, cumulativeSeconds * 1000))
+
+    results = {
+        "benchmark": "DatabaseSniffer startup",
+        "commit": gitCommit(),
+        "python": sys.version.split()[0],
+        "importSecondsMedian": round(medianSeconds, 4),
+        "importSeconds": [round(s, 4) for s in importSeconds],
+        "heavyModulesOnImport": heavyModules,
+        "slowestModules": [{"module": m, "selfSeconds": round(s, 4), "cumulativeSeconds": round(c, 4)} for m, (s, c) in slowestModules]
+    }
+
+    if args.workspace:
+        workDir = args.workDir or tempfile.mkdtemp(prefix='snifferImportBenchmark')
+        if not os.path.isdir(workDir):
+            os.makedirs(workDir)
+        workspacePath = os.path.join(workDir, 'synthetic.sqlite')
+        workspace = syntheticWorkspace.createSyntheticWorkspace(workspacePath, args.featureClasses, args.rows, args.fields,
+            args.cardinality, args.distribution, args.nullRatio, args.domains, args.subtypes, args.seed)
+
+        outDir = os.path.join(workDir, 'out_featureCounts')
+        os.makedirs(os.path.join(outDir, 'logs'), exist_ok=True)
+        configPath = os.path.join(workDir, 'config_featureCounts.json')
+        with open(configPath, 'w') as configFile:
+            json.dump(stageConfig("featureCounts", workspacePath, outDir, 1), configFile, indent=2)
+
+        planSeconds = sorted(timeRun(configPath, ['--plan']) for i in range(args.repeat))[args.repeat // 2]
+        featureCountSeconds = sorted(timeRun(configPath, []) for i in range(args.repeat))[args.repeat // 2]
+        print('{0:>40}: {1:>7.1f} ms'.format('--plan run', planSeconds * 1000))
+        print('{0:>40}: {1:>7.1f} ms'.format('featureCounts only run', featureCountSeconds * 1000))
+        results["workspace"] = workspace
+        results["planRunSeconds"] = round(planSeconds, 4)
+        results["featureCountRunSeconds"] = round(featureCountSeconds, 4)
+
+        if args.workDir is None:
+            shutil.rmtree(workDir, ignore_errors=True)
+
+    if args.out:
+        with open(args.out, 'w') as outFile:
+            json.dump(results, outFile, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+'''
+Purpose: end to end throughput benchmark. Generates a synthetic SQLite workspace (syntheticWorkspace.py) & runs
+DatabaseSnifferDb.runDatabaseSnifferDb on it through the SqliteBackend (no arcpy needed), one stage at a time:
+domainExport, featureCounts, fieldCounts, subtypes, subtypeCounts & excelExport.
+
+Each stage runs in its own subprocess so peak RSS (ru_maxrss) is per stage. CSV stages run with the Excel output
+switched off; excelExport runs all four CSV stages with the streamed Excel output on (compare it to their sum).
+Each result also carries the stage totals from the run profile (instrumentationConfig).
+rowsPerSecond is the workspace row count divided by the stage wall time, so results compare across commits.
+
+python benchmarks/benchmarkSuite.py --rows 100000 --out benchmarkResults.json
+'''
+
+import os, sys, time, json, subprocess, resource, tempfile, shutil
+import argparse
+benchmarkDir = os.path.dirname(os.path.abspath(__file__))
+repoDir = os.path.abspath(os.path.join(benchmarkDir, '..'))
+sys.path.append(os.path.join(repoDir, 'helpers'))
+import syntheticWorkspace
+
+# Stage name -> config section switched on for the stage
+STAGES = {
+    "domainExport": ["domainSchemaConfig"],
+    "featureCounts": ["featureCountConfig"],
+    "fieldCounts": ["fieldCountConfig"],
+    "subtypes": ["subtypeConfig"],
+    "subtypeCounts": ["subtypeCountConfig"],
+    "excelExport": ["featureCountConfig", "fieldCountConfig", "subtypeConfig", "subtypeCountConfig"]
+}
+STAGE_ORDER = ["domainExport", "featureCounts", "fieldCounts", "subtypes", "subtypeCounts", "excelExport"]
+RUN_SECTIONS = ["domainSchemaConfig", "featureCountConfig", "fieldCountConfig", "subtypeConfig", "subtypeCountConfig", "attributeRulesConfig"]
+
+
+def peakRssMB():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux & bytes on macOS
+    return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+
+def gitCommit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=repoDir, stderr=subprocess.DEVNULL).decode('utf-8').strip()
+    except Exception:
+        return None
+
+
+def stageConfig(stage, workspacePath, outDir, workers):
+    '''Repo config with only the stage's sections switched on & one SQLite source'''
+    with open(os.path.join(repoDir, 'DatabaseSniffer_config.json'), 'r') as configFile:
+        config = json.load(configFile)
+    globals = config["globals"]
+    globals["outDir"] = outDir
+    globals["csvLoggingFilepath"] = os.path.join(outDir, 'logs', 'DatabaseSniffer_log.csv')
+    globals["overWriteOption"] = "YES"
+    globals["mergeCsvsToExcel"] = "NO"
+    globals["excelOutput"] = "YES" if stage == "excelExport" else "NO"
+    globals["instrumentationConfig"] = {"run": "YES", "topN": 10, "cProfile": "NO"}
+    globals["workspaceBackend"] = "sqlite"
+    globals["workers"] = workers
+    for section in RUN_SECTIONS:
+        globals[section]["run"] = "YES" if section in STAGES[stage] else "NO"
+
+    config["sourceDbDict"] = [{
+        "sourceDir": workspacePath,
+        "dataSetsToCheck": ["STANDALONE"],
+        "keyword": "_Benchmark",
+        "skipFcList": [],
+        "fcList": [],
+        "excludeSubtypeCountFields": "GLOBAL",
+        "excludeFieldCountFields": "GLOBAL",
+        # Value count every generated field that isn't excluded
+        "includeFieldCountFields": [],
+        # Crosstab the generated string & integer fields
+        "includeSubtypeCountFields": ["STR", "NUM"]
+    }]
+    return config
+
+
+def runStage(stage, configPath):
+    '''Runs one stage in this process & prints its measurements as JSON'''
+    os.chdir(repoDir)
+    sys.path.append(repoDir)
+    from DatabaseHelper import DatabaseHelper
+    from DatabaseSniffer import DatabaseSnifferDb
+
+    config = DatabaseHelper.loadConfig(configPath)
+    instance = DatabaseSnifferDb(config, config["sourceDbDict"][0])
+
+    start = time.perf_counter()
+    instance.runDatabaseSnifferDb()
+    seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        "stage": stage,
+        "seconds": round(seconds, 4),
+        "rowsRead": instance.rowsScanned,
+        "featureClasses": instance.featureClassesProfiled,
+        "errors": instance.errorCounter.count,
+        "peakRssMB": round(peakRssMB(), 1),
+        "profile": [r.toDict() for r in instance.stageTimer.stageTotals()]
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks each DatabaseSniffer stage on a synthetic workspace.')
+    syntheticWorkspace.addArguments(parser)
+    parser.add_argument('--stages', nargs='+', choices=STAGE_ORDER, default=STAGE_ORDER)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--workDir', help="Directory for the workspace & outputs (default: a temporary directory)")
+    parser.add_argument('--out', help="JSON results file")
+    parser.add_argument('--stage', help="Internal: run a single stage in this process")
+    parser.add_argument('--config', help="Internal: stage config file")
+    args = parser.parse_args()
+
+    if args.stage:
+        runStage(args.stage, args.config)
+        return
+
+    workDir = args.workDir or tempfile.mkdtemp(prefix='snifferBenchmark')
+    if not os.path.isdir(workDir):
+        os.makedirs(workDir)
+    workspacePath = os.path.join(workDir, 'synthetic.sqlite')
+
+    start = time.perf_counter()
+    workspace = syntheticWorkspace.createSyntheticWorkspace(workspacePath, args.featureClasses, args.rows, args.fields,
+        args.cardinality, args.distribution, args.nullRatio, args.domains, args.subtypes, args.seed)
+    workspace["generateSeconds"] = round(time.perf_counter() - start, 2)
+
+    stageResults = []
+    for stage in [s for s in STAGE_ORDER if s in args.stages]:
+        outDir = os.path.join(workDir, 'out_' + stage)
+        os.makedirs(os.path.join(outDir, 'logs'), exist_ok=True)
+        configPath = os.path.join(workDir, 'config_{0}.json'.format(stage))
+        with open(configPath, 'w') as configFile:
+            json.dump(stageConfig(stage, workspacePath, outDir, args.workers), configFile, indent=2)
+
+        output = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--stage', stage, '--config', configPath])
+        result = json.loads(output.decode('utf-8').strip().splitlines()[-1])
+        result["rowsPerSecond"] = int(workspace["totalRows"] / result["seconds"]) if result["seconds"] > 0 else None
+        stageResults.append(result)
+        print('{0:>14}: {1:>9.3f}s | {2:>12} rows/s | {3:>8.1f} MB peak RSS | {4} errors'.format(
+            stage, result["seconds"], result["rowsPerSecond"], result["peakRssMB"], result["errors"]))
+
+    results = {
+        "benchmark": "DatabaseSniffer stages",
+        "commit": gitCommit(),
+        "python": sys.version.split()[0],
+        "workers": args.workers,
+        "workspace": workspace,
+        "stages": stageResults
+    }
+    if args.out:
+        with open(args.out, 'w') as outFile:
+            json.dump(results, outFile, indent=2)
+    print(json.dumps(results, indent=2))
+
+    if args.workDir is None:
+        shutil.rmtree(workDir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+'''
+Purpose: compares the original list.count() unique value counting against the streaming ValueCounter
+on synthetic columns of 10^6 rows with 10, 10^3 & 10^5 distinct values.
+
+The original approach is O(rows * distinct). When it would run longer than --legacyBudget seconds,
+its per-value count loop is stopped & the total is extrapolated (marked "extrapolated" in the output).
+'''
+
+import os, sys, time, random, json
+import argparse
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'helpers'))
+from ValueCounter import ValueCounter
+
+def makeColumn(rowCount, distinctCount, nullRatio=0.05, seed=42):
+    rnd = random.Random(seed)
+    values = ['VAL{0}'.format(i) for i in range(distinctCount)]
+    # Skewed (zipf-like) draw so top-N differs from first-seen order
+    weights = [1.0 / (i + 1) for i in range(distinctCount)]
+    # Every distinct value appears at least once, the rest of the rows are drawn by weight
+    column = values[:rowCount] + rnd.choices(values, weights=weights, k=max(rowCount - distinctCount, 0))
+    for i in rnd.sample(range(distinctCount, rowCount), int(rowCount * nullRatio)):
+        column[i] = None
+    return column
+
+def legacyCount(column, budget):
+    '''Original _calcUniqueCounts: build a list, then data.count(val) per distinct value'''
+    start = time.perf_counter()
+    data = [val for val in column]
+    distinct = list(set(data))
+    setDict = {}
+    counted = 0
+    extrapolated = False
+    for val in distinct:
+        setDict[val] = data.count(val)
+        counted += 1
+        if time.perf_counter() - start > budget and counted < len(distinct):
+            extrapolated = True
+            break
+    elapsed = time.perf_counter() - start
+    if extrapolated:
+        elapsed = elapsed * len(distinct) / float(counted)
+    return elapsed, extrapolated
+
+def streamingCount(column, limit):
+    start = time.perf_counter()
+    counter = ValueCounter()
+    counter.update(column)
+    top = counter.topN(limit)
+    tail = counter.tailCount(limit)
+    elapsed = time.perf_counter() - start
+    return elapsed, counter.distinctCount, len(top), tail
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks unique value counting.')
+    parser.add_argument('--rows', type=int, default=10 ** 6)
+    parser.add_argument('--distinct', type=int, nargs='+', default=[10, 10 ** 3, 10 ** 5])
+    parser.add_argument('--limit', type=int, default=20, help="fieldCountLimit")
+    parser.add_argument('--legacyBudget', type=float, default=30.0, help="Seconds before legacy timing is extrapolated")
+    args = parser.parse_args()
+
+    results = []
+    for distinctCount in args.distinct:
+        column = makeColumn(args.rows, distinctCount)
+        legacySeconds, extrapolated = legacyCount(column, args.legacyBudget)
+        streamSeconds, foundDistinct, topCount, tail = streamingCount(column, args.limit)
+        result = {
+            "rows": args.rows,
+            "distinct": foundDistinct,
+            "legacySeconds": round(legacySeconds, 4),
+            "legacyExtrapolated": extrapolated,
+            "valueCounterSeconds": round(streamSeconds, 4),
+            "speedup": round(legacySeconds / streamSeconds, 1) if streamSeconds > 0 else None,
+            "topN": topCount,
+            "tailCount": tail
+        }
+        results.append(result)
+        print('{0:>8} distinct: legacy {1:>10.3f}s{2} | ValueCounter {3:.3f}s | {4}x'.format(
+            foundDistinct, legacySeconds, ' (extrapolated)' if extrapolated else '', streamSeconds, result["speedup"]))
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+'''
+Purpose: generates synthetic SQLite workspaces readable by the SqliteBackend (workspaceBackend "sqlite"),
+with configurable feature class, row & field counts, value cardinality & distribution, null ratio,
+coded-value domains & subtypes (including subtype-specific domains).
+
+Fields cycle through String (STRnn), Integer (NUMnn), Double (DBLnn) & Date (DATnn) & each field takes its
+distinct value count from the cardinality list in turn. Subtyped feature classes get a SUBTYPECD field.
+
+python benchmarks/syntheticWorkspace.py --out /tmp/synthetic.sqlite --featureClasses 4 --rows 100000
+'''
+
+import os, sys, sqlite3, json
+import argparse
+from datetime import datetime, timedelta
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'helpers'))
+from SqliteBackend import SqliteBackend
+
+# (name prefix, declared SQLite type, Esri field type)
+FIELD_TYPES = [('STR', 'TEXT(50)', 'String'), ('NUM', 'INTEGER', 'Integer'), ('DBL', 'DOUBLE', 'Double'), ('DAT', 'DATETIME', 'Date')]
+
+BASE_DATE = datetime(2000, 1, 1)
+INSERT_BATCH_ROWS = 20000
+
+
+def fieldDefinitions(fieldCount, cardinality):
+    '''(name, declared type, Esri type, distinct values) per generated field'''
+    fields = []
+    for i in range(fieldCount):
+        prefix, declaredType, fieldType = FIELD_TYPES[i % len(FIELD_TYPES)]
+        fields.append(('{0}{1:02d}'.format(prefix, i + 1), declaredType, fieldType, max(int(cardinality[i % len(cardinality)]), 1)))
+    return fields
+
+
+def drawCodes(rnd, rowCount, distinctCount, distribution):
+    '''Value codes 0..distinctCount-1. zipf gives a few very frequent values & a long tail.'''
+    if distribution == 'uniform':
+        return rnd.integers(0, distinctCount, size=rowCount)
+    weights = 1.0 / np.arange(1, distinctCount + 1)
+    return rnd.choice(distinctCount, size=rowCount, p=weights / weights.sum())
+
+
+def toValues(codes, fieldType):
+    if fieldType == 'String':
+        return ['V{0}'.format(code) for code in codes.tolist()]
+    elif fieldType == 'Integer':
+        return codes.tolist()
+    elif fieldType == 'Double':
+        return (codes * 0.5).tolist()
+    return [(BASE_DATE + timedelta(days=code)).isoformat(' ') for code in codes.tolist()]
+
+
+def writeDomains(connection, domainCount, stringFields):
+    '''Coded-value domains Domain01.. over the first string fields' values (V0, V1, ...)'''
+    domainNames = []
+    for i in range(domainCount):
+        domainName = 'Domain{0:02d}'.format(i + 1)
+        distinctCount = stringFields[i % len(stringFields)][3] if len(stringFields) > 0 else 10
+        connection.execute("INSERT INTO GDB_Domains VALUES (?, 'CodedValue', 'String', ?, 'benchmark', 'DefaultValue', 'Duplicate', NULL, NULL)",
+            (domainName, 'Synthetic domain {0}'.format(i + 1)))
+        # Only part of the values are coded so there are out-of-domain values too
+        connection.executemany("INSERT INTO GDB_CodedValues VALUES (?, ?, ?)",
+            [(domainName, 'V{0}'.format(code), 'Value {0}'.format(code)) for code in range(max(distinctCount // 2, 1))])
+        domainNames.append(domainName)
+    return domainNames
+
+
+def createFeatureClass(connection, rnd, fcName, rowCount, fields, nullRatio, distribution, subtypeCount, domainNames):
+    columns = ['OBJECTID INTEGER PRIMARY KEY']
+    if subtypeCount > 0:
+        columns.append('SUBTYPECD SMALLINT')
+    columns += ['{0} {1}'.format(name, declaredType) for name, declaredType, fieldType, distinctCount in fields]
+    connection.execute('CREATE TABLE "{0}" ({1})'.format(fcName, ', '.join(columns)))
+
+    # Field level domains on the string fields
+    stringFields = [f for f in fields if f[2] == 'String']
+    for i, field in enumerate(stringFields):
+        domainName = domainNames[i] if i < len(domainNames) else None
+        connection.execute("INSERT INTO GDB_FieldInfo VALUES (?, ?, ?, ?, ?, 0, ?)",
+            (fcName, field[0], field[0].title(), field[2], 50, domainName))
+
+    if subtypeCount > 0:
+        for subtypeCode in range(1, subtypeCount + 1):
+            connection.execute("INSERT INTO GDB_Subtypes VALUES (?, 'SUBTYPECD', ?, ?, ?)",
+                (fcName, subtypeCode, 'Subtype {0}'.format(subtypeCode), 1 if subtypeCode == 1 else 0))
+            # Subtype-specific domain on the first string field
+            if len(stringFields) > 0 and len(domainNames) > 0:
+                connection.execute("INSERT INTO GDB_SubtypeFields VALUES (?, ?, ?, NULL, ?)",
+                    (fcName, subtypeCode, stringFields[0][0], domainNames[subtypeCode % len(domainNames)]))
+
+    placeholders = ', '.join('?' * (len(fields) + (2 if subtypeCount > 0 else 1)))
+    insertSql = 'INSERT INTO "{0}" VALUES ({1})'.format(fcName, placeholders)
+    for start in range(0, rowCount, INSERT_BATCH_ROWS):
+        batchRows = min(INSERT_BATCH_ROWS, rowCount - start)
+        columnValues = [list(range(start + 1, start + batchRows + 1))]
+        if subtypeCount > 0:
+            columnValues.append(rnd.integers(1, subtypeCount + 1, size=batchRows).tolist())
+        for name, declaredType, fieldType, distinctCount in fields:
+            values = toValues(drawCodes(rnd, batchRows, distinctCount, distribution), fieldType)
+            for i in np.flatnonzero(rnd.random(batchRows) < nullRatio).tolist():
+                values[i] = None
+            columnValues.append(values)
+        connection.executemany(insertSql, zip(*columnValues))
+    connection.commit()
+
+
+def createSyntheticWorkspace(workspacePath, featureClasses=4, rows=100000, fields=12, cardinality=(10, 1000, 100000),
+        distribution='zipf', nullRatio=0.1, domains=4, subtypes=5, seed=42):
+    '''Creates (replaces) the workspace & returns a summary of what was generated'''
+    if os.path.exists(workspacePath):
+        os.remove(workspacePath)
+    rnd = np.random.default_rng(seed)
+    connection = sqlite3.connect(workspacePath)
+    SqliteBackend.createSideTables(connection)
+
+    fieldDefs = fieldDefinitions(fields, cardinality)
+    domainNames = writeDomains(connection, domains, [f for f in fieldDefs if f[2] == 'String'])
+    fcNames = ['SyntheticFc{0:02d}'.format(i + 1) for i in range(featureClasses)]
+    for fcName in fcNames:
+        createFeatureClass(connection, rnd, fcName, rows, fieldDefs, nullRatio, distribution, subtypes, domainNames)
+    connection.close()
+
+    return {
+        "workspace": workspacePath,
+        "featureClasses": featureClasses,
+        "rowsPerFeatureClass": rows,
+        "totalRows": featureClasses * rows,
+        "fields": fields,
+        "cardinality": list(cardinality),
+        "distribution": distribution,
+        "nullRatio": nullRatio,
+        "domains": domains,
+        "subtypes": subtypes,
+        "seed": seed
+    }
+
+
+def addArguments(parser):
+    parser.add_argument('--featureClasses', type=int, default=4)
+    parser.add_argument('--rows', type=int, default=100000, help="Rows per feature class")
+    parser.add_argument('--fields', type=int, default=12, help="Generated fields per feature class (besides OBJECTID & SUBTYPECD)")
+    parser.add_argument('--cardinality', type=int, nargs='+', default=[10, 1000, 100000], help="Distinct values per field, cycled over the fields")
+    parser.add_argument('--distribution', choices=['zipf', 'uniform'], default='zipf')
+    parser.add_argument('--nullRatio', type=float, default=0.1)
+    parser.add_argument('--domains', type=int, default=4, help="Coded-value domains")
+    parser.add_argument('--subtypes', type=int, default=5, help="Subtypes per feature class (0 = no subtype field)")
+    parser.add_argument('--seed', type=int, default=42)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generates a synthetic SQLite workspace.')
+    parser.add_argument('--out', required=True, help="Workspace file path (.sqlite/.gpkg)")
+    addArguments(parser)
+    args = parser.parse_args()
+    summary = createSyntheticWorkspace(args.out, args.featureClasses, args.rows, args.fields, args.cardinality,
+        args.distribution, args.nullRatio, args.domains, args.subtypes, args.seed)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+from itertools import islice
+import numpy as np
+
+# NumPy dtype per Esri field type. Text & anything without a fixed width stays as Python objects.
+FIELD_DTYPES = {
+    'SmallInteger': np.int16,
+    'Integer': np.int32,
+    'OID': np.int64, # 64-bit ObjectIDs (ArcGIS Pro 3.2+ & enterprise geodatabases)
+    'BigInteger': np.int64,
+    'Single': np.float64,
+    'Double': np.float64,
+    'Date': 'M8[us]'
+}
+
+# Fill value written into the values array where the null mask is True
+FILL_VALUES = {
+    'SmallInteger': 0,
+    'Integer': 0,
+    'OID': 0,
+    'BigInteger': 0,
+    'Single': np.nan,
+    'Double': np.nan,
+    'Date': None,
+    'String': '',
+    'Guid': '',
+    'GlobalID': ''
+}
+
+# Rough per value memory of a Python object column (pointer + boxed value)
+OBJECT_VALUE_BYTES = 64
+# Row tuple overhead while a chunk is being read from the cursor
+ROW_OVERHEAD_BYTES = 64
+
+
+class ColumnChunk:
+    """Purpose: one chunk of one field as a NumPy values array & a boolean null mask."""
+
+    __slots__ = ('fieldName', 'fieldType', 'values', 'nullMask')
+
+    def __init__(self, fieldName, fieldType, values, nullMask):
+        self.fieldName = fieldName
+        self.fieldType = fieldType
+        self.values = values
+        self.nullMask = nullMask
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def nullCount(self):
+        return int(self.nullMask.sum())
+
+    def validValues(self):
+        return self.values[~self.nullMask]
+
+
+class ChunkedReader:
+    """
+    Purpose: shared batched reader. Rows are pulled from a cursor chunkSize at a time & converted to one
+    ColumnChunk per field, so peak memory depends on the chunk size & not on the number of rows.
+
+    Parameters
+    ----------
+    cursorFactory - function(fieldNames) returning a search cursor: a context manager iterating row tuples (arcpy.da.SearchCursor).
+    fields - field objects (name & type) to read, in cursor order.
+    chunkSize - maximum rows per chunk.
+    maxChunkMemoryMB - memory ceiling per chunk. The chunk size is lowered to fit when set.
+    """
+
+    def __init__(self, cursorFactory, fields, chunkSize=50000, maxChunkMemoryMB=None):
+        self.cursorFactory = cursorFactory
+        self.fields = list(fields)
+        self.fieldNames = [f.name for f in self.fields]
+        self.chunkSize = self._limitChunkSize(max(int(chunkSize), 1), maxChunkMemoryMB)
+        self.rowsRead = 0
+
+    def _limitChunkSize(self, chunkSize, maxChunkMemoryMB):
+        if not maxChunkMemoryMB:
+            return chunkSize
+        rowBytes = ROW_OVERHEAD_BYTES + sum(self.estimateValueBytes(f) for f in self.fields)
+        return max(min(chunkSize, int(maxChunkMemoryMB * 1024 * 1024 / rowBytes)), 1)
+
+    @staticmethod
+    def estimateValueBytes(field):
+        '''Bytes per value held while a chunk is read (the boxed cursor value) & converted'''
+        dtype = FIELD_DTYPES.get(field.type)
+        if dtype is None:
+            return OBJECT_VALUE_BYTES * 2
+        return OBJECT_VALUE_BYTES + np.dtype(dtype).itemsize + 1
+
+    @staticmethod
+    def toColumnChunk(field, values):
+        '''Converts a tuple/list of cursor values (None = NULL) to a ColumnChunk'''
+        count = len(values)
+        nullMask = np.fromiter((val is None for val in values), dtype=bool, count=count)
+        dtype = FIELD_DTYPES.get(field.type)
+        fill = FILL_VALUES.get(field.type)
+        hasNulls = nullMask.any()
+
+        if dtype is not None:
+            if hasNulls and fill is not None:
+                values = [fill if val is None else val for val in values]
+            array = np.array(values, dtype=dtype)
+        else:
+            array = np.empty(count, dtype=object)
+            if field.type == 'Geometry':
+                # Geometry objects are iterable (parts) & would be unpacked by a slice assignment
+                for i, val in enumerate(values):
+                    array[i] = val
+            else:
+                array[:] = values
+            if hasNulls and fill is not None:
+                array[nullMask] = fill
+        return ColumnChunk(field.name, field.type, array, nullMask)
+
+    def chunks(self):
+        '''Yields a list of ColumnChunk (cursor field order) per chunk of rows'''
+        if len(self.fields) == 0:
+            return
+        with self.cursorFactory(self.fieldNames) as cursor:
+            rows = iter(cursor)
+            while True:
+                rowChunk = list(islice(rows, self.chunkSize))
+                if len(rowChunk) == 0:
+                    break
+                self.rowsRead += len(rowChunk)
+                columns = list(zip(*rowChunk))
+                del rowChunk
+                yield [self.toColumnChunk(field, columns[i]) for i, field in enumerate(self.fields)]
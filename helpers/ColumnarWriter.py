@@ -0,0 +1,189 @@
+import os
+
+# Feature class columns shared by every output
+DATASET_COLUMNS = ["featureDataset", "featureClass", "featureType", "shapeType", "featureCount"]
+
+# File name suffix per output (same names as the CSV outputs)
+OUTPUT_FILE_NAMES = {
+    "featureCounts": "FeatureCounts",
+    "fieldCounts": "FieldCounts",
+    "subtypes": "Subtypes",
+    "subtypeCounts": "SubtypeCounts",
+    "domainViolations": "DomainViolations",
+    "geometryProfile": "GeometryProfile",
+    "duplicateKeys": "DuplicateKeys"
+}
+
+FILE_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def outputSchemas(pa):
+    '''Typed schema per output. Value counts, domain values, crosstab cells & violating values are nested list columns.'''
+    datasetFields = [
+        pa.field("featureDataset", pa.string()),
+        pa.field("featureClass", pa.string()),
+        pa.field("featureType", pa.string()),
+        pa.field("shapeType", pa.string()),
+        pa.field("featureCount", pa.int64())
+    ]
+    # low/high are the confidence bounds of an estimated count (null for exact counts)
+    valueCount = pa.struct([pa.field("value", pa.string()), pa.field("count", pa.int64()),
+        pa.field("low", pa.int64()), pa.field("high", pa.int64())])
+    codedValue = pa.struct([pa.field("code", pa.string()), pa.field("name", pa.string())])
+    # Date field statistics are in the Date timestamp fields, numeric field statistics in the float fields
+    quantile = pa.struct([pa.field("probability", pa.float64()), pa.field("value", pa.float64()), pa.field("dateValue", pa.timestamp('us'))])
+    histogramBin = pa.struct([pa.field("low", pa.float64()), pa.field("high", pa.float64()), pa.field("lowDate", pa.timestamp('us')),
+        pa.field("highDate", pa.timestamp('us')), pa.field("count", pa.int64())])
+    crossTabCell = pa.struct([pa.field("subtype", pa.string()), pa.field("value", pa.string()), pa.field("count", pa.int64())])
+    # high is null for the open ended last vertex count bin
+    vertexBin = pa.struct([pa.field("low", pa.int64()), pa.field("high", pa.int64()), pa.field("count", pa.int64())])
+
+    return {
+        "featureCounts": pa.schema(datasetFields),
+        "fieldCounts": pa.schema(datasetFields + [
+            pa.field("fieldName", pa.string()),
+            pa.field("fieldAlias", pa.string()),
+            pa.field("fieldType", pa.string()),
+            pa.field("fieldLength", pa.int64()),
+            pa.field("fieldPrecision", pa.int64()),
+            pa.field("countStatus", pa.string()),
+            pa.field("valueCounts", pa.list_(valueCount)),
+            pa.field("nullPercent", pa.float64()),
+            pa.field("distinctCount", pa.int64()),
+            pa.field("tailCount", pa.int64()),
+            pa.field("sampled", pa.bool_()),
+            pa.field("sampleRows", pa.int64()),
+            pa.field("nullPercentLow", pa.float64()),
+            pa.field("nullPercentHigh", pa.float64()),
+            pa.field("estimatedDistinct", pa.int64()),
+            pa.field("uniquenessRatio", pa.float64()),
+            pa.field("topValues", pa.list_(valueCount)),
+            pa.field("minimum", pa.float64()),
+            pa.field("maximum", pa.float64()),
+            pa.field("mean", pa.float64()),
+            pa.field("minimumDate", pa.timestamp('us')),
+            pa.field("maximumDate", pa.timestamp('us')),
+            pa.field("meanDate", pa.timestamp('us')),
+            pa.field("standardDeviation", pa.float64()),
+            pa.field("statsExact", pa.bool_()),
+            pa.field("quantiles", pa.list_(quantile)),
+            pa.field("histogram", pa.list_(histogramBin)),
+            pa.field("domainName", pa.string()),
+            pa.field("domainType", pa.string()),
+            pa.field("domainCodedValues", pa.list_(codedValue)),
+            pa.field("domainRangeMin", pa.float64()),
+            pa.field("domainRangeMax", pa.float64())
+        ]),
+        "subtypes": pa.schema(datasetFields + [
+            pa.field("subtypeCode", pa.string()),
+            pa.field("subtypeName", pa.string()),
+            pa.field("subtypeField", pa.string()),
+            pa.field("fieldName", pa.string()),
+            pa.field("defaultValue", pa.string()),
+            pa.field("domainName", pa.string())
+        ]),
+        "subtypeCounts": pa.schema(datasetFields + [
+            pa.field("fieldName", pa.string()),
+            pa.field("subtypeField", pa.string()),
+            pa.field("status", pa.string()),
+            pa.field("categoryCount", pa.int64()),
+            pa.field("sampled", pa.bool_()),
+            pa.field("sampleRows", pa.int64()),
+            pa.field("crossTab", pa.list_(crossTabCell))
+        ]),
+        "domainViolations": pa.schema(datasetFields + [
+            pa.field("fieldName", pa.string()),
+            pa.field("subtypeField", pa.string()),
+            pa.field("subtypeCode", pa.string()),
+            pa.field("subtypeName", pa.string()),
+            pa.field("domainName", pa.string()),
+            pa.field("domainType", pa.string()),
+            pa.field("checkedCount", pa.int64()),
+            pa.field("violationCount", pa.int64()),
+            pa.field("violationPercent", pa.float64()),
+            pa.field("sampled", pa.bool_()),
+            pa.field("sampleRows", pa.int64()),
+            pa.field("sampleValues", pa.list_(valueCount))
+        ]),
+        "geometryProfile": pa.schema(datasetFields + [
+            pa.field("subtypeField", pa.string()),
+            pa.field("subtypeCode", pa.string()),
+            pa.field("subtypeName", pa.string()),
+            pa.field("geometryCount", pa.int64()),
+            pa.field("nullCount", pa.int64()),
+            pa.field("emptyCount", pa.int64()),
+            pa.field("zeroLengthCount", pa.int64()),
+            pa.field("zeroAreaCount", pa.int64()),
+            pa.field("multipartCount", pa.int64()),
+            pa.field("vertexMinimum", pa.int64()),
+            pa.field("vertexMaximum", pa.int64()),
+            pa.field("vertexMean", pa.float64()),
+            pa.field("vertexQuantiles", pa.list_(pa.struct([pa.field("probability", pa.float64()), pa.field("value", pa.float64())]))),
+            pa.field("vertexDistribution", pa.list_(vertexBin)),
+            pa.field("partMaximum", pa.int64()),
+            pa.field("partMean", pa.float64()),
+            pa.field("xMin", pa.float64()),
+            pa.field("yMin", pa.float64()),
+            pa.field("xMax", pa.float64()),
+            pa.field("yMax", pa.float64()),
+            pa.field("sampled", pa.bool_()),
+            pa.field("sampleRows", pa.int64())
+        ]),
+        "duplicateKeys": pa.schema(datasetFields + [
+            pa.field("keyFields", pa.list_(pa.string())),
+            pa.field("rowCount", pa.int64()),
+            pa.field("nullKeyCount", pa.int64()),
+            pa.field("distinctKeyCount", pa.int64()),
+            pa.field("duplicateKeyCount", pa.int64()),
+            pa.field("duplicateRowCount", pa.int64()),
+            pa.field("maxOccurrences", pa.int64()),
+            pa.field("isUnique", pa.bool_()),
+            pa.field("sampleKeys", pa.list_(valueCount))
+        ])
+    }
+
+
+def toText(val):
+    '''Nested value columns are strings (field values mix types). NULL stays null.'''
+    return None if val is None else '{0}'.format(val)
+
+
+class ColumnarWriter:
+    """
+    Purpose: typed columnar output (Parquet or Arrow IPC file) for one output. Each writeRecords() call is one
+    feature class & becomes one row group (Parquet) or record batch (Arrow), so results are written as feature
+    classes finish & readers can skip feature classes with predicate pushdown.
+    """
+
+    def __init__(self, outputName, filepath, format="parquet"):
+        import pyarrow as pa
+        self.pa = pa
+        self.outputName = outputName
+        self.filepath = filepath
+        self.format = format
+        self.schema = outputSchemas(pa)[outputName]
+        self.rowsWritten = 0
+        if format == "parquet":
+            import pyarrow.parquet as pq
+            self.writer = pq.ParquetWriter(filepath, self.schema)
+        elif format == "arrow":
+            self.sink = pa.OSFile(filepath, 'wb')
+            self.writer = pa.ipc.new_file(self.sink, self.schema)
+        else:
+            raise ValueError("Unknown columnar format: {0}".format(format))
+
+    @staticmethod
+    def outputFilepath(outDir, keyword, outputName, format="parquet"):
+        return os.path.join(outDir, '{0}_{1}{2}'.format(keyword, OUTPUT_FILE_NAMES[outputName], FILE_EXTENSIONS[format]))
+
+    def writeRecords(self, records):
+        if len(records) == 0:
+            return
+        table = self.pa.Table.from_pylist(records, schema=self.schema)
+        self.writer.write_table(table)
+        self.rowsWritten += len(records)
+
+    def close(self):
+        self.writer.close()
+        if self.format == "arrow":
+            self.sink.close()
@@ -0,0 +1,142 @@
+import time
+import numpy as np
+
+NULL_LABEL = 'Null'
+
+
+def factorize(values, nullMask=None):
+    '''
+    Distinct values (NumPy array) & the index of each row's value in them. The labels are sorted unless the values
+    can't be sorted (i.e. text & numbers in one column), which are hashed in order of appearance. Rows of nullMask
+    (NULLs) get the index len(labels). Shared by the crosstabs & the domain checks.
+    '''
+    if nullMask is not None and nullMask.any():
+        labels, validCodes = factorize(values[~nullMask])
+        codes = np.full(len(values), len(labels), dtype=np.intp)
+        codes[~nullMask] = validCodes
+        return labels, codes
+    try:
+        labels, codes = np.unique(values, return_inverse=True)
+        return labels, codes.ravel()
+    except TypeError:
+        index = {}
+        codes = np.fromiter((index.setdefault(val, len(index)) for val in values.tolist()), dtype=np.intp, count=len(values))
+        labels = np.empty(len(index), dtype=object)
+        labels[:] = list(index)
+        return labels, codes
+
+
+class CrossTab:
+    """
+    Purpose: structured subtype x value counts for one summary field. rows() yields the output rows directly:
+    a header row, one row per subtype & an optional Total row/column.
+    """
+
+    def __init__(self, subtypeField, summaryField, subtypeLabels, valueLabels, counts, hasNullSubtype=False, hasNullValue=False):
+        self.subtypeField = subtypeField
+        self.summaryField = summaryField
+        self.subtypeLabels = subtypeLabels
+        self.valueLabels = valueLabels
+        self.counts = counts
+        # NULL rows are counted under the last (NULL_LABEL) subtype/value
+        self.hasNullSubtype = hasNullSubtype
+        self.hasNullValue = hasNullValue
+        # True when the counts are estimated from a row sample
+        self.sampled = False
+
+    @property
+    def categoryCount(self):
+        return len(self.valueLabels)
+
+    def rows(self, showMargins=True):
+        header = [self.subtypeField] + list(self.valueLabels)
+        if showMargins:
+            header.append('Total')
+        yield header
+
+        for subtypeLabel, rowCounts in zip(self.subtypeLabels, self.counts):
+            row = [subtypeLabel] + rowCounts.tolist()
+            if showMargins:
+                row.append(int(rowCounts.sum()))
+            yield row
+
+        if showMargins:
+            columnTotals = self.counts.sum(axis=0)
+            yield ['Total'] + columnTotals.tolist() + [int(columnTotals.sum())]
+
+    def scaled(self, factor):
+        '''Estimated counts of a crosstab counted over a row sample (sample counts x rows per sampled row)'''
+        crossTab = CrossTab(self.subtypeField, self.summaryField, self.subtypeLabels, self.valueLabels,
+            np.rint(self.counts * factor).astype(np.int64), self.hasNullSubtype, self.hasNullValue)
+        crossTab.sampled = True
+        return crossTab
+
+    def cells(self):
+        '''(subtype, value, count) for every non-zero cell (long form for the columnar output). NULL is None.'''
+        nullSubtypeIndex = len(self.subtypeLabels) - 1 if self.hasNullSubtype else -1
+        nullValueIndex = len(self.valueLabels) - 1 if self.hasNullValue else -1
+        for i, j in zip(*np.nonzero(self.counts)):
+            yield (self.subtypeLabels[i] if i != nullSubtypeIndex else None, self.valueLabels[j] if j != nullValueIndex else None,
+                int(self.counts[i, j]))
+
+
+class CrossTabEngine:
+    """
+    Purpose: vectorized group-by counting of one subtype column against many summary columns, chunk by chunk.
+    Within a chunk each column is factorized to integer codes once & each crosstab is a single np.bincount over
+    (subtype code, value code). The non-zero pairs are merged into running counts across chunks.
+    """
+
+    def __init__(self, subtypeField, summaryFields):
+        self.subtypeField = subtypeField
+        self.summaryFields = list(summaryFields)
+        self.pairCounts = dict((f, {}) for f in self.summaryFields)
+        # Time spent counting each summary field (instrumentation)
+        self.fieldSeconds = dict((f, 0.0) for f in self.summaryFields)
+
+    @staticmethod
+    def chunkLabels(columnChunk):
+        '''Label list & integer code per row of a ColumnChunk (see factorize). NULL rows get the last code & a None label.'''
+        labels, codes = factorize(columnChunk.values, columnChunk.nullMask)
+        return labels.tolist() + ([None] if columnChunk.nullMask.any() else []), codes
+
+    def addChunk(self, subtypeChunk, summaryChunks):
+        '''subtypeChunk & summaryChunks (in summaryFields order) are ChunkedReader ColumnChunks of the same rows'''
+        subtypeLabels, subtypeCodes = self.chunkLabels(subtypeChunk)
+        for fieldName, valueChunk in zip(self.summaryFields, summaryChunks):
+            start = time.perf_counter()
+            valueLabels, valueCodes = self.chunkLabels(valueChunk)
+            numColumns = max(len(valueLabels), 1)
+            counts = np.bincount(subtypeCodes * numColumns + valueCodes, minlength=len(subtypeLabels) * numColumns)
+
+            pairCounts = self.pairCounts[fieldName]
+            for flatIndex in np.flatnonzero(counts).tolist():
+                i, j = divmod(flatIndex, numColumns)
+                key = (subtypeLabels[i], valueLabels[j])
+                pairCounts[key] = pairCounts.get(key, 0) + int(counts[flatIndex])
+            self.fieldSeconds[fieldName] += time.perf_counter() - start
+
+    def crossTabs(self):
+        '''Dictionary of CrossTab per summary field'''
+        return dict((f, self.fromCounts(self.subtypeField, f, [(key[0], key[1], valCount) for key, valCount in self.pairCounts[f].items()]))
+            for f in self.summaryFields)
+
+    @staticmethod
+    def fromCounts(subtypeField, summaryField, countRows):
+        '''CrossTab from aggregated (subtype, value, count) rows, i.e. a database GROUP BY or merged chunk counts'''
+        subtypeValues = factorize(np.array(list(dict.fromkeys(row[0] for row in countRows if row[0] is not None)), dtype=object))[0].tolist()
+        values = factorize(np.array(list(dict.fromkeys(row[1] for row in countRows if row[1] is not None)), dtype=object))[0].tolist()
+        hasNullSubtype = any(row[0] is None for row in countRows)
+        hasNullValue = any(row[1] is None for row in countRows)
+
+        subtypeIndex = dict((val, i) for i, val in enumerate(subtypeValues))
+        valueIndex = dict((val, i) for i, val in enumerate(values))
+        subtypeLabels = subtypeValues + ([NULL_LABEL] if hasNullSubtype else [])
+        valueLabels = values + ([NULL_LABEL] if hasNullValue else [])
+
+        counts = np.zeros((len(subtypeLabels), len(valueLabels)), dtype=np.int64)
+        for subtypeVal, val, valCount in countRows:
+            i = subtypeIndex[subtypeVal] if subtypeVal is not None else len(subtypeValues)
+            j = valueIndex[val] if val is not None else len(values)
+            counts[i, j] += valCount
+        return CrossTab(subtypeField, summaryField, subtypeLabels, valueLabels, counts, hasNullSubtype, hasNullValue)
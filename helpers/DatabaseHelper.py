@@ -1,6 +1,5 @@
 import os
 import json
-import arcpy
 
 class DatabaseHelper:
     def __init__(self):
@@ -13,6 +12,67 @@ class DatabaseHelper:
             data = json.loads(config_string)
             return data
 
+    @staticmethod
+    def validateConfig(config):
+        '''Problems found in a loaded config (missing keys, run flags other than YES/NO, missing source workspaces). Empty if valid.'''
+        problems = []
+        globals = config.get("globals")
+        if globals is None:
+            return ["Missing globals section"]
+
+        for key in ["outDir", "csvLoggingFilepath", "mergeCsvsToExcel", "overWriteOption", "skipSystemFieldTypes"]:
+            if key not in globals:
+                problems.append("Missing globals key: {0}".format(key))
+
+        requiredStages = ["domainSchemaConfig", "featureCountConfig", "fieldCountConfig", "subtypeConfig", "subtypeCountConfig",
+            "attributeRulesConfig"]
+        optionalStages = ["sqlPushdownConfig", "instrumentationConfig", "columnarOutputConfig", "incrementalConfig", "checkpointConfig",
+            "metadataCacheConfig", "fieldSketchConfig", "samplingConfig", "numericStatsConfig",
+            "domainValidationConfig", "geometryProfileConfig", "duplicateKeyConfig"]
+        for stage in requiredStages + optionalStages:
+            if stage not in globals:
+                if stage in requiredStages:
+                    problems.append("Missing globals section: {0}".format(stage))
+                continue
+            run = str(globals[stage].get("run", "")).upper()
+            if run not in ["YES", "NO"]:
+                problems.append("{0} run must be YES or NO: {1}".format(stage, globals[stage].get("run")))
+
+        # Domains are checked in the field counts pass
+        if str(globals.get("domainValidationConfig", {}).get("run", "NO")).upper() == "YES" and str(globals.get("fieldCountConfig", {}).get("run", "")).upper() != "YES":
+            problems.append("domainValidationConfig needs fieldCountConfig run YES (domains are checked in the field counts pass)")
+        geometrySampleRate = globals.get("geometryProfileConfig", {}).get("geometrySampleRate", 1.0)
+        if not isinstance(geometrySampleRate, (int, float)) or not 0 < geometrySampleRate <= 1:
+            problems.append("geometryProfileConfig geometrySampleRate must be a fraction over 0 & up to 1: {0}".format(geometrySampleRate))
+        duplicateKeyConfig = globals.get("duplicateKeyConfig", {})
+        for key in duplicateKeyConfig.get("keys", []):
+            if not (isinstance(key, str) and key) and not (isinstance(key, list) and len(key) > 0 and all(isinstance(fieldName, str) and fieldName for fieldName in key)):
+                problems.append("duplicateKeyConfig keys must be field names or lists of field names: {0}".format(key))
+        memoryBudgetMB = duplicateKeyConfig.get("memoryBudgetMB", 64)
+        if not isinstance(memoryBudgetMB, (int, float)) or memoryBudgetMB <= 0:
+            problems.append("duplicateKeyConfig memoryBudgetMB must be over 0: {0}".format(memoryBudgetMB))
+        spillPartitions = duplicateKeyConfig.get("spillPartitions", 16)
+        if not isinstance(spillPartitions, int) or spillPartitions < 1:
+            problems.append("duplicateKeyConfig spillPartitions must be a whole number of 1 or more: {0}".format(spillPartitions))
+        if str(globals.get("workspaceBackend", "auto")).lower() not in ["auto", "arcpy", "sqlite"]:
+            problems.append("Unknown workspaceBackend: {0}".format(globals.get("workspaceBackend")))
+        if str(globals.get("columnarOutputConfig", {}).get("format", "parquet")).lower() not in ["parquet", "arrow"]:
+            problems.append("Unknown columnarOutputConfig format: {0}".format(globals["columnarOutputConfig"].get("format")))
+
+        sourceDbList = config.get("sourceDbDict")
+        if not sourceDbList:
+            problems.append("No jobs in sourceDbDict")
+        for dbParams in sourceDbList or []:
+            keyword = dbParams.get("keyword", "?")
+            for key in ["keyword", "sourceDir", "dataSetsToCheck", "fcList", "skipFcList", "includeFieldCountFields",
+                "excludeFieldCountFields", "includeSubtypeCountFields", "excludeSubtypeCountFields"]:
+                if key not in dbParams:
+                    problems.append("{0}: missing sourceDbDict key: {1}".format(keyword, key))
+            sourceDir = dbParams.get("sourceDir")
+            if sourceDir and os.path.exists(sourceDir) is False:
+                problems.append("{0}: sourceDir not found: {1}".format(keyword, sourceDir))
+        return problems
+
     @staticmethod
     def folder_exists(folder):
         return os.path.isdir(folder)
@@ -21,6 +81,7 @@ class DatabaseHelper:
     def disconnectUsers(sde_sa_connection):    
         print("\nTesting Environment: {}".format(sde_sa_connection))
         if sde_sa_connection.find('.sde') > -1:
+            import arcpy
             arcpy.env.workspace = sde_sa_connection 
             try:
                 arcpy.DisconnectUser(arcpy.env.workspace, "ALL")
@@ -0,0 +1,71 @@
+class DomainCatalog:
+    """
+    Purpose: workspace-level domain index. Domains are listed once per workspace, indexed by name, and
+    the formatted coded-value/range strings & the domain rules of the domain checks are memoized so every
+    field, feature class & domain export shares them.
+    """
+
+    # One catalog per workspace path for the life of the process
+    _catalogs = {}
+
+    def __init__(self, domains):
+        self.domains = list(domains)
+        self.domainsByName = dict((domain.name, domain) for domain in self.domains)
+        self._formattedDomains = {}
+        self._domainRules = {}
+
+    @classmethod
+    def forWorkspace(cls, workspace, listDomains):
+        '''Returns the cached catalog for the workspace, listing domains with listDomains(workspace) on first use'''
+        catalog = cls._catalogs.get(workspace)
+        if catalog is None:
+            catalog = cls(listDomains(workspace))
+            cls._catalogs[workspace] = catalog
+        return catalog
+
+    @classmethod
+    def clear(cls, workspace=None):
+        if workspace is None:
+            cls._catalogs.clear()
+        else:
+            cls._catalogs.pop(workspace, None)
+
+    def getDomain(self, domainName):
+        return self.domainsByName.get('{0}'.format(domainName))
+
+    def domainColumns(self, domainName):
+        '''Domain name, domain type & values as the 3 FieldCounts domain columns. Empty if no domain matches.'''
+        domainName = '{0}'.format(domainName)
+        columns = self._formattedDomains.get(domainName)
+        if columns is not None:
+            return columns
+
+        columns = ['', '', '']
+        domain = self.domainsByName.get(domainName)
+        if domain is not None:
+            if domain.domainType == 'CodedValue':
+                columns = [domain.name, 'IsCodedValueDomain',
+                    ''.join('{0} : {1}'.format(val, desc) + ' | ' for val, desc in domain.codedValues.items())]
+
+            elif domain.domainType == 'Range':
+                columns = [domain.name, 'IsRangeDomain', 'Min: {0} | Max: {1} |'.format(
+                    domain.range[0],
+                    domain.range[1])]
+            else:
+                columns = [domain.name, '', '']
+
+        self._formattedDomains[domainName] = columns
+        return columns
+
+    def domainRule(self, domainName):
+        '''DomainRule of the domain (coded values as a hashed set or the range bounds). None if no domain matches.'''
+        from DomainValidator import DomainRule
+        domainName = '{0}'.format(domainName)
+        if domainName not in self._domainRules:
+            domain = self.domainsByName.get(domainName)
+            self._domainRules[domainName] = DomainRule(domain) if domain is not None else None
+        return self._domainRules[domainName]
+
+    def formatDomain(self, domainName):
+        '''Domain columns as one text value (i.e. for hashing a schema). Empty if no domain matches.'''
+        return ','.join(str(column) for column in self.domainColumns(domainName)).rstrip(',')
@@ -0,0 +1,192 @@
+import time
+import numpy as np
+from FieldSketches import SpaceSaving
+from ValueCounter import ValueCounter
+from CrossTabEngine import factorize
+
+# Distinct violating values counted exactly per field & subtype for the sample values (the most frequent are written).
+# Past it the values are counted with a SpaceSaving sketch of the same capacity.
+SAMPLE_VALUE_CAPACITY = 100
+
+
+class DomainRule:
+    """
+    Purpose: one domain precomputed for checking values: the codes of a coded value domain as a hashed value set
+    or the bounds of a range domain. Rules are built once per workspace (see DomainCatalog.domainRule()).
+    """
+
+    def __init__(self, domain):
+        self.domainName = domain.name
+        self.domainType = domain.domainType
+        self.codes = None
+        self.minValue = None
+        self.maxValue = None
+        if domain.domainType == 'CodedValue':
+            self.codes = frozenset(domain.codedValues.keys())
+        elif domain.domainType == 'Range' and domain.range is not None:
+            self.minValue, self.maxValue = domain.range[0], domain.range[1]
+
+    def invalidValues(self, values):
+        '''Boolean mask of the (distinct, non-NULL) values that are not in the domain'''
+        if self.codes is not None:
+            codes = self.codes
+            return np.fromiter((val not in codes for val in values.tolist()), dtype=bool, count=len(values))
+        if self.minValue is None or self.maxValue is None or len(values) == 0:
+            return np.zeros(len(values), dtype=bool)
+        if values.dtype.kind == 'M':
+            minValue, maxValue = np.datetime64(self.minValue, 'us'), np.datetime64(self.maxValue, 'us')
+        else:
+            minValue, maxValue = self.minValue, self.maxValue
+        try:
+            return (values < minValue) | (values > maxValue)
+        except TypeError:
+            # Values of another type than the domain (i.e. text in a numeric range) are out of the domain
+            return np.fromiter((not self._inRange(val) for val in values.tolist()), dtype=bool, count=len(values))
+
+    def _inRange(self, val):
+        try:
+            return self.minValue <= val <= self.maxValue
+        except TypeError:
+            return False
+
+
+class FieldDomainCheck:
+    """
+    Purpose: domain conformance counts of one field, filled from the same chunks as the field's value counts.
+    Each row is checked against the domain of its subtype (arcpy.da.ListSubtypes FieldValues) or the field's own
+    domain when the feature class has no subtypes or the row's subtype code is not a subtype. NULLs are not
+    checked. Within a chunk only the distinct (subtype, value) pairs are looked up in the rules.
+
+    Parameters
+    ----------
+    fieldName - field checked.
+    fieldRule - DomainRule of the field's domain (None if the field has no domain).
+    subtypeRules - dictionary of subtype code: DomainRule (None when the subtype has no domain for the field).
+    """
+
+    def __init__(self, fieldName, fieldRule, subtypeRules=None):
+        self.fieldName = fieldName
+        self.fieldRule = fieldRule
+        self.subtypeRules = subtypeRules or {}
+        # Per subtype code (None without subtypes): non-NULL values checked, values out of the domain & their counts
+        # (a ValueCounter, or a SpaceSaving sketch once there are more than SAMPLE_VALUE_CAPACITY distinct values)
+        self.checkedCounts = {}
+        self.violationCounts = {}
+        self.violationValues = {}
+        self.seconds = 0.0
+
+    def ruleFor(self, subtypeCode):
+        if subtypeCode in self.subtypeRules:
+            return self.subtypeRules[subtypeCode]
+        return self.fieldRule
+
+    def addChunk(self, valueChunk, subtypeChunk=None):
+        '''Adds the rows of a ChunkedReader ColumnChunk (& the subtype ColumnChunk of the same rows)'''
+        start = time.perf_counter()
+        validMask = ~valueChunk.nullMask
+        values = valueChunk.values[validMask]
+        if len(values) > 0:
+            valueLabels, valueCodes = factorize(values)
+            if subtypeChunk is None or len(self.subtypeRules) == 0:
+                self._addGroup(None, valueLabels, np.bincount(valueCodes, minlength=len(valueLabels)))
+            else:
+                # NULL subtypes get the last subtype code & are checked against the field domain
+                subtypeLabels, subtypeCodes = factorize(subtypeChunk.values[validMask], subtypeChunk.nullMask[validMask])
+                subtypeLabels = subtypeLabels.tolist() + [None]
+                # One bincount over (subtype, value) pairs
+                counts = np.bincount(subtypeCodes * len(valueLabels) + valueCodes,
+                    minlength=len(subtypeLabels) * len(valueLabels)).reshape(len(subtypeLabels), len(valueLabels))
+                for subtypeCode, subtypeCounts in zip(subtypeLabels, counts):
+                    self._addGroup(subtypeCode, valueLabels, subtypeCounts)
+        self.seconds += time.perf_counter() - start
+
+    def addCounts(self, countRows):
+        '''Adds aggregated (subtype code, value, count) rows, i.e. a database GROUP BY. Use None subtypes without subtypes.'''
+        start = time.perf_counter()
+        subtypeRows = {}
+        for subtypeCode, val, valCount in countRows:
+            if val is not None:
+                subtypeRows.setdefault(subtypeCode, []).append((val, valCount))
+        for subtypeCode, rows in subtypeRows.items():
+            valueLabels = np.empty(len(rows), dtype=object)
+            valueLabels[:] = [val for val, valCount in rows]
+            self._addGroup(subtypeCode, valueLabels, np.array([valCount for val, valCount in rows], dtype=np.int64))
+        self.seconds += time.perf_counter() - start
+
+    def _addGroup(self, subtypeCode, valueLabels, valueCounts):
+        '''Checks the distinct values of one subtype (valueCounts is the count of each value label, 0 if not present)'''
+        rule = self.ruleFor(subtypeCode)
+        present = valueCounts > 0
+        if rule is None or not present.any():
+            return
+        valueLabels, valueCounts = valueLabels[present], valueCounts[present]
+        invalid = rule.invalidValues(valueLabels)
+        self.checkedCounts[subtypeCode] = self.checkedCounts.get(subtypeCode, 0) + int(valueCounts.sum())
+        violationCount = int(valueCounts[invalid].sum())
+        self.violationCounts[subtypeCode] = self.violationCounts.get(subtypeCode, 0) + violationCount
+        if violationCount > 0:
+            violationValues = self.violationValues.setdefault(subtypeCode, ValueCounter())
+            if isinstance(violationValues, ValueCounter):
+                for val, valCount in zip(valueLabels[invalid].tolist(), valueCounts[invalid].tolist()):
+                    violationValues.addCount(val, valCount)
+                if violationValues.distinctCount > SAMPLE_VALUE_CAPACITY:
+                    # Too many distinct violating values to count exactly
+                    sketchValues = np.empty(violationValues.distinctCount, dtype=object)
+                    sketchValues[:] = list(violationValues.counts)
+                    sketch = SpaceSaving(SAMPLE_VALUE_CAPACITY)
+                    sketch.addCounts(sketchValues, np.array(list(violationValues.counts.values()), dtype=np.int64))
+                    self.violationValues[subtypeCode] = sketch
+            else:
+                violationValues.addCounts(valueLabels[invalid], valueCounts[invalid])
+
+    def sampleValues(self, subtypeCode, sampleValueLimit=5):
+        '''[(value, low, high)] most frequent violating values of the subtype. low == high while the values are counted exactly.'''
+        violationValues = self.violationValues.get(subtypeCode)
+        if violationValues is None:
+            return []
+        if isinstance(violationValues, ValueCounter):
+            return [(val, valCount, valCount) for val, valCount in violationValues.topN(sampleValueLimit)]
+        return violationValues.topN(sampleValueLimit)
+
+    def results(self, sampleValueLimit=5):
+        '''(subtype code, DomainRule, values checked, values out of the domain, [(value, low, high)] most frequent violating values) per checked subtype'''
+        for subtypeCode in sorted(self.checkedCounts, key=lambda code: (code is None, code if code is not None else 0)):
+            yield (subtypeCode, self.ruleFor(subtypeCode), self.checkedCounts[subtypeCode], self.violationCounts[subtypeCode],
+                self.sampleValues(subtypeCode, sampleValueLimit))
+
+
+class DomainValidator:
+    """
+    Purpose: checks every domain field of a feature class against its field & subtype domains while the field
+    value counts are read (see FieldProfiler.profile()), so the domains need no second pass over the data.
+
+    Parameters
+    ----------
+    checks - FieldDomainCheck per checked field.
+    subtypeField - subtype field object (None if the feature class has no subtypes). Read with the checked fields.
+    subtypeNames - dictionary of subtype code: subtype name.
+    """
+
+    def __init__(self, checks, subtypeField=None, subtypeNames=None):
+        self.checks = list(checks)
+        self.subtypeField = subtypeField
+        self.subtypeNames = subtypeNames or {}
+        # True when the rows checked are a row sample (see RowSampler.SamplePlan)
+        self.sampled = False
+
+    @property
+    def subtypeFieldName(self):
+        return self.subtypeField.name if self.subtypeField is not None else None
+
+    @property
+    def fieldNames(self):
+        return [check.fieldName for check in self.checks]
+
+    def addChunk(self, fieldNames, columnChunks):
+        '''Adds one chunk of ColumnChunks read over fieldNames (which include the checked & subtype fields)'''
+        chunksByName = dict(zip(fieldNames, columnChunks))
+        subtypeChunk = chunksByName.get(self.subtypeFieldName)
+        for check in self.checks:
+            valueChunk = chunksByName.get(check.fieldName)
+            if valueChunk is not None:
+                check.addChunk(valueChunk, subtypeChunk)
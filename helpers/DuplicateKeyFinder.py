@@ -0,0 +1,309 @@
+import os
+import time
+import shutil
+import tempfile
+import numpy as np
+from FieldSketches import hashValues, combineHashes
+
+# Memory of one in-memory hash set entry: the 64 bit key hash & its 64 bit row count
+ENTRY_BYTES = 16
+# Spill file name of a hash partition (pairs of uint64 hash & count)
+PARTITION_FILE = 'partition{0}.bin'
+
+
+def isInSorted(sortedHashes, hashes):
+    '''Boolean mask of the hashes found in a sorted, unique hash array'''
+    if len(sortedHashes) == 0:
+        return np.zeros(len(hashes), dtype=bool)
+    positions = np.minimum(np.searchsorted(sortedHashes, hashes), len(sortedHashes) - 1)
+    return sortedHashes[positions] == hashes
+
+
+def mergeRuns(runs):
+    '''One (sorted unique hashes, counts) run of several runs (counts of the same hash are added)'''
+    if len(runs) == 1:
+        return runs[0]
+    hashes, inverse = np.unique(np.concatenate([runHashes for runHashes, runCounts in runs]), return_inverse=True)
+    counts = np.bincount(inverse.ravel(), weights=np.concatenate([runCounts for runHashes, runCounts in runs]), minlength=len(hashes))
+    return hashes, counts.astype(np.int64)
+
+
+class KeyHashSummary:
+    """Purpose: counts of a KeyHashSet once every key is added (see KeyHashSet.summarize())."""
+
+    def __init__(self):
+        self.distinctKeyCount = 0
+        self.duplicateKeyCount = 0  # keys found on more than one row
+        self.duplicateRowCount = 0  # rows whose key is found on another row too
+        self.maxOccurrences = 0
+        self.hashCounts = {}  # row count of each requested hash
+        self.topDuplicates = []  # (hash, row count) of the most repeated keys
+
+    def add(self, hashes, counts, countHashes, topLimit):
+        '''Adds the complete counts of a set of hashes (all of them, or all of one partition)'''
+        if len(hashes) == 0:
+            return
+        self.distinctKeyCount += len(hashes)
+        repeated = counts > 1
+        self.duplicateKeyCount += int(repeated.sum())
+        self.duplicateRowCount += int(counts[repeated].sum())
+        self.maxOccurrences = max(self.maxOccurrences, int(counts.max()))
+        if len(countHashes) > 0:
+            found = isInSorted(hashes, countHashes)
+            positions = np.searchsorted(hashes, countHashes[found])
+            self.hashCounts.update(zip(countHashes[found].tolist(), counts[positions].tolist()))
+        if topLimit > 0 and repeated.any():
+            repeatedHashes, repeatedCounts = hashes[repeated], counts[repeated]
+            if len(repeatedCounts) > topLimit:
+                top = np.argpartition(-repeatedCounts, topLimit - 1)[:topLimit]
+                repeatedHashes, repeatedCounts = repeatedHashes[top], repeatedCounts[top]
+            top = self.topDuplicates + list(zip(repeatedHashes.tolist(), repeatedCounts.tolist()))
+            self.topDuplicates = sorted(top, key=lambda item: item[1], reverse=True)[:topLimit]
+
+
+class KeyHashSet:
+    """
+    Purpose: compact row count per 64 bit key hash. Chunks of hashes are kept as sorted (hash, count) runs that are
+    merged as they grow (each run at least twice the size of the next), so a chunk is looked up in a few binary
+    searches. Once the runs hold more entries than the memory budget they are spilled to disk, split into hash
+    partitions, & counted one partition at a time in summarize(). Keys seen before a spill can't be looked up
+    afterwards, so add() only flags the repeats found in memory.
+
+    Parameters
+    ----------
+    memoryBudgetMB - memory of the in-memory runs (ENTRY_BYTES per distinct hash) before they are spilled.
+    spillPartitions - number of hash partitions (spill files). A partition is loaded at once when counting.
+    spillDir - folder of the spill files (a temporary folder is made in it). None for the system temp folder.
+    """
+
+    def __init__(self, memoryBudgetMB=64, spillPartitions=16, spillDir=None):
+        self.maxEntries = max(int(memoryBudgetMB * 1024 * 1024 / ENTRY_BYTES), 1)
+        self.spillPartitions = max(int(spillPartitions), 1)
+        self.spillDir = spillDir
+        self.runs = []
+        self.spillPath = None
+        self.spillCount = 0
+
+    @property
+    def entryCount(self):
+        return sum(len(runHashes) for runHashes, runCounts in self.runs)
+
+    @property
+    def spilled(self):
+        return self.spillPath is not None
+
+    def add(self, hashes):
+        '''Adds a chunk of key hashes. Returns a boolean mask of the rows whose key was seen before (in memory) or earlier in the chunk.'''
+        chunkHashes, firstIndexes, inverse, counts = np.unique(hashes, return_index=True, return_inverse=True, return_counts=True)
+        repeated = np.ones(len(hashes), dtype=bool)
+        repeated[firstIndexes] = False
+        seen = np.zeros(len(chunkHashes), dtype=bool)
+        for runHashes, runCounts in self.runs:
+            seen |= isInSorted(runHashes, chunkHashes)
+        repeated |= seen[inverse.ravel()]
+
+        self.runs.append((chunkHashes, counts.astype(np.int64)))
+        while len(self.runs) > 1 and len(self.runs[-2][0]) <= 2 * len(self.runs[-1][0]):
+            self.runs[-2:] = [mergeRuns(self.runs[-2:])]
+        if self.entryCount > self.maxEntries:
+            self._spill()
+        return repeated
+
+    def _spill(self):
+        '''Appends the in-memory runs to the partition files & empties them'''
+        if len(self.runs) == 0:
+            return
+        if self.spillPath is None:
+            self.spillPath = tempfile.mkdtemp(prefix='DuplicateKeys', dir=self.spillDir)
+        hashes, counts = mergeRuns(self.runs)
+        self.runs = []
+        partitions = (hashes % np.uint64(self.spillPartitions)).astype(np.intp)
+        entries = np.column_stack([hashes, counts.astype(np.uint64)])
+        for partition in range(self.spillPartitions):
+            partitionEntries = entries[partitions == partition]
+            if len(partitionEntries) > 0:
+                with open(os.path.join(self.spillPath, PARTITION_FILE.format(partition)), 'ab') as partitionFile:
+                    partitionEntries.tofile(partitionFile)
+        self.spillCount += 1
+
+    def summarize(self, countHashes=(), topLimit=0):
+        '''KeyHashSummary of every hash added, with the counts of countHashes & the topLimit most repeated keys'''
+        countHashes = np.unique(np.asarray(list(countHashes), dtype=np.uint64))
+        summary = KeyHashSummary()
+        if self.spillPath is None:
+            if len(self.runs) > 0:
+                hashes, counts = mergeRuns(self.runs)
+                summary.add(hashes, counts, countHashes, topLimit)
+            return summary
+
+        self._spill()
+        for partition in range(self.spillPartitions):
+            partitionFilepath = os.path.join(self.spillPath, PARTITION_FILE.format(partition))
+            if os.path.exists(partitionFilepath):
+                entries = np.fromfile(partitionFilepath, dtype=np.uint64).reshape(-1, 2)
+                # A hash is in a partition file once per spill it was in memory for
+                hashes, inverse = np.unique(entries[:, 0], return_inverse=True)
+                counts = np.bincount(inverse.ravel(), weights=entries[:, 1], minlength=len(hashes)).astype(np.int64)
+                summary.add(hashes, counts, countHashes, topLimit)
+        return summary
+
+    def close(self):
+        '''Removes the spill files'''
+        self.runs = []
+        if self.spillPath is not None:
+            shutil.rmtree(self.spillPath, ignore_errors=True)
+            self.spillPath = None
+
+
+class KeyCheck:
+    """
+    Purpose: duplicate counts of one single or composite key of a feature class. The key fields of each row are
+    hashed together (FieldSketches.hashValues & combineHashes) into a KeyHashSet. Rows with a NULL in any key field
+    are counted apart & not compared. The key values of the first duplicates found are kept as samples.
+
+    Parameters
+    ----------
+    keyFields - field objects of the key, in key order.
+    sampleKeyLimit - duplicate keys kept as samples.
+    memoryBudgetMB, spillPartitions, spillDir - KeyHashSet parameters.
+    """
+
+    def __init__(self, keyFields, sampleKeyLimit=5, memoryBudgetMB=64, spillPartitions=16, spillDir=None):
+        self.keyFields = list(keyFields)
+        self.sampleKeyLimit = int(sampleKeyLimit)
+        self.hashSet = KeyHashSet(memoryBudgetMB, spillPartitions, spillDir)
+        self.rowCount = 0
+        self.nullKeyCount = 0
+        self.sampleKeys = {}  # key hash: key value (tuple of values for composite keys)
+        self.pendingHashes = set()  # duplicate hashes whose key values are read in a second pass
+        self.seconds = 0.0
+
+    @property
+    def fieldNames(self):
+        return [f.name for f in self.keyFields]
+
+    @property
+    def keyLabel(self):
+        return ', '.join(str(fieldName) for fieldName in self.fieldNames)
+
+    def keyHashes(self, keyChunks):
+        '''(hashes, row mask) of the rows of a chunk without a NULL key field'''
+        validMask = ~np.logical_or.reduce([keyChunk.nullMask for keyChunk in keyChunks])
+        hashes = None
+        for keyChunk in keyChunks:
+            valueHashes = hashValues(keyChunk.values[validMask])
+            hashes = valueHashes if hashes is None else combineHashes(hashes, valueHashes)
+        return hashes, validMask
+
+    def keyValue(self, keyChunks, row):
+        values = tuple(keyChunk.values[row:row + 1].tolist()[0] for keyChunk in keyChunks)
+        return values[0] if len(values) == 1 else values
+
+    def addChunk(self, keyChunks):
+        '''Adds one chunk of the key field ColumnChunks (key order)'''
+        start = time.perf_counter()
+        hashes, validMask = self.keyHashes(keyChunks)
+        self.rowCount += len(validMask)
+        self.nullKeyCount += len(validMask) - len(hashes)
+        if len(hashes) > 0:
+            repeated = self.hashSet.add(hashes)
+            if len(self.sampleKeys) < self.sampleKeyLimit and repeated.any():
+                self._addSamples(keyChunks, hashes, np.flatnonzero(validMask), np.flatnonzero(repeated), self.sampleKeyLimit)
+        self.seconds += time.perf_counter() - start
+
+    def _addSamples(self, keyChunks, hashes, validRows, sampleIndexes, sampleLimit):
+        '''Keeps the key values of the sampleIndexes rows (indexes into hashes) until sampleLimit keys are kept'''
+        for i in sampleIndexes.tolist():
+            keyHash = int(hashes[i])
+            if keyHash in self.sampleKeys:
+                continue
+            self.sampleKeys[keyHash] = self.keyValue(keyChunks, validRows[i])
+            if len(self.sampleKeys) >= sampleLimit:
+                break
+
+    def summarize(self):
+        '''KeyHashSummary of the key. Sample keys lost to a spill are left in pendingHashes for readSamples().'''
+        start = time.perf_counter()
+        summary = self.hashSet.summarize(list(self.sampleKeys), self.sampleKeyLimit)
+        missingCount = min(self.sampleKeyLimit, summary.duplicateKeyCount) - len(self.sampleKeys)
+        if missingCount > 0:
+            self.pendingHashes = set([keyHash for keyHash, keyCount in summary.topDuplicates if keyHash not in self.sampleKeys][:missingCount])
+            summary.hashCounts.update(summary.topDuplicates)
+        self.seconds += time.perf_counter() - start
+        return summary
+
+    def samples(self, summary):
+        '''(key value, row count) of the sample duplicate keys, in the order found'''
+        return [(keyValue, summary.hashCounts.get(keyHash, 0)) for keyHash, keyValue in self.sampleKeys.items()]
+
+    def addSampleChunk(self, keyChunks):
+        '''Keeps the key values of the pendingHashes rows of a chunk (the second pass after a spill)'''
+        start = time.perf_counter()
+        if len(self.pendingHashes) > 0:
+            hashes, validMask = self.keyHashes(keyChunks)
+            wanted = isInSorted(np.array(sorted(self.pendingHashes), dtype=np.uint64), hashes)
+            if wanted.any():
+                self._addSamples(keyChunks, hashes, np.flatnonzero(validMask), np.flatnonzero(wanted),
+                    len(self.sampleKeys) + len(self.pendingHashes))
+                self.pendingHashes.difference_update(self.sampleKeys)
+        self.seconds += time.perf_counter() - start
+
+    def close(self):
+        self.hashSet.close()
+
+
+class DuplicateKeyFinder:
+    """
+    Purpose: checks the configured single & composite keys of a feature class for duplicates. The key fields are
+    read with the field counts pass when it reads every row (see FieldProfiler.profile()), else by their own read.
+
+    Parameters
+    ----------
+    checks - KeyCheck per key whose fields are all in the feature class.
+    """
+
+    def __init__(self, checks):
+        self.checks = list(checks)
+        # True once every row was added (by the field counts pass or profile())
+        self.scanned = False
+
+    @property
+    def fields(self):
+        '''Key fields of every check, each once'''
+        fields = []
+        for check in self.checks:
+            fields.extend(f for f in check.keyFields if f.name not in [field.name for field in fields])
+        return fields
+
+    @property
+    def needsSampleRead(self):
+        return any(len(check.pendingHashes) > 0 for check in self.checks)
+
+    def addChunk(self, fieldNames, columnChunks):
+        '''Adds one chunk of ColumnChunks read over fieldNames (which include every key field)'''
+        chunksByName = dict(zip(fieldNames, columnChunks))
+        for check in self.checks:
+            check.addChunk([chunksByName[fieldName] for fieldName in check.fieldNames])
+
+    def profile(self, reader):
+        '''Reads every chunk of a ChunkedReader over self.fields'''
+        for columnChunks in reader.chunks():
+            self.addChunk(reader.fieldNames, columnChunks)
+        self.scanned = True
+
+    def summarize(self):
+        '''(KeyCheck, KeyHashSummary) per key'''
+        return [(check, check.summarize()) for check in self.checks]
+
+    def readSamples(self, reader):
+        '''Second pass over self.fields for the sample keys of the checks that spilled (see KeyCheck.summarize())'''
+        for columnChunks in reader.chunks():
+            chunksByName = dict(zip(reader.fieldNames, columnChunks))
+            for check in self.checks:
+                check.addSampleChunk([chunksByName[fieldName] for fieldName in check.fieldNames])
+            if not self.needsSampleRead:
+                break
+
+    def close(self):
+        for check in self.checks:
+            check.close()
@@ -0,0 +1,137 @@
+import re
+import csv
+from collections import deque
+
+# Excel sheet limits
+EXCEL_MAX_ROWS = 1048576
+EXCEL_MAX_CELL_CHARS = 32767
+
+INTEGER_PATTERN = re.compile(r'^-?\d+$')
+FLOAT_PATTERN = re.compile(r'^-?(\d+\.\d*|\.\d+)([eE][-+]?\d+)?$')
+
+
+class ExcelStreamWriter:
+    """
+    Purpose: constant-memory xlsx workbook (openpyxl write_only). Rows are streamed to each sheet's temp file as
+    they are appended & the workbook is assembled on save(), so sheets are never held in memory.
+    """
+
+    def __init__(self, excelFilepath):
+        from openpyxl import Workbook
+        self.excelFilepath = excelFilepath
+        self.workbook = Workbook(write_only=True)
+        self.sheetNames = []
+
+    def createSheet(self, sheetName):
+        # Sheet names are limited to 31 characters & must be unique
+        sheetName = sheetName[:31]
+        counter = 2
+        uniqueName = sheetName
+        while uniqueName in self.sheetNames:
+            suffix = '_{0}'.format(counter)
+            uniqueName = sheetName[:31 - len(suffix)] + suffix
+            counter += 1
+        self.sheetNames.append(uniqueName)
+        return self.workbook.create_sheet(uniqueName)
+
+    def save(self):
+        self.workbook.save(self.excelFilepath)
+
+
+class CsvExcelSink:
+    """
+    Purpose: output file object that writes the CSV text as before & streams the same rows into an xlsx sheet in
+    the same pass. One csv reader parses the text of every write, so quoted values keep their line breaks & a record
+    split across writes is one row. Blank lines are blank rows (as in the CSV) & numeric cells are written as numbers.
+    A sheet that reaches the Excel row limit continues on a new sheet with the header repeated.
+
+    Parameters
+    ----------
+    csvFile - open CSV file object (or None to only write Excel).
+    excelWriter - ExcelStreamWriter the sheet is created in (shared by all outputs for the merged workbook).
+    sheetName - sheet name.
+    ownsExcelWriter - True to save the workbook on close() (one workbook per output).
+    """
+
+    def __init__(self, csvFile, excelWriter, sheetName, ownsExcelWriter=False):
+        self.csvFile = csvFile
+        self.excelWriter = excelWriter
+        self.sheetName = sheetName
+        self.ownsExcelWriter = ownsExcelWriter
+        self.worksheet = excelWriter.createSheet(sheetName)
+        self.sheetRows = 0
+        self.rowsWritten = 0
+        self.headerRow = None
+        self._partialLine = ''
+        # Lines of the record being read & the quotes in them (a line break inside a quoted value follows an odd count)
+        self._recordLines = deque()
+        self._recordQuotes = 0
+        self.csvReader = csv.reader(self._readRecordLines())
+
+    def write(self, text):
+        if self.csvFile is not None:
+            self.csvFile.write(text)
+        self.writeExcel(text)
+
+    def writeExcel(self, text):
+        '''Streams text to the sheet only, i.e. to rebuild the sheet of a resumed CSV that is appended to'''
+        lines = (self._partialLine + text).split('\n')
+        # The text after the last line break is kept until the line is complete
+        self._partialLine = lines.pop()
+        for line in lines:
+            self._recordLines.append(line + '\n')
+            self._recordQuotes += line.count('"')
+            if self._recordQuotes % 2 == 0:
+                # The record is complete: the reader reads exactly its lines
+                self._appendRow(next(self.csvReader))
+                self._recordQuotes = 0
+
+    def _readRecordLines(self):
+        '''Lines of the csv reader. Only read once writeExcel has queued every line of a complete record.'''
+        while True:
+            yield self._recordLines.popleft()
+
+    @staticmethod
+    def toCellValue(val):
+        if val == '':
+            return None
+        if INTEGER_PATTERN.match(val):
+            return int(val)
+        if FLOAT_PATTERN.match(val):
+            return float(val)
+        if len(val) > EXCEL_MAX_CELL_CHARS:
+            return val[:EXCEL_MAX_CELL_CHARS]
+        return val
+
+    def _appendRow(self, row):
+        cells = [self.toCellValue(val) for val in row]
+        if self.headerRow is None:
+            self.headerRow = cells
+        elif self.sheetRows >= EXCEL_MAX_ROWS:
+            # Continue on a new sheet
+            self.worksheet = self.excelWriter.createSheet(self.sheetName)
+            self.worksheet.append(self.headerRow)
+            self.sheetRows = 1
+        self.worksheet.append(cells)
+        self.sheetRows += 1
+        self.rowsWritten += 1
+
+    def flush(self):
+        if self.csvFile is not None:
+            self.csvFile.flush()
+
+    def fileno(self):
+        return self.csvFile.fileno()
+
+    def close(self):
+        # Text left without a final line break (or with an unclosed quote) is the last record
+        remainingLines = list(self._recordLines) + ([self._partialLine] if self._partialLine else [])
+        if len(remainingLines) > 0:
+            for row in csv.reader(remainingLines):
+                self._appendRow(row)
+            self._recordLines.clear()
+            self._partialLine = ''
+        if self.csvFile is not None:
+            self.csvFile.close()
+        if self.ownsExcelWriter:
+            self.excelWriter.save()
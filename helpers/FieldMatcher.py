@@ -0,0 +1,65 @@
+import re
+import fnmatch
+
+# Prefixes of explicit pattern syntax. Entries without a prefix match anywhere in the field name (substring).
+GLOB_PREFIX = 'glob:'
+REGEX_PREFIX = 're:'
+
+
+def patternToRegex(pattern):
+    '''Regex of one include/exclude entry. Matching ignores case.'''
+    if pattern.lower().startswith(REGEX_PREFIX):
+        return pattern[len(REGEX_PREFIX):]
+    if pattern.lower().startswith(GLOB_PREFIX):
+        # Globs match the whole field name (i.e. glob:*ID matches FACILITYID, not IDENTIFIER)
+        return '^(?:{0})'.format(fnmatch.translate(pattern[len(GLOB_PREFIX):]))
+    return re.escape(pattern)
+
+
+def compilePatterns(patterns):
+    '''One combined regex of every entry (None if the list is empty), so a field name is checked in one search'''
+    if len(patterns) == 0:
+        return None
+    return re.compile('|'.join('(?:{0})'.format(patternToRegex(str(pattern))) for pattern in patterns), re.IGNORECASE)
+
+
+class FieldDecision:
+    """Purpose: precomputed include/exclude decision of one field name."""
+
+    __slots__ = ('included', 'excluded', 'counted')
+
+    def __init__(self, included, excluded, counted):
+        self.included = included # Matches an include entry (all values are written, no top N limit)
+        self.excluded = excluded # Matches an exclude entry
+        self.counted = counted # Values are counted (include list matched, or no include list & not excluded)
+
+
+class FieldMatcher:
+    """
+    Purpose: include/exclude field lists compiled once into a combined regex per list. Decisions are cached by
+    field name: the lists only look at the name, so feature classes sharing a schema share the cached decisions.
+
+    Parameters
+    ----------
+    includePatterns - entries to include. If populated, only matching fields are counted.
+    excludePatterns - entries to exclude (only used when the include list is empty, except that an included
+        field also matching an exclude entry is reported as excluded).
+    Entries match anywhere in the field name, ignoring case. Prefix an entry with glob: for a wildcard pattern
+    matching the whole name (glob:*_ID) or re: for a regular expression (re:^LAST_EDIT).
+    """
+
+    def __init__(self, includePatterns, excludePatterns):
+        self.includeRegex = compilePatterns(includePatterns)
+        self.excludeRegex = compilePatterns(excludePatterns)
+        self.decisions = {}
+
+    def decide(self, fieldName):
+        fieldName = str(fieldName)
+        decision = self.decisions.get(fieldName)
+        if decision is None:
+            included = self.includeRegex is not None and self.includeRegex.search(fieldName) is not None
+            excluded = self.excludeRegex is not None and self.excludeRegex.search(fieldName) is not None
+            counted = included if self.includeRegex is not None else not excluded
+            decision = FieldDecision(included, excluded, counted)
+            self.decisions[fieldName] = decision
+        return decision
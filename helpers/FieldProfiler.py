@@ -0,0 +1,149 @@
+import time
+import numpy as np
+from ValueCounter import ValueCounter
+from FieldSketches import HyperLogLog, SpaceSaving
+from NumericStats import NumericStats, DATE_FIELD_TYPES
+
+
+class FieldAccumulator:
+    """
+    Purpose: running per-field totals (value counts, null counts & field type info) that are filled
+    from a single shared cursor pass over a feature class. Fields that are not counted exactly can keep
+    fixed memory sketches instead (distinct count estimate & top values, see enableSketches()). Numeric & date
+    fields can also keep min/max/mean/standard deviation, quantile & histogram partials (see enableNumericStats()).
+    """
+
+    def __init__(self, field, countValues):
+        self.field = field
+        self.fieldName = field.name
+        self.fieldType = field.type
+        self.countValues = countValues
+        self.rowCount = 0
+        self.nullCount = 0
+        self.valueCounter = ValueCounter()
+        # Time spent counting this field (instrumentation)
+        self.seconds = 0.0
+        # True when the counts are of a row sample (see RowSampler.SamplePlan)
+        self.sampled = False
+        # Sketches of fields that are not counted exactly & the COUNT(DISTINCT) of a database aggregated field
+        self.distinctSketch = None
+        self.topValuesSketch = None
+        self.databaseDistinctCount = None
+        # Numeric/date statistics & whether the field is only read for them (a skipSystemFieldTypes type, i.e. Date)
+        self.numericStats = None
+        self.statsOnly = False
+
+    def enableNumericStats(self, maxCentroids=1000):
+        self.numericStats = NumericStats(self.fieldType in DATE_FIELD_TYPES, maxCentroids)
+
+    def enableSketches(self, precision=14, topValuesCapacity=100):
+        self.distinctSketch = HyperLogLog(precision)
+        self.topValuesSketch = SpaceSaving(topValuesCapacity)
+
+    @property
+    def distinctCount(self):
+        '''Distinct non-NULL values: exact for counted fields, else the database count or the sketch estimate (None if unknown)'''
+        if self.countValues:
+            return self.valueCounter.distinctCount - (1 if self.valueCounter.get(None) > 0 else 0)
+        if self.databaseDistinctCount is not None:
+            return self.databaseDistinctCount
+        if self.distinctSketch is not None and self.rowCount > 0:
+            return int(round(self.distinctSketch.estimate()))
+        return None
+
+    def addChunk(self, columnChunk):
+        '''Adds a ChunkedReader ColumnChunk. Values are counted with one vectorized np.unique per chunk.'''
+        nullCount = columnChunk.nullCount
+        self.rowCount += len(columnChunk)
+        self.nullCount += nullCount
+        if self.numericStats is not None:
+            self.numericStats.addValues(columnChunk.validValues())
+        if self.countValues:
+            if nullCount > 0:
+                self.valueCounter.addCount(None, nullCount)
+            validValues = columnChunk.validValues()
+            try:
+                uniqueValues, uniqueCounts = np.unique(validValues, return_counts=True)
+            except TypeError:
+                # Values that can't be sorted (i.e. mixed object types) are counted one by one
+                self.valueCounter.update(validValues.tolist())
+                return
+            for val, valCount in zip(uniqueValues.tolist(), uniqueCounts.tolist()):
+                self.valueCounter.addCount(val, valCount)
+        elif self.distinctSketch is not None:
+            validValues = columnChunk.validValues()
+            try:
+                uniqueValues, uniqueCounts = np.unique(validValues, return_counts=True)
+            except TypeError:
+                uniqueValues, uniqueCounts = np.unique(validValues.astype(str), return_counts=True)
+            # Only the distinct values of the chunk are hashed & merged
+            self.distinctSketch.add(uniqueValues)
+            self.topValuesSketch.addCounts(uniqueValues, uniqueCounts)
+
+    def addCount(self, val, valCount):
+        '''Adds a value count that was aggregated in the database'''
+        self.rowCount += valCount
+        if val is None:
+            self.nullCount += valCount
+        if self.countValues:
+            self.valueCounter.addCount(val, valCount)
+
+    def addCounts(self, valueCounts):
+        '''Adds the (value, count) pairs of a database GROUP BY. The numeric statistics take them in one batch.'''
+        valueCounts = list(valueCounts)
+        for val, valCount in valueCounts:
+            self.addCount(val, valCount)
+        if self.numericStats is not None:
+            self.addStatsCounts(valueCounts)
+
+    def addStatsCounts(self, valueCounts):
+        '''Adds database (value, count) pairs to the numeric statistics only (NULLs are left out)'''
+        valueCounts = [(val, valCount) for val, valCount in valueCounts if val is not None]
+        self.numericStats.addCounts([val for val, valCount in valueCounts], [valCount for val, valCount in valueCounts])
+
+
+class FieldProfiler:
+    """
+    Purpose: profiles every eligible field of a feature class from one cursor. Each chunk of rows is fanned out
+    to the field accumulators in cursor field order so a feature class is only read once. The same chunks are
+    checked against the field & subtype domains when a DomainValidator is given & their key fields are hashed
+    when a DuplicateKeyFinder is given.
+    """
+
+    def __init__(self, accumulators, domainValidator=None, duplicateKeyFinder=None):
+        self.accumulators = list(accumulators)
+        self.domainValidator = domainValidator
+        self.duplicateKeyFinder = duplicateKeyFinder
+
+    @property
+    def fieldNames(self):
+        return [f.name for f in self.fields]
+
+    @property
+    def fields(self):
+        fields = [acc.field for acc in self.accumulators]
+        # The subtype field is read for the domain checks even if it isn't profiled (i.e. a skipped field type)
+        if self.domainValidator is not None and self.domainValidator.subtypeField is not None:
+            if self.domainValidator.subtypeFieldName not in [f.name for f in fields]:
+                fields.append(self.domainValidator.subtypeField)
+        # Key fields are read for the duplicate checks even if they aren't profiled (i.e. excluded fields)
+        if self.duplicateKeyFinder is not None:
+            fields.extend(f for f in self.duplicateKeyFinder.fields if f.name not in [field.name for field in fields])
+        return fields
+
+    def profile(self, chunkedReader):
+        '''Consumes every chunk of a ChunkedReader created over self.fields'''
+        accumulators = self.accumulators
+        fieldNames = self.fieldNames
+        for columnChunks in chunkedReader.chunks():
+            for acc, columnChunk in zip(accumulators, columnChunks):
+                start = time.perf_counter()
+                acc.addChunk(columnChunk)
+                acc.seconds += time.perf_counter() - start
+            if self.domainValidator is not None:
+                self.domainValidator.addChunk(fieldNames, columnChunks)
+            if self.duplicateKeyFinder is not None:
+                self.duplicateKeyFinder.addChunk(fieldNames, columnChunks)
+        if self.duplicateKeyFinder is not None:
+            self.duplicateKeyFinder.scanned = True
+        return self.accumulators
@@ -0,0 +1,187 @@
+import math
+import numpy as np
+
+# splitmix64 finalizer & FNV-1a constants
+MIX_MULTIPLIER_1 = np.uint64(0xbf58476d1ce4e5b9)
+MIX_MULTIPLIER_2 = np.uint64(0x94d049bb133111eb)
+FNV_OFFSET = np.uint64(0xcbf29ce484222325)
+FNV_PRIME = np.uint64(0x100000001b3)
+LOW_32_BITS = np.uint64(0xffffffff)
+
+
+def _mix(bits):
+    '''splitmix64 finalizer, so nearby values (i.e. sequential IDs) get unrelated hashes'''
+    with np.errstate(over='ignore'):
+        bits = bits ^ (bits >> np.uint64(30))
+        bits = bits * MIX_MULTIPLIER_1
+        bits = bits ^ (bits >> np.uint64(27))
+        bits = bits * MIX_MULTIPLIER_2
+        return bits ^ (bits >> np.uint64(31))
+
+
+def hashValues(values):
+    '''
+    Deterministic 64 bit hash of every value of a NumPy array (the same value hashes the same in every run &
+    process, unlike hash()). Numbers & dates are hashed from their bits, text with FNV-1a over the characters.
+    '''
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.uint64)
+    kind = values.dtype.kind
+    if kind in 'iub':
+        return _mix(values.astype(np.int64).view(np.uint64))
+    if kind == 'f':
+        return _mix(values.astype(np.float64).view(np.uint64))
+    if kind in 'mM':
+        return _mix(values.view(np.int64).view(np.uint64))
+
+    return _mix(_hashText([val if isinstance(val, str) else str(val) for val in values.tolist()]))
+
+
+def _hashText(texts):
+    '''
+    FNV-1a over the characters of each string. The strings are concatenated into one code point buffer (no padding
+    to the longest string), so time & memory grow with the total characters. Strings are ordered longest first so
+    the strings still being hashed at character position i are a prefix.
+    '''
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    characters = np.frombuffer(''.join(texts).encode('utf-32-le', 'surrogatepass'), dtype=np.uint32).astype(np.uint64)
+    offsets = np.cumsum(lengths) - lengths
+    order = np.argsort(-lengths, kind='stable')
+    sortedOffsets = offsets[order]
+    # Strings longer than i characters, per character position i
+    activeCounts = np.searchsorted(-lengths[order], -np.arange(int(lengths.max()) if len(texts) > 0 else 0), side='left')
+    hashes = np.full(len(texts), FNV_OFFSET, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for i, activeCount in enumerate(activeCounts.tolist()):
+            active = hashes[:activeCount]
+            active ^= characters[sortedOffsets[:activeCount] + i]
+            active *= FNV_PRIME
+    result = np.empty_like(hashes)
+    result[order] = hashes
+    return result
+
+
+def combineHashes(hashes, valueHashes):
+    '''Hash of (hashes, valueHashes) pairs, i.e. the hash of a composite key one field at a time (order matters)'''
+    with np.errstate(over='ignore'):
+        return _mix((hashes * FNV_PRIME) ^ valueHashes)
+
+
+def _bitLength(bits):
+    '''Number of significant bits of each uint64 (0 for 0). Split in 32 bit halves so the float conversion is exact.'''
+    high = np.frexp((bits >> np.uint64(32)).astype(np.float64))[1]
+    low = np.frexp((bits & LOW_32_BITS).astype(np.float64))[1]
+    return np.where(high > 0, high + 32, low)
+
+
+class HyperLogLog:
+    """
+    Purpose: fixed memory distinct count estimate. 2^precision one byte registers (16 KB at the default precision
+    of 14) give a relative standard error of about 1.04 / sqrt(2^precision), i.e. 0.8%, at any cardinality.
+    Until 2^precision / 8 distinct hashes are seen they are kept as is (the same memory as the registers), so
+    small cardinalities are counted exactly.
+    """
+
+    def __init__(self, precision=14):
+        self.precision = int(precision)
+        self.registers = np.zeros(1 << self.precision, dtype=np.uint8)
+        self.sparseLimit = len(self.registers) // 8
+        self.sparseHashes = np.zeros(0, dtype=np.uint64)
+
+    def addHashes(self, hashes):
+        if len(hashes) == 0:
+            return
+        if self.sparseHashes is not None:
+            self.sparseHashes = np.union1d(self.sparseHashes, hashes)
+            if len(self.sparseHashes) <= self.sparseLimit:
+                return
+            hashes, self.sparseHashes = self.sparseHashes, None
+        self._addToRegisters(hashes)
+
+    def _addToRegisters(self, hashes):
+        remainingBits = 64 - self.precision
+        index = (hashes >> np.uint64(remainingBits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << remainingBits) - 1)
+        # Position of the first 1 bit in the remaining bits
+        rank = (remainingBits - _bitLength(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def add(self, values):
+        self.addHashes(hashValues(values))
+
+    def merge(self, other):
+        '''Adds the values of another sketch of the same precision (i.e. from another chunk or worker)'''
+        if other.sparseHashes is not None:
+            self.addHashes(other.sparseHashes)
+            return self
+        if self.sparseHashes is not None:
+            self._addToRegisters(self.sparseHashes)
+            self.sparseHashes = None
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        if self.sparseHashes is not None:
+            return float(len(self.sparseHashes))
+        m = float(len(self.registers))
+        alpha = 0.7213 / (1.0 + 1.079 / m)
+        rawEstimate = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+        zeroRegisters = int(np.count_nonzero(self.registers == 0))
+        if rawEstimate <= 2.5 * m and zeroRegisters > 0:
+            return m * math.log(m / zeroRegisters)
+        return rawEstimate
+
+
+class SpaceSaving:
+    """
+    Purpose: fixed memory heavy hitters (top-K values) with at most `capacity` counters. Counters are kept in the
+    mergeable Misra-Gries form: a counter is a lower bound of the value's count & the true count is at most
+    counter + maxError (the Space-Saving estimate). Every value occurring more than total / (capacity + 1) times
+    is kept.
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = max(int(capacity), 1)
+        self.counts = {}
+        self.maxError = 0
+        self.total = 0
+
+    def addCounts(self, values, valueCounts):
+        '''Adds aggregated counts, i.e. the np.unique values & counts of a chunk. Large chunks are reduced vectorized first.'''
+        valueCounts = np.asarray(valueCounts)
+        self.total += int(valueCounts.sum())
+        if len(valueCounts) > self.capacity:
+            cutoff = int(np.partition(valueCounts, len(valueCounts) - self.capacity - 1)[len(valueCounts) - self.capacity - 1])
+            keep = valueCounts > cutoff
+            values = np.asarray(values)[keep]
+            valueCounts = valueCounts[keep] - cutoff
+            self.maxError += cutoff
+
+        counts = self.counts
+        for val, valCount in zip(values.tolist() if hasattr(values, 'tolist') else values, valueCounts.tolist()):
+            counts[val] = counts.get(val, 0) + valCount
+        self._reduce()
+
+    def merge(self, other):
+        counts = self.counts
+        for val, valCount in other.counts.items():
+            counts[val] = counts.get(val, 0) + valCount
+        self.total += other.total
+        self.maxError += other.maxError
+        self._reduce()
+        return self
+
+    def _reduce(self):
+        '''Subtracts the (capacity + 1)th largest counter from every counter & drops the counters that reach 0'''
+        if len(self.counts) <= self.capacity:
+            return
+        cutoff = sorted(self.counts.values(), reverse=True)[self.capacity]
+        self.counts = dict((val, valCount - cutoff) for val, valCount in self.counts.items() if valCount > cutoff)
+        self.maxError += cutoff
+
+    def topN(self, limit=None, minCount=1):
+        '''Most frequent values as (value, low, high) count bounds in descending order. Values with a lower bound under minCount are left out.'''
+        top = sorted([item for item in self.counts.items() if item[1] >= minCount], key=lambda item: item[1], reverse=True)
+        if limit is not None:
+            top = top[:limit]
+        return [(val, valCount, valCount + self.maxError) for val, valCount in top]
@@ -0,0 +1,192 @@
+import time
+import numpy as np
+from NumericStats import NumericStats
+
+# Cursor token the geometry is read with (arcpy Geometry objects or the SqliteGeometry look-alike)
+GEOMETRY_TOKEN = 'SHAPE@'
+# Vertex count bins of the non-empty geometries: 1, 2-3, 4-7 ... (powers of two). The last bin holds everything above.
+VERTEX_BIN_COUNT = 24
+# Quantiles of the vertex count written to the output
+VERTEX_QUANTILES = [0.5, 0.9, 0.99]
+# Centroids kept by the vertex & part count summaries (exact up to this many distinct counts)
+COUNT_CENTROIDS = 200
+# Shape types with a length & an area (zero length & zero area counts are blank for the others)
+LENGTH_SHAPE_TYPES = ['Polyline', 'Polygon']
+AREA_SHAPE_TYPES = ['Polygon']
+
+
+class GeometryField:
+    """Purpose: field look-alike of the SHAPE@ token for the ChunkedReader (geometry values stay Python objects)."""
+
+    def __init__(self):
+        self.name = GEOMETRY_TOKEN
+        self.type = 'Geometry'
+
+
+def vertexBin(pointCounts):
+    '''Bin of each (positive) vertex count: floor(log2(count)), capped at the last bin'''
+    return np.minimum(np.floor(np.log2(pointCounts)).astype(np.intp), VERTEX_BIN_COUNT - 1)
+
+
+def vertexBinBounds(binIndex):
+    '''(low, high) vertex counts of a bin (high is None for the last, open ended bin)'''
+    low = 2 ** binIndex
+    return low, (None if binIndex == VERTEX_BIN_COUNT - 1 else 2 * low - 1)
+
+
+def vertexBinLabel(low, high):
+    '''Output label of a vertex count bin: 1, 2 - 3 ... & 8388608+ for the last bin'''
+    if high is None:
+        return '{0}+'.format(low)
+    return str(low) if low == high else '{0} - {1}'.format(low, high)
+
+
+def geometryProperties(geometries):
+    '''
+    (pointCount, partCount, length, area, xMin, yMin, xMax, yMax) float64 arrays of a chunk of non-NULL geometry
+    objects. The properties are read once per geometry & everything after is vectorized. Empty geometries have NaN
+    extents.
+    '''
+    properties = np.full((len(geometries), 8), np.nan, dtype=np.float64)
+    for i, geometry in enumerate(geometries):
+        pointCount = geometry.pointCount or 0
+        extent = geometry.extent if pointCount > 0 else None
+        if extent is not None:
+            properties[i] = (pointCount, geometry.partCount, geometry.length, geometry.area, extent.XMin, extent.YMin, extent.XMax, extent.YMax)
+        else:
+            properties[i, :4] = (pointCount, geometry.partCount or 0, geometry.length or 0.0, geometry.area or 0.0)
+    return properties
+
+
+class GeometryStats:
+    """
+    Purpose: constant memory geometry summary of one subtype: NULL, empty, zero length, zero area & multipart
+    counts, plus the vertex & part count statistics (NumericStats), vertex count bins & extent of the non-empty
+    geometries.
+    """
+
+    def __init__(self):
+        self.rowCount = 0
+        self.nullCount = 0
+        self.emptyCount = 0
+        self.zeroLengthCount = 0
+        self.zeroAreaCount = 0
+        self.multipartCount = 0
+        self.vertexStats = NumericStats(maxCentroids=COUNT_CENTROIDS)
+        self.partStats = NumericStats(maxCentroids=COUNT_CENTROIDS)
+        self.vertexBins = np.zeros(VERTEX_BIN_COUNT, dtype=np.int64)
+        self.extent = None
+
+    def addNulls(self, nullCount):
+        self.rowCount += nullCount
+        self.nullCount += nullCount
+
+    def addProperties(self, properties):
+        '''Adds the geometryProperties() rows of the subtype's non-NULL geometries'''
+        if len(properties) == 0:
+            return
+        self.rowCount += len(properties)
+        present = properties[:, 0] > 0
+        self.emptyCount += len(properties) - int(present.sum())
+        properties = properties[present]
+        if len(properties) == 0:
+            return
+        pointCounts, partCounts = properties[:, 0], properties[:, 1]
+        self.zeroLengthCount += int((properties[:, 2] == 0).sum())
+        self.zeroAreaCount += int((properties[:, 3] == 0).sum())
+        self.multipartCount += int((partCounts > 1).sum())
+        self.vertexBins += np.bincount(vertexBin(pointCounts), minlength=VERTEX_BIN_COUNT)
+        self.vertexStats.addValues(pointCounts)
+        self.partStats.addValues(partCounts)
+
+        extents = properties[:, 4:]
+        extents = extents[~np.isnan(extents).any(axis=1)]
+        if len(extents) > 0:
+            chunkExtent = [float(extents[:, 0].min()), float(extents[:, 1].min()), float(extents[:, 2].max()), float(extents[:, 3].max())]
+            if self.extent is None:
+                self.extent = chunkExtent
+            else:
+                self.extent = [min(self.extent[0], chunkExtent[0]), min(self.extent[1], chunkExtent[1]),
+                    max(self.extent[2], chunkExtent[2]), max(self.extent[3], chunkExtent[3])]
+
+    def vertexDistribution(self):
+        '''(low, high, count) of the non-empty vertex count bins (high is None for the last bin)'''
+        return [vertexBinBounds(i) + (int(binCount),) for i, binCount in enumerate(self.vertexBins.tolist()) if binCount > 0]
+
+
+class GeometryProfiler:
+    """
+    Purpose: streams the SHAPE@ geometries of a feature class through the shared batched reader & keeps one
+    GeometryStats per subtype code (None without subtypes, or for NULL subtype codes). Memory depends on the chunk
+    size & the number of subtypes, not on the number of features.
+
+    Parameters
+    ----------
+    shapeType - Describe shapeType (zero length counts are kept for polylines & polygons, zero area for polygons).
+    subtypeField - subtype field object (None if the feature class has no subtypes). Read with the geometry.
+    subtypeNames - dictionary of subtype code: subtype name.
+    """
+
+    def __init__(self, shapeType, subtypeField=None, subtypeNames=None):
+        self.shapeType = shapeType
+        self.subtypeField = subtypeField
+        self.subtypeNames = subtypeNames or {}
+        self.subtypeStats = {}
+        self.rowCount = 0
+        self.seconds = 0.0
+
+    @property
+    def fields(self):
+        '''Fields read by the batched reader (the SHAPE@ token & the subtype field)'''
+        return [GeometryField()] + ([self.subtypeField] if self.subtypeField is not None else [])
+
+    @property
+    def hasLength(self):
+        return self.shapeType in LENGTH_SHAPE_TYPES
+
+    @property
+    def hasArea(self):
+        return self.shapeType in AREA_SHAPE_TYPES
+
+    def statsFor(self, subtypeCode):
+        if subtypeCode not in self.subtypeStats:
+            self.subtypeStats[subtypeCode] = GeometryStats()
+        return self.subtypeStats[subtypeCode]
+
+    def profile(self, reader):
+        '''Reads every chunk of a ChunkedReader over self.fields'''
+        for columnChunks in reader.chunks():
+            self.addChunk(columnChunks[0], columnChunks[1] if len(columnChunks) > 1 else None)
+
+    def addChunk(self, geometryChunk, subtypeChunk=None):
+        '''Adds the rows of a geometry ColumnChunk (& the subtype ColumnChunk of the same rows)'''
+        start = time.perf_counter()
+        self.rowCount += len(geometryChunk)
+        nullMask = geometryChunk.nullMask
+        properties = geometryProperties(geometryChunk.values[~nullMask].tolist())
+        if subtypeChunk is None:
+            stats = self.statsFor(None)
+            stats.addNulls(int(nullMask.sum()))
+            stats.addProperties(properties)
+        else:
+            # Rows are grouped by subtype code index. NULL subtype codes get the last index (subtype code None).
+            subtypeNullMask = subtypeChunk.nullMask
+            subtypeLabels, validSubtypeIndexes = np.unique(subtypeChunk.values[~subtypeNullMask], return_inverse=True)
+            subtypeIndexes = np.full(len(geometryChunk), len(subtypeLabels), dtype=np.intp)
+            subtypeIndexes[~subtypeNullMask] = validSubtypeIndexes.ravel()
+            subtypeLabels = subtypeLabels.tolist() + [None]
+            nullCounts = np.bincount(subtypeIndexes[nullMask], minlength=len(subtypeLabels))
+            geometrySubtypeIndexes = subtypeIndexes[~nullMask]
+            for subtypeIndex, subtypeCode in enumerate(subtypeLabels):
+                rows = geometrySubtypeIndexes == subtypeIndex
+                if nullCounts[subtypeIndex] == 0 and not rows.any():
+                    continue
+                stats = self.statsFor(subtypeCode)
+                stats.addNulls(int(nullCounts[subtypeIndex]))
+                stats.addProperties(properties[rows])
+        self.seconds += time.perf_counter() - start
+
+    def results(self):
+        '''(subtype code, GeometryStats) per subtype read, in subtype code order (NULL codes last)'''
+        for subtypeCode in sorted(self.subtypeStats, key=lambda code: (code is None, code if code is not None else 0)):
+            yield subtypeCode, self.subtypeStats[subtypeCode]
@@ -0,0 +1,75 @@
+import os
+import csv
+import time
+
+SUMMARY_COLUMNS = ["keyword", "sourceDir", "status", "durationSeconds", "featureClasses", "featureClassesReused", "rowsScanned", "errors", "message"]
+
+
+class JobScheduler:
+    """
+    Purpose: runs the configured source database jobs with a bounded number running at once. Each job runs in
+    its own process (arcpy workspace settings are per process) & returns a summary dictionary.
+
+    Returns
+    -------
+    run() - list of job summaries in the configured job order.
+    """
+
+    def __init__(self, maxConcurrentJobs=1):
+        self.maxConcurrentJobs = max(int(maxConcurrentJobs), 1)
+
+    def run(self, jobFunction, jobs, describeJob=None):
+        '''jobFunction(*args) is called once per args tuple in jobs. describeJob(args) gives the keyword & sourceDir.'''
+        if self.maxConcurrentJobs == 1 or len(jobs) <= 1:
+            return [self._runOne(jobFunction, args, describeJob) for args in jobs]
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        summaries = [None] * len(jobs)
+        with ProcessPoolExecutor(max_workers=min(self.maxConcurrentJobs, len(jobs))) as executor:
+            futures = [(i, args, time.time(), executor.submit(jobFunction, *args)) for i, args in enumerate(jobs)]
+            for i, args, startTime, future in futures:
+                try:
+                    summaries[i] = future.result()
+                except Exception as ex:
+                    summaries[i] = self._failedSummary(args, describeJob, startTime, ex)
+        return summaries
+
+    def _runOne(self, jobFunction, args, describeJob):
+        startTime = time.time()
+        try:
+            return jobFunction(*args)
+        except Exception as ex:
+            return self._failedSummary(args, describeJob, startTime, ex)
+
+    @staticmethod
+    def _failedSummary(args, describeJob, startTime, ex):
+        summary = dict((column, '') for column in SUMMARY_COLUMNS)
+        if describeJob:
+            summary.update(describeJob(args))
+        summary["status"] = "FAILED"
+        summary["durationSeconds"] = round(time.time() - startTime, 2)
+        summary["message"] = '{0}'.format(ex)
+        return summary
+
+    @staticmethod
+    def formatSummaryTable(summaries):
+        '''Fixed-width text table of the job summaries for the console'''
+        columns = [c for c in SUMMARY_COLUMNS if c != "sourceDir"]
+        rows = [['{0}'.format(summary.get(c, '')) for c in columns] for summary in summaries]
+        widths = [max([len(c)] + [len(row[i]) for row in rows]) for i, c in enumerate(columns)]
+        lines = ['  '.join(c.ljust(widths[i]) for i, c in enumerate(columns))]
+        lines.append('  '.join('-' * w for w in widths))
+        for row in rows:
+            lines.append('  '.join(val.ljust(widths[i]) for i, val in enumerate(row)))
+        return '\n'.join(lines)
+
+    @staticmethod
+    def writeSummaryCsv(summaries, csvFilepath):
+        outDir = os.path.dirname(csvFilepath)
+        if outDir and os.path.isdir(outDir) is False:
+            os.makedirs(outDir)
+        with open(csvFilepath, "w", newline='') as summaryFile:
+            summaryWriter = csv.writer(summaryFile, lineterminator='\n')
+            summaryWriter.writerow(SUMMARY_COLUMNS)
+            summaryWriter.writerows([summary.get(c, '') for c in SUMMARY_COLUMNS] for summary in summaries)
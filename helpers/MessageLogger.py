@@ -1,6 +1,16 @@
 import logging
 
 
+class ErrorCountHandler(logging.Handler):
+    """Counts ERROR (and above) records so a run can report its failures."""
+    def __init__(self):
+        logging.Handler.__init__(self, logging.ERROR)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
 class MessageLogger:
     def __init__(self):
         return
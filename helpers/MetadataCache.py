@@ -0,0 +1,170 @@
+import os
+import pickle
+import sqlite3
+from datetime import datetime
+try:
+    from urllib.request import pathname2url
+except ImportError:
+    from urllib import pathname2url
+
+# Attributes kept of the arcpy objects (arcpy objects can't be stored, so a snapshot of these is cached)
+FIELD_ATTRIBUTES = ['name', 'aliasName', 'baseName', 'type', 'length', 'precision', 'scale', 'domain', 'isNullable',
+    'required', 'editable', 'defaultValue']
+DESCRIBE_ATTRIBUTES = ['name', 'baseName', 'dataType', 'featureType', 'shapeType', 'hasOID', 'OIDFieldName',
+    'editorTrackingEnabled', 'editedAtFieldName']
+DOMAIN_ATTRIBUTES = ['name', 'domainType', 'type', 'codedValues', 'range', 'description', 'owner', 'mergePolicy',
+    'splitPolicy']
+
+CACHE_TABLE_SQL = '''CREATE TABLE IF NOT EXISTS metadata (workspace TEXT, featureClass TEXT, kind TEXT, fingerprint TEXT,
+    value BLOB, cachedAt TEXT, PRIMARY KEY (workspace, featureClass, kind))'''
+
+
+class MetadataRecord:
+    """Purpose: plain snapshot of an arcpy Field, Describe or Domain object (same attribute names)."""
+
+    def __init__(self, attributes):
+        self.__dict__.update(attributes)
+
+    @classmethod
+    def snapshot(cls, obj, attributeNames):
+        return cls(dict((name, getattr(obj, name, None)) for name in attributeNames))
+
+
+class MetadataCache:
+    """
+    Purpose: on-disk SQLite store of workspace metadata keyed by workspace, feature class & kind (fields, describe,
+    subtypes...). Each entry keeps the schema fingerprint it was read under & is only returned for the same
+    fingerprint, so a schema change invalidates every entry of the workspace.
+
+    Parameters
+    ----------
+    cacheFilepath - SQLite cache file (created on first use). Several jobs & worker processes can share it.
+    readOnly - True to only read an existing cache file (i.e. --plan): the file is never created & nothing is stored.
+    """
+
+    def __init__(self, cacheFilepath, readOnly=False):
+        self.cacheFilepath = cacheFilepath
+        self.readOnly = readOnly
+        self.connection = None
+
+    def _connect(self):
+        if self.connection is None:
+            if self.readOnly:
+                if os.path.isfile(self.cacheFilepath) is False:
+                    return None
+                self.connection = sqlite3.connect('file:{0}?mode=ro'.format(pathname2url(os.path.abspath(self.cacheFilepath))), uri=True, timeout=60)
+                return self.connection
+            cacheDir = os.path.dirname(os.path.abspath(self.cacheFilepath))
+            if os.path.isdir(cacheDir) is False:
+                os.makedirs(cacheDir)
+            self.connection = sqlite3.connect(self.cacheFilepath, timeout=60)
+            self.connection.execute(CACHE_TABLE_SQL)
+            self.connection.commit()
+        return self.connection
+
+    def get(self, workspace, featureClass, kind, fingerprint):
+        connection = self._connect()
+        if connection is None:
+            return None
+        row = connection.execute('SELECT fingerprint, value FROM metadata WHERE workspace = ? AND featureClass = ? AND kind = ?',
+            (workspace, featureClass, kind)).fetchone()
+        if row is None or row[0] != fingerprint:
+            return None
+        return pickle.loads(row[1])
+
+    def put(self, workspace, featureClass, kind, fingerprint, value):
+        if self.readOnly:
+            return
+        self._connect().execute('INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?, ?)', (workspace, featureClass, kind,
+            fingerprint, pickle.dumps(value), datetime.now().isoformat(timespec='seconds')))
+        self.connection.commit()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class CachingBackend:
+    """
+    Purpose: workspace backend wrapper that serves listFeatureClasses, listDatasets, listFields, describe,
+    listSubtypes & listDomains from a MetadataCache while the workspace's schema fingerprint is unchanged (see
+    WorkspaceBackend.schemaFingerprint). Row reads & counts (searchCursor, getCount...) always go to the workspace.
+    Without a schema fingerprint nothing is cached.
+
+    Parameters
+    ----------
+    backend - the wrapped WorkspaceBackend.
+    metadataCache - MetadataCache.
+    gdbItemsTable - GDB_Items table an enterprise geodatabase fingerprint is read from.
+    """
+
+    def __init__(self, backend, metadataCache, gdbItemsTable=None):
+        self.backend = backend
+        self.metadataCache = metadataCache
+        self.gdbItemsTable = gdbItemsTable
+        self.workspaceKey = os.path.abspath(backend.workspace) if os.path.exists(backend.workspace) else backend.workspace
+        self._fingerprint = None
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name):
+        # Every other backend method & attribute is passed through
+        if name == 'backend':
+            raise AttributeError(name)
+        return getattr(self.backend, name)
+
+    @property
+    def fingerprint(self):
+        '''Schema fingerprint, read once per run. False when the workspace can't be fingerprinted.'''
+        if self._fingerprint is None:
+            try:
+                self._fingerprint = self.backend.schemaFingerprint(self.gdbItemsTable) or False
+            except Exception as ex:
+                self.backend.addMessage("Exception Thrown reading the schema fingerprint, metadata is not cached: {0}\n\t".format(ex))
+                self._fingerprint = False
+        return self._fingerprint
+
+    def _cached(self, featureClass, kind, readFunction):
+        '''Cached value, or the value read (& snapshotted) by readFunction & stored under the current fingerprint'''
+        fingerprint = self.fingerprint
+        if fingerprint is False:
+            return readFunction()
+        value = self.metadataCache.get(self.workspaceKey, featureClass, kind, fingerprint)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = readFunction()
+        self.metadataCache.put(self.workspaceKey, featureClass, kind, fingerprint, value)
+        return value
+
+    def listFeatureClasses(self, featureDataset=None):
+        return self._cached(featureDataset or '', 'featureClasses', lambda: list(self.backend.listFeatureClasses(featureDataset) or []))
+
+    def listDatasets(self):
+        return self._cached('', 'datasets', lambda: list(self.backend.listDatasets() or []))
+
+    def listFields(self, fc):
+        return self._cached(fc, 'fields', lambda: [MetadataRecord.snapshot(f, FIELD_ATTRIBUTES) for f in self.backend.listFields(fc)])
+
+    def describe(self, fc):
+        return self._cached(fc, 'describe', lambda: MetadataRecord.snapshot(self.backend.describe(fc), DESCRIBE_ATTRIBUTES))
+
+    def listDomains(self, workspace=None):
+        return self._cached('', 'domains', lambda: [MetadataRecord.snapshot(d, DOMAIN_ATTRIBUTES) for d in self.backend.listDomains(workspace)])
+
+    def listSubtypes(self, fc):
+        return self._cached(fc, 'subtypes', lambda: self._snapshotSubtypes(self.backend.listSubtypes(fc)))
+
+    @staticmethod
+    def _snapshotSubtypes(subtypes):
+        '''ListSubtypes dictionary with the field domain objects replaced by snapshots'''
+        snapshot = {}
+        for subtypeCode, subtypeDict in subtypes.items():
+            subtypeSnapshot = dict(subtypeDict)
+            subtypeSnapshot['FieldValues'] = dict((fieldName, (fieldValues[0],
+                MetadataRecord.snapshot(fieldValues[1], DOMAIN_ATTRIBUTES) if fieldValues[1] is not None else None))
+                for fieldName, fieldValues in subtypeDict['FieldValues'].items())
+            snapshot[subtypeCode] = subtypeSnapshot
+        return snapshot
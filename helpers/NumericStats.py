@@ -0,0 +1,175 @@
+import math
+from datetime import datetime, timedelta
+import numpy as np
+
+# Field types profiled with NumericStats. Dates are profiled as microseconds since 1970-01-01.
+NUMERIC_FIELD_TYPES = ['SmallInteger', 'Integer', 'BigInteger', 'Single', 'Double']
+DATE_FIELD_TYPES = ['Date']
+EPOCH = datetime(1970, 1, 1)
+MICROSECONDS_PER_DAY = 86400 * 1e6
+
+
+def toNumbers(values, isDate=False):
+    '''float64 array of numeric or date values (datetime, datetime64 or ISO text) for the statistics'''
+    if isDate:
+        return np.asarray(values).astype('M8[us]').astype(np.int64).astype(np.float64)
+    return np.asarray(values, dtype=np.float64)
+
+
+def fromNumber(val, isDate=False):
+    '''Statistic value for output: datetime for date fields, else the number'''
+    if val is None or isDate is False:
+        return val
+    return EPOCH + timedelta(microseconds=int(round(val)))
+
+
+class NumericStats:
+    """
+    Purpose: mergeable partial aggregates of a numeric or date field: count, min, max, mean & variance (the
+    moments are merged with Chan's parallel formulas) plus a sorted summary of (value, count) centroids for the
+    quantiles & histogram. Up to maxCentroids distinct values are kept as is, so the quantiles & histogram are
+    exact; past that neighbouring centroids are merged t-digest style (small centroids near the tails, large ones
+    near the median) & the quantiles & histogram are close estimates. Chunks, database value counts & the
+    partials of other workers are all merged the same way.
+
+    Parameters
+    ----------
+    isDate - True for date fields (values are microseconds since 1970-01-01).
+    maxCentroids - distinct values kept exactly before the summary is compressed.
+    """
+
+    def __init__(self, isDate=False, maxCentroids=1000):
+        self.isDate = isDate
+        self.maxCentroids = max(int(maxCentroids), 10)
+        self.count = 0
+        self.minValue = None
+        self.maxValue = None
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.centroidMeans = np.zeros(0, dtype=np.float64)
+        self.centroidCounts = np.zeros(0, dtype=np.float64)
+        # False once centroids were merged (quantiles & histogram are estimates)
+        self.exact = True
+        # False when values were added as database summaries (addSummary()): no quantiles or histogram
+        self.hasDistribution = True
+        # False when a summary had no sums (date fields): no mean or standard deviation
+        self.hasMoments = True
+
+    def addValues(self, values):
+        '''Adds a chunk of non-NULL values (i.e. ColumnChunk.validValues()). Non-finite numbers are ignored.'''
+        values = toNumbers(values, self.isDate)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        uniqueValues, uniqueCounts = np.unique(values, return_counts=True)
+        self.addCounts(uniqueValues, uniqueCounts)
+
+    def addCounts(self, values, valueCounts):
+        '''Adds aggregated (value, count) pairs, i.e. from a database GROUP BY'''
+        values = toNumbers(values, self.isDate)
+        valueCounts = np.asarray(valueCounts, dtype=np.float64)
+        keep = np.isfinite(values) & (valueCounts > 0)
+        values, valueCounts = values[keep], valueCounts[keep]
+        if len(values) == 0:
+            return
+        count = valueCounts.sum()
+        mean = float((values * valueCounts).sum() / count)
+        m2 = float((valueCounts * (values - mean) ** 2).sum())
+        self._mergeMoments(int(count), mean, m2, float(values.min()), float(values.max()))
+        self._mergeCentroids(values, valueCounts)
+
+    def addSummary(self, count, minValue, maxValue, valueSum=None, squareSum=None):
+        '''
+        Adds a database summary of values that aren't read (COUNT, MIN, MAX & the SUM & SUM of squares of the values
+        less the min, i.e. SqlAggregator.numericSummaries). Summing around the min keeps the variance from cancelling
+        out for large values with a small spread. Only the count, min, max & moments are kept, so the quantiles &
+        histogram are left out. Without sums (date fields) the mean & standard deviation are left out too.
+        '''
+        if count == 0:
+            return
+        minValue, maxValue = toNumbers([minValue, maxValue], self.isDate).tolist()
+        if valueSum is None or squareSum is None:
+            self.hasMoments = False
+            mean, m2 = 0.0, 0.0
+        else:
+            shiftedMean = float(valueSum) / count
+            mean = minValue + shiftedMean
+            m2 = max(float(squareSum) - float(valueSum) * shiftedMean, 0.0)
+        self._mergeMoments(int(count), mean, m2, minValue, maxValue)
+        self.hasDistribution = False
+
+    def merge(self, other):
+        '''Adds the partial aggregates of another NumericStats (another chunk, feature class part or worker)'''
+        if other.count == 0:
+            return self
+        self._mergeMoments(other.count, other.mean, other.m2, other.minValue, other.maxValue)
+        self.exact = self.exact and other.exact
+        self.hasDistribution = self.hasDistribution and other.hasDistribution
+        self.hasMoments = self.hasMoments and other.hasMoments
+        self._mergeCentroids(other.centroidMeans, other.centroidCounts)
+        return self
+
+    def _mergeMoments(self, count, mean, m2, minValue, maxValue):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.minValue = minValue if self.minValue is None else min(self.minValue, minValue)
+        self.maxValue = maxValue if self.maxValue is None else max(self.maxValue, maxValue)
+
+    def _mergeCentroids(self, means, counts):
+        means = np.concatenate([self.centroidMeans, means])
+        counts = np.concatenate([self.centroidCounts, counts])
+        # Equal values from different chunks become one centroid
+        means, inverse = np.unique(means, return_inverse=True)
+        counts = np.bincount(inverse.ravel(), weights=counts, minlength=len(means))
+        if len(means) > self.maxCentroids:
+            means, counts = self._compress(means, counts)
+            self.exact = False
+        self.centroidMeans, self.centroidCounts = means, counts
+
+    def _compress(self, means, counts):
+        '''Merges sorted neighbouring centroids into about maxCentroids / 2 groups (t-digest k1 scale function)'''
+        total = counts.sum()
+        cumulative = np.cumsum(counts)
+        quantiles = (cumulative - counts / 2.0) / total
+        scale = self.maxCentroids / (2.0 * math.pi) * np.arcsin(2.0 * quantiles - 1.0)
+        groups = np.floor(scale - scale[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        groupCounts = np.add.reduceat(counts, starts)
+        groupMeans = np.add.reduceat(means * counts, starts) / groupCounts
+        return groupMeans, groupCounts
+
+    @property
+    def standardDeviation(self):
+        '''Sample standard deviation (None for less than 2 values)'''
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else None
+
+    def quantiles(self, probabilities):
+        '''Value at each probability (linear interpolation between ranks, as np.quantile)'''
+        if self.count == 0 or self.hasDistribution is False:
+            return [None for p in probabilities]
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        means, counts = self.centroidMeans, self.centroidCounts
+        cumulative = np.cumsum(counts)
+        if self.exact:
+            positions = probabilities * (self.count - 1)
+            lower = means[np.searchsorted(cumulative, np.floor(positions), side='right')]
+            upper = means[np.minimum(np.searchsorted(cumulative, np.ceil(positions), side='right'), len(means) - 1)]
+            values = lower + (positions - np.floor(positions)) * (upper - lower)
+        else:
+            # Centroids are placed at the middle of their ranks & the tails run to the exact min & max
+            centers = np.r_[0.0, cumulative - counts / 2.0, float(self.count)]
+            values = np.interp(probabilities * self.count, centers, np.r_[self.minValue, means, self.maxValue])
+        return values.tolist()
+
+    def histogram(self, bins=10):
+        '''(low, high, count) of bins equal width bins from min to max'''
+        if self.count == 0 or self.hasDistribution is False:
+            return []
+        if self.minValue == self.maxValue:
+            return [(self.minValue, self.maxValue, self.count)]
+        edges = np.linspace(self.minValue, self.maxValue, int(bins) + 1)
+        binCounts, edges = np.histogram(self.centroidMeans, bins=edges, weights=self.centroidCounts)
+        return [(float(edges[i]), float(edges[i + 1]), int(round(binCount))) for i, binCount in enumerate(binCounts.tolist())]
@@ -0,0 +1,220 @@
+import csv
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+# Write buffer of the output CSV files (rows reach the files one feature class at a time)
+OUTPUT_BUFFER_BYTES = 1024 * 1024
+# Column between a SubtypeCounts row's field name & its crosstab cells
+CROSSTAB_SEPARATOR = '|'
+
+
+class FeatureClassResult:
+    """Purpose: FeatureCounts row & the feature class columns every other output row starts with."""
+
+    __slots__ = ('featureDataset', 'featureClass', 'featureType', 'shapeType', 'featureCount')
+
+    def __init__(self, featureDataset, featureClass, featureType, shapeType, featureCount):
+        self.featureDataset = featureDataset
+        self.featureClass = featureClass
+        self.featureType = featureType
+        self.shapeType = shapeType
+        self.featureCount = featureCount
+
+    def cells(self):
+        return [self.featureDataset, self.featureClass, self.featureType, self.shapeType, self.featureCount]
+
+
+class FieldCountResult:
+    """Purpose: FieldCounts row of one field (counts, estimates, statistics & domain columns)."""
+
+    __slots__ = ('featureClassResult', 'fieldName', 'fieldAlias', 'fieldType', 'fieldLength', 'fieldPrecision', 'fieldCounts',
+        'nullPercent', 'distinctCount', 'tailCount', 'sampleStatus', 'nullPercentBounds', 'valueCountBounds', 'estimatedDistinct',
+        'uniquenessRatio', 'topValues', 'minimum', 'maximum', 'mean', 'standardDeviation', 'quantiles', 'histogram', 'domainName',
+        'domainType', 'domainValues')
+
+    def __init__(self, featureClassResult, fieldName, fieldAlias, fieldType, fieldLength, fieldPrecision):
+        self.featureClassResult = featureClassResult
+        self.fieldName = fieldName
+        self.fieldAlias = fieldAlias
+        self.fieldType = fieldType
+        self.fieldLength = fieldLength
+        self.fieldPrecision = fieldPrecision
+        self.fieldCounts = ''
+        self.nullPercent = ''
+        self.distinctCount = ''
+        self.tailCount = ''
+        self.sampleStatus = ''
+        self.nullPercentBounds = ''
+        self.valueCountBounds = ''
+        self.estimatedDistinct = ''
+        self.uniquenessRatio = ''
+        self.topValues = ''
+        self.minimum = ''
+        self.maximum = ''
+        self.mean = ''
+        self.standardDeviation = ''
+        self.quantiles = ''
+        self.histogram = ''
+        self.domainName = ''
+        self.domainType = ''
+        self.domainValues = ''
+
+    def cells(self):
+        return self.featureClassResult.cells() + [self.fieldName, self.fieldAlias, self.fieldType, self.fieldLength,
+            self.fieldPrecision, self.fieldCounts, self.nullPercent, self.distinctCount, self.tailCount, self.sampleStatus,
+            self.nullPercentBounds, self.valueCountBounds, self.estimatedDistinct, self.uniquenessRatio, self.topValues,
+            self.minimum, self.maximum, self.mean, self.standardDeviation, self.quantiles, self.histogram, self.domainName,
+            self.domainType, self.domainValues]
+
+
+class SubtypeResult:
+    """Purpose: Subtypes row of one subtype field (default value & domain)."""
+
+    __slots__ = ('featureClassResult', 'subtypeCode', 'subtypeName', 'subtypeField', 'fieldName', 'defaultValue', 'domainName')
+
+    def __init__(self, featureClassResult, subtypeCode, subtypeName, subtypeField, fieldName, defaultValue, domainName):
+        self.featureClassResult = featureClassResult
+        self.subtypeCode = subtypeCode
+        self.subtypeName = subtypeName
+        self.subtypeField = subtypeField
+        self.fieldName = fieldName
+        self.defaultValue = defaultValue
+        self.domainName = domainName
+
+    def cells(self):
+        return self.featureClassResult.cells() + [self.subtypeCode, self.subtypeName, self.subtypeField, self.fieldName,
+            self.defaultValue, self.domainName]
+
+
+class SubtypeCountResult:
+    """Purpose: SubtypeCounts row of one field: a crosstab row (header, subtype or Total) or a status message."""
+
+    __slots__ = ('featureClassResult', 'fieldName', 'values')
+
+    def __init__(self, featureClassResult, fieldName, values):
+        self.featureClassResult = featureClassResult
+        self.fieldName = fieldName
+        self.values = values
+
+    def cells(self):
+        return self.featureClassResult.cells() + [self.fieldName, CROSSTAB_SEPARATOR] + list(self.values)
+
+
+class DomainViolationResult:
+    """Purpose: DomainViolations row of one field & subtype: values checked against the domain & the values outside it."""
+
+    __slots__ = ('featureClassResult', 'fieldName', 'subtypeField', 'subtypeCode', 'subtypeName', 'domainName', 'domainType',
+        'checkedCount', 'violationCount', 'violationPercent', 'sampleValues', 'sampleStatus')
+
+    def __init__(self, featureClassResult, fieldName, subtypeField, subtypeCode, subtypeName, domainName, domainType):
+        self.featureClassResult = featureClassResult
+        self.fieldName = fieldName
+        self.subtypeField = subtypeField
+        self.subtypeCode = subtypeCode
+        self.subtypeName = subtypeName
+        self.domainName = domainName
+        self.domainType = domainType
+        self.checkedCount = ''
+        self.violationCount = ''
+        self.violationPercent = ''
+        self.sampleValues = ''
+        self.sampleStatus = ''
+
+    def cells(self):
+        return self.featureClassResult.cells() + [self.fieldName, self.subtypeField, self.subtypeCode, self.subtypeName,
+            self.domainName, self.domainType, self.checkedCount, self.violationCount, self.violationPercent, self.sampleValues,
+            self.sampleStatus]
+
+
+class GeometryProfileResult:
+    """Purpose: GeometryProfile row of one subtype (or the whole feature class): geometry counts, vertex & part statistics & extent."""
+
+    __slots__ = ('featureClassResult', 'subtypeField', 'subtypeCode', 'subtypeName', 'geometryCount', 'nullCount', 'emptyCount',
+        'zeroLengthCount', 'zeroAreaCount', 'multipartCount', 'vertexMinimum', 'vertexMaximum', 'vertexMean', 'vertexQuantiles',
+        'vertexDistribution', 'partMaximum', 'partMean', 'xMin', 'yMin', 'xMax', 'yMax', 'sampleStatus')
+
+    def __init__(self, featureClassResult, subtypeField, subtypeCode, subtypeName):
+        self.featureClassResult = featureClassResult
+        self.subtypeField = subtypeField
+        self.subtypeCode = subtypeCode
+        self.subtypeName = subtypeName
+        self.geometryCount = ''
+        self.nullCount = ''
+        self.emptyCount = ''
+        self.zeroLengthCount = ''
+        self.zeroAreaCount = ''
+        self.multipartCount = ''
+        self.vertexMinimum = ''
+        self.vertexMaximum = ''
+        self.vertexMean = ''
+        self.vertexQuantiles = ''
+        self.vertexDistribution = ''
+        self.partMaximum = ''
+        self.partMean = ''
+        self.xMin = ''
+        self.yMin = ''
+        self.xMax = ''
+        self.yMax = ''
+        self.sampleStatus = ''
+
+    def cells(self):
+        return self.featureClassResult.cells() + [self.subtypeField, self.subtypeCode, self.subtypeName, self.geometryCount,
+            self.nullCount, self.emptyCount, self.zeroLengthCount, self.zeroAreaCount, self.multipartCount, self.vertexMinimum,
+            self.vertexMaximum, self.vertexMean, self.vertexQuantiles, self.vertexDistribution, self.partMaximum, self.partMean,
+            self.xMin, self.yMin, self.xMax, self.yMax, self.sampleStatus]
+
+
+class DuplicateKeyResult:
+    """Purpose: DuplicateKeys row of one single or composite key: rows checked, duplicate counts & sample duplicate keys."""
+
+    __slots__ = ('featureClassResult', 'keyFields', 'rowCount', 'nullKeyCount', 'distinctKeyCount', 'duplicateKeyCount',
+        'duplicateRowCount', 'maxOccurrences', 'isUnique', 'sampleKeys')
+
+    def __init__(self, featureClassResult, keyFields):
+        self.featureClassResult = featureClassResult
+        self.keyFields = keyFields
+        self.rowCount = ''
+        self.nullKeyCount = ''
+        self.distinctKeyCount = ''
+        self.duplicateKeyCount = ''
+        self.duplicateRowCount = ''
+        self.maxOccurrences = ''
+        self.isUnique = ''
+        self.sampleKeys = ''
+
+    def cells(self):
+        return self.featureClassResult.cells() + [self.keyFields, self.rowCount, self.nullKeyCount, self.distinctKeyCount,
+            self.duplicateKeyCount, self.duplicateRowCount, self.maxOccurrences, self.isUnique, self.sampleKeys]
+
+
+class ResultWriter:
+    """
+    Purpose: serializes result records to CSV text with the csv module (values with commas, quotes or line breaks
+    are quoted). Records are buffered in memory & the text goes to the output file in one write per feature class.
+    """
+
+    def __init__(self):
+        self.buffer = StringIO()
+        self.csvWriter = csv.writer(self.buffer, lineterminator='\n')
+        self.recordsWritten = 0
+
+    def write(self, record):
+        '''Writes one record. Returns the characters written.'''
+        self.recordsWritten += 1
+        return self.csvWriter.writerow(record.cells())
+
+    def writeRecords(self, records):
+        for record in records:
+            self.write(record)
+
+    def getvalue(self):
+        return self.buffer.getvalue()
+
+    @staticmethod
+    def formatRow(cells):
+        '''CSV text of one row of cells (i.e. a header row), without the line break'''
+        buffer = StringIO()
+        csv.writer(buffer, lineterminator='').writerow(cells)
+        return buffer.getvalue()
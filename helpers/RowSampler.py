@@ -0,0 +1,124 @@
+import math
+import numpy as np
+
+# OIDs per "OID IN (...)" where clause
+OID_BATCH_SIZE = 1000
+# Bisection steps of normalQuantile (the interval halves each step, well past float precision)
+QUANTILE_BISECTION_STEPS = 100
+
+_normalQuantiles = {}
+
+
+def normalQuantile(probability):
+    '''
+    Standard normal quantile (inverse CDF), i.e. 1.959964 for 0.975. Found by bisecting the CDF 0.5 * (1 + erf(x / sqrt(2)))
+    instead of statistics.NormalDist, which needs Python 3.8. Cached per probability.
+    '''
+    z = _normalQuantiles.get(probability)
+    if z is None:
+        low, high = -40.0, 40.0
+        for step in range(QUANTILE_BISECTION_STEPS):
+            middle = (low + high) / 2.0
+            if 0.5 * (1.0 + math.erf(middle / math.sqrt(2.0))) < probability:
+                low = middle
+            else:
+                high = middle
+        z = _normalQuantiles[probability] = (low + high) / 2.0
+    return z
+
+
+def proportionBounds(count, sampleRows, populationRows, confidenceLevel=0.95):
+    '''
+    Wilson score interval of a proportion (count of sampleRows) with the finite population correction, so a
+    sample of the whole population has no margin. Returns (low, high) proportions.
+    '''
+    if sampleRows <= 0:
+        return 0.0, 1.0
+    p = float(count) / sampleRows
+    if populationRows <= 1 or sampleRows >= populationRows:
+        return p, p
+    # Effective sample size grows to infinity as the sample approaches the population
+    fpc = float(populationRows - sampleRows) / (populationRows - 1)
+    n = sampleRows / fpc
+    z = normalQuantile(0.5 + confidenceLevel / 2.0)
+    denominator = 1.0 + z * z / n
+    center = (p + z * z / (2.0 * n)) / denominator
+    halfWidth = z * math.sqrt(p * (1.0 - p) / n + z * z / (4.0 * n * n)) / denominator
+    return max(center - halfWidth, 0.0), min(center + halfWidth, 1.0)
+
+
+class SamplePlan:
+    """
+    Purpose: simple random sample of a feature class's rows, drawn as random OIDs between the min & max OID so only
+    the sampled rows are read (through the OID index) instead of the whole feature class. More OIDs than the row
+    budget are drawn when the OID range has gaps (deleted rows), so the expected rows read match the budget.
+
+    Parameters
+    ----------
+    oidField - OID field name used in the where clauses.
+    minOid, maxOid - OID range of the feature class.
+    populationRows - GetCount of the feature class.
+    sampleBudget - rows to sample.
+    seed - random seed (same seed & data = same sample).
+    """
+
+    def __init__(self, oidField, minOid, maxOid, populationRows, sampleBudget, seed=None, confidenceLevel=0.95):
+        self.oidField = oidField
+        self.populationRows = populationRows
+        self.confidenceLevel = confidenceLevel
+        oidSpan = int(maxOid) - int(minOid) + 1
+        density = min(float(populationRows) / oidSpan, 1.0) if oidSpan > 0 else 1.0
+        drawCount = min(int(math.ceil(sampleBudget / density)), oidSpan)
+        rnd = np.random.default_rng(seed)
+        self.sampleOids = np.sort(rnd.choice(oidSpan, size=drawCount, replace=False)) + int(minOid)
+        # Rows actually read (set by the reader)
+        self.sampleRows = None
+
+    def whereClauses(self, batchSize=OID_BATCH_SIZE):
+        for start in range(0, len(self.sampleOids), batchSize):
+            oids = self.sampleOids[start:start + batchSize].tolist()
+            yield '{0} IN ({1})'.format(self.oidField, ','.join(str(oid) for oid in oids))
+
+    @property
+    def scale(self):
+        '''Rows in the feature class per sampled row (multiplier from sample counts to estimated counts)'''
+        return float(self.populationRows) / self.sampleRows if self.sampleRows else 1.0
+
+    def estimateCount(self, sampleCount):
+        return int(round(sampleCount * self.scale))
+
+    def countBounds(self, sampleCount):
+        '''(low, high) estimated count of a value in the feature class'''
+        low, high = proportionBounds(sampleCount, self.sampleRows, self.populationRows, self.confidenceLevel)
+        return int(math.floor(low * self.populationRows)), int(math.ceil(high * self.populationRows))
+
+    def percentBounds(self, sampleCount):
+        low, high = proportionBounds(sampleCount, self.sampleRows, self.populationRows, self.confidenceLevel)
+        return low * 100.0, high * 100.0
+
+    def describe(self):
+        return 'SAMPLED {0} OF {1} ROWS ({2:.0f}% CONFIDENCE BOUNDS)'.format(self.sampleRows, self.populationRows, self.confidenceLevel * 100)
+
+
+class SampledCursor:
+    """Purpose: chains one search cursor per OID batch of a SamplePlan into one cursor of the sampled rows."""
+
+    def __init__(self, searchCursor, fc, fieldNames, samplePlan, whereClause=None):
+        self.searchCursor = searchCursor
+        self.fc = fc
+        self.fieldNames = fieldNames
+        self.samplePlan = samplePlan
+        self.whereClause = whereClause
+
+    def __iter__(self):
+        for oidClause in self.samplePlan.whereClauses():
+            whereClause = oidClause if not self.whereClause else '({0}) AND ({1})'.format(self.whereClause, oidClause)
+            with self.searchCursor(self.fc, self.fieldNames, whereClause) as cursor:
+                for row in cursor:
+                    yield row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
@@ -0,0 +1,94 @@
+import os
+import json
+from datetime import datetime
+from RunManifest import CACHED_RESULT_KEYS, encodeValue, decodeObject
+
+JOURNAL_VERSION = 5
+
+
+class RunJournal:
+    """
+    Purpose: durable per feature class checkpoint journal (JSON lines). After a feature class's results are
+    written & flushed to the outputs, one line with its results & the byte size of every output file is
+    appended & fsynced. A resumed run truncates the outputs back to the sizes of the last committed feature
+    class, rebuilds the Excel & columnar outputs from the journaled results & continues with the remaining
+    feature classes. The journal is removed when the run completes.
+
+    Parameters
+    ----------
+    journalFilepath - JSON lines journal file.
+    configHash - hash of the run config. A journal of another config is not resumed.
+    """
+
+    def __init__(self, journalFilepath, configHash):
+        self.journalFilepath = journalFilepath
+        self.configHash = configHash
+        self.entries = []
+        self.journalFile = None
+
+    def load(self):
+        '''Committed entries of the previous run. A torn last line (crash while appending) is ignored.'''
+        self.entries = []
+        if not os.path.isfile(self.journalFilepath):
+            return self.entries
+        with open(self.journalFilepath, 'r', encoding='UTF-8') as journalFile:
+            lines = journalFile.read().split('\n')
+        header = json.loads(lines[0]) if lines[0] else {}
+        if header.get("version") != JOURNAL_VERSION or header.get("configHash") != self.configHash:
+            raise ValueError("Journal {0} was written by another version or config".format(self.journalFilepath))
+        for line in lines[1:]:
+            try:
+                self.entries.append(json.loads(line, object_hook=decodeObject))
+            except ValueError:
+                break
+        return self.entries
+
+    def start(self, resume=False):
+        '''Opens the journal for appending. A new (non-resumed) run starts a new journal.'''
+        if resume and os.path.isfile(self.journalFilepath):
+            # Drop a torn last line so new entries start on their own line
+            with open(self.journalFilepath, 'w', encoding='UTF-8') as journalFile:
+                journalFile.write(self._headerLine())
+                for entry in self.entries:
+                    journalFile.write(json.dumps(entry, default=encodeValue) + '\n')
+            self.journalFile = open(self.journalFilepath, 'a', encoding='UTF-8')
+        else:
+            self.entries = []
+            self.journalFile = open(self.journalFilepath, 'w', encoding='UTF-8')
+            self.journalFile.write(self._headerLine())
+        self._sync()
+
+    def _headerLine(self):
+        return json.dumps({"version": JOURNAL_VERSION, "configHash": self.configHash, "startedAt": datetime.now().isoformat(timespec='seconds')}) + '\n'
+
+    def _sync(self):
+        self.journalFile.flush()
+        os.fsync(self.journalFile.fileno())
+
+    def commit(self, key, results, fileSizes):
+        '''Durably records a completed feature class (call after its outputs are flushed)'''
+        entry = {
+            "key": key,
+            "fingerprint": results.get("fingerprint"),
+            "rowsScanned": results.get("rowsScanned", 0),
+            "errors": results.get("errors", 0),
+            "fileSizes": fileSizes,
+            "results": dict((resultKey, results.get(resultKey)) for resultKey in CACHED_RESULT_KEYS)
+        }
+        self.journalFile.write(json.dumps(entry, default=encodeValue) + '\n')
+        self._sync()
+        self.entries.append(entry)
+
+    def committedKeys(self):
+        return set(entry["key"] for entry in self.entries)
+
+    def lastFileSizes(self):
+        '''Output file sizes after the last committed feature class (empty if none was committed)'''
+        return self.entries[-1]["fileSizes"] if len(self.entries) > 0 else {}
+
+    def close(self, completed=False):
+        if self.journalFile is not None:
+            self.journalFile.close()
+            self.journalFile = None
+        if completed and os.path.isfile(self.journalFilepath):
+            os.remove(self.journalFilepath)
@@ -0,0 +1,95 @@
+import os
+import json
+import hashlib
+from datetime import datetime, timedelta
+
+MANIFEST_VERSION = 5
+
+# Per feature class results kept in the manifest (text per output file & columnar records)
+CACHED_RESULT_KEYS = ["featureCounts", "fieldCounts", "subtypes", "subtypeCounts", "domainViolations", "geometryProfile", "duplicateKeys", "columnar"]
+# Key of a date time stored as ISO text (date statistics of the columnar records)
+DATETIME_TAG = "$datetime"
+
+
+def encodeValue(val):
+    '''json.dump default: date times as tagged ISO text, read back by decodeObject'''
+    if isinstance(val, datetime):
+        return {DATETIME_TAG: val.isoformat()}
+    raise TypeError("Object of type {0} is not JSON serializable".format(type(val).__name__))
+
+
+def decodeObject(obj):
+    '''json.load object_hook: date times back from their tagged ISO text'''
+    if len(obj) == 1 and DATETIME_TAG in obj:
+        return datetime.fromisoformat(obj[DATETIME_TAG])
+    return obj
+
+
+class RunManifest:
+    """
+    Purpose: persistent manifest of an incremental run. Stores a fingerprint (row count, schema hash & last edit
+    date) with the formatted results of every profiled feature class, so the next run reuses the results of
+    feature classes whose fingerprint is unchanged. Entries are only reused when the config hash matches, since
+    the results depend on the configured outputs, limits & include/exclude fields.
+
+    Parameters
+    ----------
+    manifestFilepath - JSON manifest file.
+    configHash - hash of the config the cached results were produced with (see hashValue()).
+    """
+
+    def __init__(self, manifestFilepath, configHash):
+        self.manifestFilepath = manifestFilepath
+        self.configHash = configHash
+        self.previousEntries = {}
+        self.entries = {}
+
+    @staticmethod
+    def hashValue(value):
+        '''Stable hash of a JSON-able value (dict keys sorted, other objects as text)'''
+        text = json.dumps(value, sort_keys=True, default=str)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def load(self):
+        '''Loads the previous manifest. A missing, unreadable or other-config manifest reuses nothing.'''
+        if not os.path.isfile(self.manifestFilepath):
+            return self
+        with open(self.manifestFilepath, 'r', encoding='UTF-8') as manifestFile:
+            manifest = json.load(manifestFile, object_hook=decodeObject)
+        if manifest.get("version") == MANIFEST_VERSION and manifest.get("configHash") == self.configHash:
+            self.previousEntries = manifest.get("featureClasses", {})
+        return self
+
+    def get(self, key, fingerprint, maxAgeDays=0):
+        '''Cached results of the feature class if its fingerprint matches the previous run, else None.
+        Results older than maxAgeDays (0 = no limit) are never reused.'''
+        entry = self.previousEntries.get(key)
+        if fingerprint is None or entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        if maxAgeDays and (datetime.now() - datetime.fromisoformat(entry["profiledAt"])) > timedelta(days=maxAgeDays):
+            return None
+        return entry["results"]
+
+    def put(self, key, fingerprint, results, profiledAt=None):
+        self.entries[key] = {
+            "fingerprint": fingerprint,
+            "profiledAt": profiledAt or datetime.now().isoformat(timespec='seconds'),
+            "results": dict((resultKey, results.get(resultKey)) for resultKey in CACHED_RESULT_KEYS)
+        }
+
+    def keep(self, key):
+        '''Carries the previous entry of a reused feature class over to this run's manifest'''
+        self.entries[key] = self.previousEntries[key]
+
+    def save(self):
+        '''Writes the feature classes of this run (dropped feature classes are forgotten). Atomic replace.'''
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "configHash": self.configHash,
+            "savedAt": datetime.now().isoformat(timespec='seconds'),
+            "featureClasses": self.entries
+        }
+        tempFilepath = self.manifestFilepath + '.tmp'
+        with open(tempFilepath, 'w', encoding='UTF-8') as manifestFile:
+            json.dump(manifest, manifestFile, default=encodeValue)
+        os.replace(tempFilepath, self.manifestFilepath)
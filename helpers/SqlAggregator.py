@@ -0,0 +1,126 @@
+import sqlite3
+
+
+class SqliteSQLExecute:
+    """
+    Purpose: local stand-in for arcpy.ArcSDESQLExecute over a SQLite/GeoPackage file. execute() returns results the
+    same way ArcSDESQLExecute does: True for statements without rows, a single value for a 1x1 result & a list of
+    lists otherwise.
+    """
+
+    def __init__(self, databasePath):
+        self.databasePath = databasePath
+        self.connection = sqlite3.connect(databasePath)
+
+    def execute(self, sqlStatement):
+        cursor = self.connection.execute(sqlStatement)
+        if cursor.description is None:
+            self.connection.commit()
+            return True
+        rows = [list(row) for row in cursor.fetchall()]
+        if len(rows) == 1 and len(rows[0]) == 1:
+            return rows[0][0]
+        return rows
+
+    def close(self):
+        self.connection.close()
+
+
+class SqlAggregator:
+    """
+    Purpose: computes value frequencies, null counts, distinct counts, numeric summaries & subtype x field crosstabs inside the
+    database with GROUP BY & aggregate queries so only the aggregated rows cross the network.
+
+    Parameters
+    ----------
+    sqlExecutor - any object with an ArcSDESQLExecute-style execute(sql) method (ArcSDESQLExecute or SqliteSQLExecute).
+    tableSuffix - appended to table names, i.e. "_evw" to query the versioned views of versioned classes.
+    """
+
+    def __init__(self, sqlExecutor, tableSuffix=''):
+        self.sqlExecutor = sqlExecutor
+        self.tableSuffix = tableSuffix or ''
+
+    @staticmethod
+    def _quoteField(fieldName):
+        return '"{0}"'.format(fieldName)
+
+    def _table(self, tableName):
+        return '{0}{1}'.format(tableName, self.tableSuffix)
+
+    def _query(self, sqlStatement):
+        '''Normalizes ArcSDESQLExecute results (True, a single value, one row or many rows) to a list of lists'''
+        result = self.sqlExecutor.execute(sqlStatement)
+        if result is True or result is None:
+            return []
+        if not isinstance(result, list):
+            return [[result]]
+        if len(result) > 0 and not isinstance(result[0], (list, tuple)):
+            return [result]
+        return result
+
+    @staticmethod
+    def _where(whereClause):
+        return ' WHERE {0}'.format(whereClause) if whereClause else ''
+
+    def valueCounts(self, tableName, fieldName, whereClause=None):
+        '''List of (value, count) for every distinct value (NULL included) of the field'''
+        field = self._quoteField(fieldName)
+        sqlStatement = 'SELECT {0}, COUNT(*) FROM {1}{2} GROUP BY {0}'.format(
+            field, self._table(tableName), self._where(whereClause))
+        return [(row[0], int(row[1])) for row in self._query(sqlStatement)]
+
+    def nullCounts(self, tableName, fieldNames, whereClause=None):
+        '''Row count & a dictionary of NULL counts per field from a single query'''
+        if len(fieldNames) == 0:
+            return 0, {}
+        columns = ', '.join('COUNT({0})'.format(self._quoteField(f)) for f in fieldNames)
+        sqlStatement = 'SELECT COUNT(*), {0} FROM {1}{2}'.format(columns, self._table(tableName), self._where(whereClause))
+        row = self._query(sqlStatement)[0]
+        rowCount = int(row[0])
+        return rowCount, dict((f, rowCount - int(nonNullCount)) for f, nonNullCount in zip(fieldNames, row[1:]))
+
+    def distinctCounts(self, tableName, fieldNames, whereClause=None):
+        '''Dictionary of distinct non-NULL value counts per field from a single query'''
+        if len(fieldNames) == 0:
+            return {}
+        columns = ', '.join('COUNT(DISTINCT {0})'.format(self._quoteField(f)) for f in fieldNames)
+        sqlStatement = 'SELECT {0} FROM {1}{2}'.format(columns, self._table(tableName), self._where(whereClause))
+        row = self._query(sqlStatement)[0]
+        return dict((f, int(distinctCount)) for f, distinctCount in zip(fieldNames, row))
+
+    def numericSummaries(self, tableName, fieldNames, dateFieldNames=(), whereClause=None):
+        '''
+        Dictionary of (count, min, max, sum, sum of squares) of the non-NULL values per field. The sums are of the values
+        less the min (x - MIN), so the variance doesn't cancel out for large values with a small spread: a first query
+        gets the counts, mins & maxes & a second the shifted sums. Date fields (dateFieldNames) only get COUNT, MIN &
+        MAX (sum & sum of squares are None).
+        '''
+        if len(fieldNames) == 0:
+            return {}
+        columns = []
+        for f in fieldNames:
+            field = self._quoteField(f)
+            columns.extend(['COUNT({0})'.format(field), 'MIN({0})'.format(field), 'MAX({0})'.format(field)])
+        sqlStatement = 'SELECT {0} FROM {1}{2}'.format(', '.join(columns), self._table(tableName), self._where(whereClause))
+        row = list(self._query(sqlStatement)[0])
+        summaries = dict((f, (int(row[i * 3]), row[i * 3 + 1], row[i * 3 + 2], None, None)) for i, f in enumerate(fieldNames))
+
+        sumFields = [f for f in fieldNames if f not in dateFieldNames and summaries[f][0] > 0]
+        if len(sumFields) > 0:
+            columns = []
+            for f in sumFields:
+                shifted = '(CAST({0} AS FLOAT) - {1!r})'.format(self._quoteField(f), float(summaries[f][1]))
+                columns.extend(['SUM({0})'.format(shifted), 'SUM({0} * {0})'.format(shifted)])
+            sqlStatement = 'SELECT {0} FROM {1}{2}'.format(', '.join(columns), self._table(tableName), self._where(whereClause))
+            row = list(self._query(sqlStatement)[0])
+            for i, f in enumerate(sumFields):
+                summaries[f] = summaries[f][:3] + (row[i * 2], row[i * 2 + 1])
+        return summaries
+
+    def crossTabCounts(self, tableName, subtypeField, summaryField, whereClause=None):
+        '''List of (subtype value, summary value, count) for every subtype x value combination'''
+        fields = '{0}, {1}'.format(self._quoteField(subtypeField), self._quoteField(summaryField))
+        sqlStatement = 'SELECT {0}, COUNT(*) FROM {1}{2} GROUP BY {0}'.format(
+            fields, self._table(tableName), self._where(whereClause))
+        return [(row[0], row[1], int(row[2])) for row in self._query(sqlStatement)]
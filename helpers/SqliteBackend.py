@@ -0,0 +1,479 @@
+import re
+import sys
+import math
+import struct
+import sqlite3
+from array import array
+from datetime import datetime
+from WorkspaceBackend import WorkspaceBackend, hashText
+
+# Side tables holding the geodatabase schema that SQLite/GeoPackage has no place for
+SIDE_TABLES_SQL = [
+    '''CREATE TABLE IF NOT EXISTS GDB_Domains (name TEXT PRIMARY KEY, domainType TEXT, fieldType TEXT, description TEXT,
+        owner TEXT, mergePolicy TEXT, splitPolicy TEXT, minValue, maxValue)''',
+    '''CREATE TABLE IF NOT EXISTS GDB_CodedValues (domainName TEXT, code, codeName TEXT)''',
+    '''CREATE TABLE IF NOT EXISTS GDB_FieldInfo (tableName TEXT, fieldName TEXT, aliasName TEXT, fieldType TEXT,
+        length INTEGER, precision INTEGER, domainName TEXT)''',
+    '''CREATE TABLE IF NOT EXISTS GDB_Subtypes (tableName TEXT, subtypeField TEXT, subtypeCode INTEGER, subtypeName TEXT,
+        isDefault INTEGER)''',
+    '''CREATE TABLE IF NOT EXISTS GDB_SubtypeFields (tableName TEXT, subtypeCode INTEGER, fieldName TEXT, defaultValue,
+        domainName TEXT)'''
+]
+
+# Tables whose rows are part of the schema (fingerprinted with the table definitions)
+SCHEMA_TABLES = ['GDB_Domains', 'GDB_CodedValues', 'GDB_FieldInfo', 'GDB_Subtypes', 'GDB_SubtypeFields', 'gpkg_geometry_columns']
+
+# Table name prefixes never listed as feature classes
+SYSTEM_TABLE_PREFIXES = ('sqlite_', 'gpkg_', 'rtree_', 'gdb_')
+
+GEOMETRY_TYPES = ['GEOMETRY', 'POINT', 'LINESTRING', 'POLYGON', 'MULTIPOINT', 'MULTILINESTRING', 'MULTIPOLYGON',
+    'GEOMETRYCOLLECTION', 'CURVEPOLYGON', 'MULTICURVE', 'MULTISURFACE']
+
+# GeoPackage geometry type name -> Describe shapeType
+SHAPE_TYPES = {
+    'POINT': 'Point',
+    'MULTIPOINT': 'Multipoint',
+    'LINESTRING': 'Polyline',
+    'MULTILINESTRING': 'Polyline',
+    'MULTICURVE': 'Polyline',
+    'POLYGON': 'Polygon',
+    'MULTIPOLYGON': 'Polygon',
+    'CURVEPOLYGON': 'Polygon',
+    'MULTISURFACE': 'Polygon'
+}
+
+# Default editor tracking "edited at" field names (matched case-insensitively)
+EDITED_AT_FIELDS = ['LAST_EDITED_DATE', 'EDITED_AT']
+
+# Storage class of the first value -> Esri field type, for columns declared without a type
+STORAGE_FIELD_TYPES = {'integer': 'Integer', 'real': 'Double', 'text': 'String', 'blob': 'Blob'}
+
+FIELD_LENGTHS = {'OID': 4, 'SmallInteger': 2, 'Integer': 4, 'BigInteger': 8, 'Single': 4, 'Double': 8, 'Date': 8}
+
+# GeoPackage geometry blob header: envelope contents indicator (flag bits 1-3) -> envelope bytes & the empty flag
+GPKG_ENVELOPE_BYTES = {0: 0, 1: 32, 2: 48, 3: 48, 4: 64}
+GPKG_EMPTY_FLAG = 0x10
+
+# WKB geometry type (ISO code less the Z/M thousands) -> arcpy Geometry type
+WKB_GEOMETRY_TYPES = {1: 'point', 2: 'polyline', 3: 'polygon', 4: 'multipoint', 5: 'polyline', 6: 'polygon', 7: 'geometry'}
+
+
+class SqliteField:
+    """Purpose: arcpy Field look-alike."""
+
+    def __init__(self, name, type, aliasName=None, length=0, precision=0, domain='', isNullable=True):
+        self.name = name
+        self.aliasName = aliasName or name
+        self.type = type
+        self.length = length
+        self.precision = precision
+        self.scale = 0
+        self.domain = domain or ''
+        self.isNullable = isNullable
+        self.baseName = name
+
+
+class SqliteDomain:
+    """Purpose: arcpy.da Domain look-alike read from the GDB_Domains & GDB_CodedValues side tables."""
+
+    def __init__(self, name, domainType, type, codedValues=None, range=None, description='', owner='',
+            mergePolicy='DefaultValue', splitPolicy='Duplicate'):
+        self.name = name
+        self.domainType = domainType
+        self.type = type
+        self.codedValues = codedValues if codedValues is not None else {}
+        self.range = range
+        self.description = description
+        self.owner = owner
+        self.mergePolicy = mergePolicy
+        self.splitPolicy = splitPolicy
+
+
+class SqliteDescribe:
+    """Purpose: arcpy Describe look-alike for a SQLite table."""
+
+    def __init__(self, name, shapeType, fields):
+        self.name = name
+        self.baseName = name
+        self.dataType = 'FeatureClass' if shapeType is not None else 'Table'
+        self.featureType = 'Simple'
+        self.shapeType = shapeType
+        self.fields = fields
+        oidFields = [f.name for f in fields if f.type == 'OID']
+        self.hasOID = len(oidFields) > 0
+        self.OIDFieldName = oidFields[0] if self.hasOID else ''
+
+
+class SqliteExtent:
+    """Purpose: arcpy Extent look-alike."""
+
+    __slots__ = ('XMin', 'YMin', 'XMax', 'YMax')
+
+    def __init__(self, xMin, yMin, xMax, yMax):
+        self.XMin = xMin
+        self.YMin = yMin
+        self.XMax = xMax
+        self.YMax = yMax
+
+
+class SqliteGeometry:
+    """
+    Purpose: arcpy Geometry look-alike of a GeoPackage geometry blob (or plain WKB), returned for the SHAPE@ token.
+    Only the summary properties are kept: type, pointCount, partCount, isMultipart, length, area & extent (None
+    when empty). As in arcpy, polygon point counts include the closing point of each ring, the parts of a polygon
+    are its exterior rings & the length of a polygon is its perimeter.
+    """
+
+    __slots__ = ('type', 'pointCount', 'partCount', 'isMultipart', 'length', 'area', 'extent', '_bounds')
+
+    def __init__(self, blob):
+        self.type = None
+        self.pointCount = 0
+        self.partCount = 0
+        self.length = 0.0
+        self.area = 0.0
+        self.extent = None
+        self._bounds = [math.inf, math.inf, -math.inf, -math.inf]
+        blob = bytes(blob)
+        offset = 0
+        if blob[:2] == b'GP':
+            flags = blob[3]
+            offset = 8 + GPKG_ENVELOPE_BYTES.get((flags >> 1) & 0x07, 0)
+            if flags & GPKG_EMPTY_FLAG and offset >= len(blob):
+                offset = None
+        if offset is not None and offset < len(blob):
+            self._readWkb(blob, offset)
+        self.type = self.type or 'geometry'
+        self.isMultipart = self.partCount > 1
+        if self.pointCount > 0:
+            self.extent = SqliteExtent(*self._bounds)
+
+    def _readWkb(self, blob, offset):
+        '''Reads one WKB geometry (collections recursively) at offset & returns the offset after it'''
+        byteOrder = '<' if blob[offset] == 1 else '>'
+        wkbType = struct.unpack_from(byteOrder + 'I', blob, offset + 1)[0]
+        offset += 5
+        # Z & M from the EWKB flags or the ISO thousands (1000 Z, 2000 M, 3000 ZM)
+        dimensions = 2 + (1 if wkbType & 0x80000000 else 0) + (1 if wkbType & 0x40000000 else 0)
+        wkbType &= 0x0FFFFFFF
+        dimensions += {1: 1, 2: 1, 3: 2}.get(wkbType // 1000, 0)
+        baseType = wkbType % 1000
+        if baseType not in WKB_GEOMETRY_TYPES:
+            raise ValueError("Unsupported WKB geometry type: {0}".format(wkbType))
+        if self.type is None:
+            self.type = WKB_GEOMETRY_TYPES[baseType]
+
+        if baseType == 1:
+            coordinates, offset = self._readCoordinates(blob, offset, byteOrder, dimensions, 1)
+            # An empty point has NaN coordinates
+            if not math.isnan(coordinates[0]):
+                self._addPart([coordinates], False)
+        elif baseType == 2:
+            pointCount = struct.unpack_from(byteOrder + 'I', blob, offset)[0]
+            coordinates, offset = self._readCoordinates(blob, offset + 4, byteOrder, dimensions, pointCount)
+            self._addPart([coordinates], False)
+        elif baseType == 3:
+            ringCount = struct.unpack_from(byteOrder + 'I', blob, offset)[0]
+            offset += 4
+            rings = []
+            for i in range(ringCount):
+                pointCount = struct.unpack_from(byteOrder + 'I', blob, offset)[0]
+                coordinates, offset = self._readCoordinates(blob, offset + 4, byteOrder, dimensions, pointCount)
+                rings.append(coordinates)
+            self._addPart(rings, True)
+        else:
+            memberCount = struct.unpack_from(byteOrder + 'I', blob, offset)[0]
+            offset += 4
+            for i in range(memberCount):
+                offset = self._readWkb(blob, offset)
+        return offset
+
+    @staticmethod
+    def _readCoordinates(blob, offset, byteOrder, dimensions, pointCount):
+        '''x, y array of pointCount points (z & m are dropped) & the offset after them'''
+        end = offset + pointCount * dimensions * 8
+        coordinates = array('d')
+        coordinates.frombytes(blob[offset:end])
+        if (byteOrder == '<') != (sys.byteorder == 'little'):
+            coordinates.byteswap()
+        if dimensions != 2:
+            coordinates = array('d', [val for i in range(0, len(coordinates), dimensions) for val in coordinates[i:i + 2]])
+        return coordinates, end
+
+    def _addPart(self, rings, isPolygon):
+        '''Adds a point, line or polygon (exterior ring first) to the counts, length, area & extent'''
+        pointCount = sum(len(ring) // 2 for ring in rings)
+        if pointCount == 0:
+            return
+        self.partCount += 1
+        self.pointCount += pointCount
+        bounds = self._bounds
+        for i, ring in enumerate(rings):
+            xs, ys = ring[0::2], ring[1::2]
+            if len(xs) == 0:
+                continue
+            bounds[0], bounds[1] = min(bounds[0], min(xs)), min(bounds[1], min(ys))
+            bounds[2], bounds[3] = max(bounds[2], max(xs)), max(bounds[3], max(ys))
+            self.length += sum(math.hypot(xs[j + 1] - xs[j], ys[j + 1] - ys[j]) for j in range(len(xs) - 1))
+            if isPolygon:
+                # Shoelace area. Interior rings are holes.
+                ringArea = abs(sum(xs[j] * ys[j + 1] - xs[j + 1] * ys[j] for j in range(len(xs) - 1))) / 2.0
+                self.area += ringArea if i == 0 else -ringArea
+
+
+class SqliteSearchCursor:
+    """
+    Purpose: arcpy.da.SearchCursor look-alike. Date fields stored as ISO text are returned as datetime & the
+    geometry column requested with the SHAPE@ token as SqliteGeometry.
+    """
+
+    def __init__(self, connection, sql, fields, geometryIndexes=()):
+        self.fields = [f.name for f in fields]
+        self._cursor = connection.execute(sql)
+        self._dateIndexes = [i for i, f in enumerate(fields) if f.type == 'Date']
+        self._geometryIndexes = list(geometryIndexes)
+
+    def __iter__(self):
+        if len(self._dateIndexes) == 0 and len(self._geometryIndexes) == 0:
+            return iter(self._cursor)
+        return self._convertValues()
+
+    def _convertValues(self):
+        dateIndexes = self._dateIndexes
+        geometryIndexes = self._geometryIndexes
+        for row in self._cursor:
+            row = list(row)
+            for i in dateIndexes:
+                row[i] = SqliteBackend.toDatetime(row[i])
+            for i in geometryIndexes:
+                if row[i] is not None:
+                    row[i] = SqliteGeometry(row[i])
+            yield tuple(row)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self._cursor.close()
+
+
+class SqliteBackend(WorkspaceBackend):
+    """
+    Purpose: pure Python workspace backend over a SQLite or GeoPackage file. Every user table is a feature class.
+    Esri field types come from GDB_FieldInfo or the declared column type, domains from GDB_Domains/GDB_CodedValues
+    & subtypes from GDB_Subtypes/GDB_SubtypeFields. There are no feature datasets.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, workspace):
+        WorkspaceBackend.__init__(self, workspace)
+        self.connection = sqlite3.connect(workspace)
+        self._domainsByName = None
+
+    @staticmethod
+    def createSideTables(connection):
+        '''Creates the domain, field info & subtype side tables if missing'''
+        for sql in SIDE_TABLES_SQL:
+            connection.execute(sql)
+        connection.commit()
+
+    @staticmethod
+    def toDatetime(val):
+        if val is None or isinstance(val, datetime):
+            return val
+        try:
+            return datetime.fromisoformat(str(val))
+        except ValueError:
+            return val
+
+    def _tableNames(self):
+        return [row[0] for row in self.connection.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') ORDER BY rowid")]
+
+    def _query(self, sql, params=()):
+        '''Rows of a side table query, or no rows when the side table doesn't exist'''
+        try:
+            return self.connection.execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            return []
+
+    def _geometryColumns(self, fc):
+        '''GeoPackage geometry column name -> geometry type name'''
+        rows = self._query("SELECT column_name, geometry_type_name FROM gpkg_geometry_columns WHERE table_name = ?", (fc,))
+        return dict((row[0].upper(), row[1].upper()) for row in rows)
+
+    def _storageFieldType(self, fc, columnName):
+        row = self.connection.execute('SELECT typeof("{0}") FROM "{1}" WHERE "{0}" IS NOT NULL LIMIT 1'.format(columnName, fc)).fetchone()
+        return STORAGE_FIELD_TYPES.get(row[0], 'String') if row else 'String'
+
+    def _esriFieldType(self, fc, columnName, declaredType, isPrimaryKey, geometryColumns):
+        declaredType = (declaredType or '').upper()
+        baseType = re.sub(r'\(.*\)', '', declaredType).strip()
+        if columnName.upper() in geometryColumns or baseType in GEOMETRY_TYPES:
+            return 'Geometry'
+        if isPrimaryKey and 'INT' in baseType:
+            return 'OID'
+        if baseType in ('SMALLINT', 'TINYINT', 'INT2', 'MEDIUMINT'):
+            return 'SmallInteger'
+        if baseType in ('BIGINT', 'INT8'):
+            return 'BigInteger'
+        if 'INT' in baseType:
+            return 'Integer'
+        if baseType == 'FLOAT':
+            return 'Single'
+        if baseType in ('REAL', 'DOUBLE', 'NUMERIC', 'DECIMAL') or 'DOUBLE' in baseType:
+            return 'Double'
+        if 'DATE' in baseType or 'TIME' in baseType:
+            return 'Date'
+        if baseType in ('GUID', 'UUID'):
+            return 'Guid'
+        if 'CHAR' in baseType or 'TEXT' in baseType or 'CLOB' in baseType:
+            return 'String'
+        if 'BLOB' in baseType:
+            return 'Blob'
+        return self._storageFieldType(fc, columnName)
+
+    def listFeatureClasses(self, featureDataset=None):
+        if featureDataset is not None:
+            return []
+        return [name for name in self._tableNames() if not name.lower().startswith(SYSTEM_TABLE_PREFIXES)]
+
+    def listDatasets(self):
+        return []
+
+    def listFields(self, fc):
+        fieldInfo = dict((row[0].upper(), row[1:]) for row in self._query(
+            "SELECT fieldName, aliasName, fieldType, length, precision, domainName FROM GDB_FieldInfo WHERE tableName = ?", (fc,)))
+        geometryColumns = self._geometryColumns(fc)
+
+        fields = []
+        for cid, columnName, declaredType, notNull, defaultValue, primaryKey in self.connection.execute('PRAGMA table_info("{0}")'.format(fc)):
+            aliasName, fieldType, length, precision, domainName = fieldInfo.get(columnName.upper(), (None, None, None, None, None))
+            if fieldType is None:
+                fieldType = self._esriFieldType(fc, columnName, declaredType, primaryKey > 0, geometryColumns)
+            if length is None:
+                lengthMatch = re.search(r'\((\d+)', declaredType or '')
+                length = int(lengthMatch.group(1)) if lengthMatch else FIELD_LENGTHS.get(fieldType, 255 if fieldType == 'String' else 0)
+            fields.append(SqliteField(columnName, fieldType, aliasName, length, precision or 0, domainName, notNull == 0))
+        return fields
+
+    def searchCursor(self, fc, fieldNames, whereClause=None):
+        if isinstance(fieldNames, str):
+            fieldNames = [fieldNames]
+        fieldsByName = dict((f.name.upper(), f) for f in self.listFields(fc))
+        tokenFields = {
+            'OID@': [f for f in fieldsByName.values() if f.type == 'OID'],
+            'SHAPE@': [f for f in fieldsByName.values() if f.type == 'Geometry']
+        }
+        fields = []
+        for fieldName in fieldNames:
+            field = fieldsByName.get(fieldName.upper())
+            if field is None and tokenFields.get(fieldName.upper()):
+                field = tokenFields[fieldName.upper()][0]
+            if field is None:
+                raise RuntimeError("Cannot find field '{0}' in {1}".format(fieldName, fc))
+            fields.append(field)
+        # The geometry column read by name stays a blob
+        geometryIndexes = [i for i, fieldName in enumerate(fieldNames) if fieldName.upper() == 'SHAPE@']
+
+        sql = 'SELECT {0} FROM "{1}"'.format(', '.join('"{0}"'.format(f.name) for f in fields), fc)
+        if whereClause:
+            sql += ' WHERE {0}'.format(whereClause)
+        return SqliteSearchCursor(self.connection, sql, fields, geometryIndexes)
+
+    def _loadDomains(self):
+        if self._domainsByName is None:
+            codedValues = {}
+            for domainName, code, codeName in self._query("SELECT domainName, code, codeName FROM GDB_CodedValues ORDER BY rowid"):
+                codedValues.setdefault(domainName, {})[code] = codeName
+
+            self._domainsByName = {}
+            for row in self._query('''SELECT name, domainType, fieldType, description, owner, mergePolicy, splitPolicy,
+                    minValue, maxValue FROM GDB_Domains ORDER BY rowid'''):
+                name, domainType, fieldType, description, owner, mergePolicy, splitPolicy, minValue, maxValue = row
+                self._domainsByName[name] = SqliteDomain(name, domainType, fieldType,
+                    codedValues.get(name, {}) if domainType == 'CodedValue' else {},
+                    [minValue, maxValue] if domainType == 'Range' else None,
+                    description or '', owner or '', mergePolicy or 'DefaultValue', splitPolicy or 'Duplicate')
+        return self._domainsByName
+
+    def listDomains(self, workspace=None):
+        return list(self._loadDomains().values())
+
+    def listSubtypes(self, fc):
+        '''Same shape as arcpy.da.ListSubtypes. A table without subtypes returns a single default subtype 0.'''
+        domainsByName = self._loadDomains()
+        fields = self.listFields(fc)
+        fieldDomains = dict((f.name, domainsByName.get(f.domain)) for f in fields)
+
+        subtypeRows = self._query("SELECT subtypeField, subtypeCode, subtypeName, isDefault FROM GDB_Subtypes WHERE tableName = ? ORDER BY subtypeCode", (fc,))
+        if len(subtypeRows) == 0:
+            return {0: {
+                'Name': fc,
+                'Default': True,
+                'SubtypeField': '',
+                'FieldValues': dict((f.name, (None, fieldDomains[f.name])) for f in fields)
+            }}
+
+        subtypeFieldValues = {}
+        for subtypeCode, fieldName, defaultValue, domainName in self._query(
+                "SELECT subtypeCode, fieldName, defaultValue, domainName FROM GDB_SubtypeFields WHERE tableName = ?", (fc,)):
+            subtypeFieldValues[(subtypeCode, fieldName.upper())] = (defaultValue, domainsByName.get(domainName) if domainName else None)
+
+        subtypes = {}
+        for subtypeField, subtypeCode, subtypeName, isDefault in subtypeRows:
+            fieldValues = {}
+            for f in fields:
+                fieldValues[f.name] = subtypeFieldValues.get((subtypeCode, f.name.upper()), (None, fieldDomains[f.name]))
+            subtypes[subtypeCode] = {
+                'Name': subtypeName,
+                'Default': bool(isDefault),
+                'SubtypeField': subtypeField,
+                'FieldValues': fieldValues
+            }
+        return subtypes
+
+    def getCount(self, fc):
+        return self.connection.execute('SELECT COUNT(*) FROM "{0}"'.format(fc)).fetchone()[0]
+
+    def describe(self, fc):
+        geometryColumns = self._geometryColumns(fc)
+        shapeType = None
+        if len(geometryColumns) > 0:
+            shapeType = SHAPE_TYPES.get(list(geometryColumns.values())[0], 'Geometry')
+        return SqliteDescribe(fc, shapeType, self.listFields(fc))
+
+    def lastEditDate(self, fc):
+        '''Max of the editor tracking field when the table has one of the default edited-at columns'''
+        for field in self.listFields(fc):
+            if field.name.upper() in EDITED_AT_FIELDS:
+                return self.connection.execute('SELECT MAX("{0}") FROM "{1}"'.format(field.name, fc)).fetchone()[0]
+        return None
+
+    def oidRange(self, fc):
+        oidFields = [f for f in self.listFields(fc) if f.type == 'OID']
+        if len(oidFields) == 0:
+            return None
+        minOid, maxOid = self.connection.execute('SELECT MIN("{0}"), MAX("{0}") FROM "{1}"'.format(oidFields[0].name, fc)).fetchone()
+        return (oidFields[0].name, minOid, maxOid) if minOid is not None else None
+
+    def schemaFingerprint(self, gdbItemsTable=None):
+        return self.schemaFingerprintOf(self.connection)
+
+    @staticmethod
+    def schemaFingerprintOf(connection):
+        '''Hash of the table definitions & the rows of the schema side tables'''
+        rows = [list(row) for row in connection.execute("SELECT type, name, sql FROM sqlite_master ORDER BY type, name")]
+        for tableName in SCHEMA_TABLES:
+            try:
+                rows.append([tableName] + [list(row) for row in connection.execute('SELECT * FROM "{0}" ORDER BY rowid'.format(tableName))])
+            except sqlite3.OperationalError:
+                pass
+        return hashText('{0}'.format(rows))
+
+    def createSqlExecutor(self):
+        from SqlAggregator import SqliteSQLExecute
+        return SqliteSQLExecute(self.workspace)
+
+    def close(self):
+        self.connection.close()
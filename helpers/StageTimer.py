@@ -0,0 +1,123 @@
+import time
+import json
+import csv
+from contextlib import contextmanager
+
+# Columns of the run profile CSV (one row per stage, feature class & field)
+PROFILE_COLUMNS = ["stage", "featureClass", "field", "seconds", "rowsRead", "bytesWritten"]
+
+
+class TimingRecord:
+    """Purpose: wall time, rows read & bytes written for one stage of one feature class (and field)."""
+
+    __slots__ = PROFILE_COLUMNS
+
+    def __init__(self, stage, featureClass='', field='', seconds=0.0, rowsRead=0, bytesWritten=0):
+        self.stage = stage
+        self.featureClass = featureClass
+        self.field = field
+        self.seconds = seconds
+        self.rowsRead = rowsRead
+        self.bytesWritten = bytesWritten
+
+    def __getstate__(self):
+        return [getattr(self, column) for column in PROFILE_COLUMNS]
+
+    def __setstate__(self, state):
+        for column, val in zip(PROFILE_COLUMNS, state):
+            setattr(self, column, val)
+
+    def toDict(self):
+        record = dict((column, getattr(self, column)) for column in PROFILE_COLUMNS)
+        record["seconds"] = round(self.seconds, 6)
+        return record
+
+
+class StageTimer:
+    """
+    Purpose: instrumentation layer for a run. measure() times a block as a stage of a feature class (or the whole
+    run when featureClass is empty) & add() records measurements taken elsewhere, i.e. per field in the profiling pass.
+    When disabled, measure() still yields a record but nothing is kept.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.records = []
+
+    @contextmanager
+    def measure(self, stage, featureClass='', field=''):
+        record = TimingRecord(stage, featureClass, field)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds += time.perf_counter() - start
+            if self.enabled:
+                self.records.append(record)
+
+    def add(self, stage, featureClass='', field='', seconds=0.0, rowsRead=0, bytesWritten=0):
+        if self.enabled:
+            self.records.append(TimingRecord(stage, featureClass, field, seconds, rowsRead, bytesWritten))
+
+    def extend(self, records):
+        '''Adds records measured in another process (parallel workers)'''
+        if self.enabled:
+            self.records.extend(records)
+
+    def addBytes(self, stage, featureClass, bytesWritten, since=0):
+        '''Adds the output size to the latest record of the stage & feature class (records[since:] only)'''
+        for record in reversed(self.records[since:]):
+            if record.stage == stage and record.featureClass == featureClass and record.field == '':
+                record.bytesWritten += bytesWritten
+                return
+
+    def stageTotals(self):
+        '''One record per stage summed over its feature class level records, in first-seen order'''
+        totals = {}
+        for record in self.records:
+            if record.field != '':
+                continue
+            total = totals.get(record.stage)
+            if total is None:
+                total = totals[record.stage] = TimingRecord(record.stage)
+            total.seconds += record.seconds
+            total.rowsRead += record.rowsRead
+            total.bytesWritten += record.bytesWritten
+        return list(totals.values())
+
+    def slowest(self, limit, fieldLevel=False):
+        '''Slowest feature class stages (or fields when fieldLevel is True)'''
+        records = [r for r in self.records if r.featureClass != '' and (r.field != '') == fieldLevel]
+        return sorted(records, key=lambda r: r.seconds, reverse=True)[:limit]
+
+    def formatSummary(self, limit=10):
+        lines = ['{0:<16} {1:>10} {2:>12} {3:>14}'.format('Stage', 'Seconds', 'Rows Read', 'Bytes Written')]
+        for record in self.stageTotals():
+            lines.append('{0:<16} {1:>10.4f} {2:>12} {3:>14}'.format(record.stage, record.seconds, record.rowsRead, record.bytesWritten))
+
+        for title, fieldLevel in [('Slowest feature class stages', False), ('Slowest fields', True)]:
+            records = self.slowest(limit, fieldLevel)
+            if len(records) == 0:
+                continue
+            lines.append('')
+            lines.append('{0} (top {1})'.format(title, limit))
+            for record in records:
+                name = record.featureClass if fieldLevel is False else '{0}.{1}'.format(record.featureClass, record.field)
+                lines.append('{0:<16} {1:>10.4f} {2:>12}  {3}'.format(record.stage, record.seconds, record.rowsRead, name))
+        return '\n'.join(lines)
+
+    def writeProfile(self, jsonFilepath, csvFilepath, limit=10):
+        profile = {
+            "stages": [r.toDict() for r in self.stageTotals()],
+            "slowestFeatureClassStages": [r.toDict() for r in self.slowest(limit)],
+            "slowestFields": [r.toDict() for r in self.slowest(limit, True)],
+            "records": [r.toDict() for r in self.records]
+        }
+        with open(jsonFilepath, 'w') as jsonFile:
+            json.dump(profile, jsonFile, indent=2)
+
+        with open(csvFilepath, 'w', newline='') as csvFile:
+            writer = csv.DictWriter(csvFile, fieldnames=PROFILE_COLUMNS)
+            writer.writeheader()
+            for record in self.records:
+                writer.writerow(record.toDict())
@@ -0,0 +1,61 @@
+import heapq
+from operator import itemgetter
+
+
+class ValueCounter:
+    """
+    Purpose: streaming hashed value counter. Each value is counted in O(1) as it is read, so a column
+    never has to be held in memory (memory grows with the number of distinct values, not rows).
+
+    Returns
+    -------
+    topN() - the most frequent values in descending count order, plus distinctCount & tailCount().
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+
+    def add(self, val):
+        counts = self.counts
+        counts[val] = counts.get(val, 0) + 1
+        self.total += 1
+
+    def addCount(self, val, valCount):
+        '''Adds a pre-aggregated count, i.e. a GROUP BY row computed by the database'''
+        counts = self.counts
+        counts[val] = counts.get(val, 0) + valCount
+        self.total += valCount
+
+    def update(self, values):
+        counts = self.counts
+        for val in values:
+            counts[val] = counts.get(val, 0) + 1
+            self.total += 1
+
+    def merge(self, other):
+        '''Adds the counts of another ValueCounter (i.e. from another chunk or worker)'''
+        counts = self.counts
+        for val, valCount in other.counts.items():
+            counts[val] = counts.get(val, 0) + valCount
+        self.total += other.total
+        return self
+
+    def get(self, val, default=0):
+        return self.counts.get(val, default)
+
+    @property
+    def distinctCount(self):
+        return len(self.counts)
+
+    def topN(self, limit=None):
+        '''Most frequent values as (value, count) pairs. Ties keep first-seen order.'''
+        if limit is None or limit >= len(self.counts):
+            return sorted(self.counts.items(), key=itemgetter(1), reverse=True)
+        return heapq.nlargest(limit, self.counts.items(), key=itemgetter(1))
+
+    def tailCount(self, limit=None):
+        '''Number of rows whose value falls outside the top N'''
+        if limit is None or limit >= len(self.counts):
+            return 0
+        return self.total - sum(valCount for val, valCount in self.topN(limit))
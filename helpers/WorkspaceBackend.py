@@ -0,0 +1,216 @@
+import os
+import json
+import hashlib
+
+# Workspace file extensions that can be read without arcpy
+SQLITE_WORKSPACE_TYPES = ['.sqlite', '.gpkg', '.db']
+
+# File geodatabase system tables a00000001 (GDB_SystemCatalog) to a00000008. Schema changes rewrite them.
+FILE_GDB_SYSTEM_TABLES = range(1, 9)
+
+
+def hashText(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class WorkspaceBackend:
+    """
+    Purpose: the workspace operations used by the sniffer. ArcpyBackend wraps arcpy & SqliteBackend reads
+    SQLite/GeoPackage files with plain Python, so profiling can run & be benchmarked without an ArcGIS license.
+
+    Methods
+    -------
+    listFeatureClasses(featureDataset) - feature class names (arcpy.ListFeatureClasses).
+    listDatasets() - feature dataset names (arcpy.ListDatasets).
+    listFields(fc) - field objects with name, aliasName, type, length, precision & domain (arcpy.ListFields).
+    searchCursor(fc, fieldNames, whereClause) - iterable of row tuples, usable as a context manager (arcpy.da.SearchCursor).
+    listDomains(workspace) - domain objects (arcpy.da.ListDomains).
+    listSubtypes(fc) - subtype dictionary keyed by subtype code (arcpy.da.ListSubtypes).
+    getCount(fc) - row count as an int (arcpy.GetCount_management).
+    describe(fc) - object with featureType & shapeType (arcpy.Describe).
+    lastEditDate(fc) - latest editor tracking edit date, or None when not tracked (incremental run fingerprints).
+    oidRange(fc) - (OID field name, min OID, max OID) or None without an OID field (sampling).
+    schemaFingerprint(gdbItemsTable) - hash that changes with the workspace schema, or None (metadata cache).
+    """
+
+    name = None
+
+    def __init__(self, workspace):
+        self.workspace = workspace
+
+    def listFeatureClasses(self, featureDataset=None):
+        raise NotImplementedError
+
+    def listDatasets(self):
+        raise NotImplementedError
+
+    def listFields(self, fc):
+        raise NotImplementedError
+
+    def searchCursor(self, fc, fieldNames, whereClause=None):
+        raise NotImplementedError
+
+    def listDomains(self, workspace=None):
+        raise NotImplementedError
+
+    def listSubtypes(self, fc):
+        raise NotImplementedError
+
+    def getCount(self, fc):
+        raise NotImplementedError
+
+    def describe(self, fc):
+        raise NotImplementedError
+
+    def lastEditDate(self, fc):
+        return None
+
+    def oidRange(self, fc):
+        return None
+
+    def schemaFingerprint(self, gdbItemsTable=None):
+        return None
+
+    def createSqlExecutor(self):
+        '''ArcSDESQLExecute-like object for GROUP BY pushdown, or None if the workspace can't run SQL'''
+        return None
+
+    def exportAttributeRules(self, inTable, outFilepath):
+        self.addMessage("Attribute rules export is not supported by the {0} backend, skipping {1}".format(self.name, inTable))
+
+    def addMessage(self, message):
+        print(message)
+
+
+class ArcpyBackend(WorkspaceBackend):
+    """Purpose: workspace backend calling arcpy (requires ArcGIS Pro/ArcMap)."""
+
+    name = "arcpy"
+
+    def __init__(self, workspace):
+        WorkspaceBackend.__init__(self, workspace)
+        import arcpy
+        self.arcpy = arcpy
+        arcpy.env.workspace = workspace
+
+    def listFeatureClasses(self, featureDataset=None):
+        if featureDataset is None:
+            return self.arcpy.ListFeatureClasses()
+        return self.arcpy.ListFeatureClasses(feature_dataset=featureDataset)
+
+    def listDatasets(self):
+        return self.arcpy.ListDatasets()
+
+    def listFields(self, fc):
+        return self.arcpy.ListFields(fc)
+
+    def searchCursor(self, fc, fieldNames, whereClause=None):
+        return self.arcpy.da.SearchCursor(fc, fieldNames, where_clause=whereClause)
+
+    def listDomains(self, workspace=None):
+        return self.arcpy.da.ListDomains(workspace or self.workspace)
+
+    def listSubtypes(self, fc):
+        return self.arcpy.da.ListSubtypes(fc)
+
+    def getCount(self, fc):
+        return int(self.arcpy.GetCount_management(fc)[0])
+
+    def describe(self, fc):
+        return self.arcpy.Describe(fc)
+
+    def lastEditDate(self, fc):
+        '''Max of the editor tracking "edited at" field, read as the first row in descending order'''
+        properties = self.arcpy.Describe(fc)
+        editedAtField = getattr(properties, 'editedAtFieldName', '') if getattr(properties, 'editorTrackingEnabled', False) else ''
+        if not editedAtField:
+            return None
+        whereClause = '{0} IS NOT NULL'.format(editedAtField)
+        sqlClause = (None, 'ORDER BY {0} DESC'.format(editedAtField))
+        with self.arcpy.da.SearchCursor(fc, [editedAtField], where_clause=whereClause, sql_clause=sqlClause) as cursor:
+            for row in cursor:
+                return row[0]
+        return None
+
+    def oidRange(self, fc):
+        '''Min & max OID from the first row in ascending & descending OID order (read through the OID index)'''
+        properties = self.arcpy.Describe(fc)
+        if not getattr(properties, 'hasOID', False):
+            return None
+        oidField = properties.OIDFieldName
+        oids = []
+        for order in ['ASC', 'DESC']:
+            with self.arcpy.da.SearchCursor(fc, [oidField], sql_clause=(None, 'ORDER BY {0} {1}'.format(oidField, order))) as cursor:
+                for row in cursor:
+                    oids.append(row[0])
+                    break
+        return (oidField, oids[0], oids[1]) if len(oids) == 2 else None
+
+    def schemaFingerprint(self, gdbItemsTable=None):
+        '''
+        Cheap fingerprint of the whole workspace schema: the size & modified time of the system tables of a file
+        geodatabase, a hash of the GDB_Items definitions of an enterprise geodatabase (one query) or of the schema
+        of a SQLite/GeoPackage file. Data edits don't change it. None for other workspaces.
+        '''
+        workspaceType = os.path.splitext(self.workspace)[1].lower()
+        if workspaceType == '.gdb':
+            stamps = []
+            for tableId in FILE_GDB_SYSTEM_TABLES:
+                for extension in ['.gdbtable', '.gdbtablx']:
+                    tableFilepath = os.path.join(self.workspace, 'a{0:08x}{1}'.format(tableId, extension))
+                    if os.path.isfile(tableFilepath):
+                        stat = os.stat(tableFilepath)
+                        stamps.append([os.path.basename(tableFilepath), stat.st_size, stat.st_mtime_ns])
+            return hashText(json.dumps(stamps)) if len(stamps) > 0 else None
+        elif workspaceType == '.sde':
+            sqlExecutor = self.arcpy.ArcSDESQLExecute(self.workspace)
+            rows = sqlExecutor.execute('SELECT Name, Definition FROM {0} ORDER BY Name'.format(gdbItemsTable or 'sde.GDB_ITEMS'))
+            return hashText('{0}'.format(rows))
+        elif workspaceType in SQLITE_WORKSPACE_TYPES:
+            import sqlite3
+            from SqliteBackend import SqliteBackend
+            connection = sqlite3.connect(self.workspace)
+            try:
+                return SqliteBackend.schemaFingerprintOf(connection)
+            finally:
+                connection.close()
+        return None
+
+    def createSqlExecutor(self):
+        workspaceType = os.path.splitext(self.workspace)[1].lower()
+        if workspaceType == '.sde':
+            return self.arcpy.ArcSDESQLExecute(self.workspace)
+        elif workspaceType in SQLITE_WORKSPACE_TYPES:
+            from SqlAggregator import SqliteSQLExecute
+            return SqliteSQLExecute(self.workspace)
+        # Client-side counting for file geodatabases
+        return None
+
+    def exportAttributeRules(self, inTable, outFilepath):
+        self.arcpy.ExportAttributeRules_management(inTable, outFilepath)
+
+    def addMessage(self, message):
+        self.arcpy.AddMessage(message)
+
+
+def createBackend(backendName, workspace):
+    '''
+    Purpose: workspace backend from the workspaceBackend config value.
+    "arcpy" & "sqlite" pick a backend. "auto" uses arcpy when it can be imported & otherwise SQLite for
+    .sqlite/.gpkg/.db workspaces.
+    '''
+    backendName = (backendName or "auto").lower()
+    if backendName == "auto":
+        try:
+            return ArcpyBackend(workspace)
+        except ImportError:
+            if os.path.splitext(workspace)[1].lower() not in SQLITE_WORKSPACE_TYPES:
+                raise
+            backendName = "sqlite"
+
+    if backendName == "arcpy":
+        return ArcpyBackend(workspace)
+    elif backendName == "sqlite":
+        from SqliteBackend import SqliteBackend
+        return SqliteBackend(workspace)
+    raise ValueError("Unknown workspaceBackend: {0}".format(backendName))
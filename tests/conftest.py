@@ -0,0 +1,71 @@
+'''
+Purpose: shared fixtures of the test suite. The tests run on synthetic SQLite workspaces (benchmarks/syntheticWorkspace.py)
+read through the SqliteBackend, so neither ArcGIS nor arcpy is needed.
+
+python -m pytest -q tests
+'''
+
+import os, sys, json, csv, subprocess
+import pytest
+testDir = os.path.dirname(os.path.abspath(__file__))
+repoDir = os.path.abspath(os.path.join(testDir, '..'))
+for path in [repoDir, os.path.join(repoDir, 'helpers'), os.path.join(repoDir, 'benchmarks')]:
+    if path not in sys.path:
+        sys.path.append(path)
+from syntheticWorkspace import createSyntheticWorkspace
+
+KEYWORD = '_Test'
+
+
+@pytest.fixture(scope='session')
+def syntheticWorkspace(tmp_path_factory):
+    '''Small synthetic workspace: 4 feature classes with subtypes, coded value domains & NULLs'''
+    workspacePath = str(tmp_path_factory.mktemp('workspace') / 'synthetic.sqlite')
+    createSyntheticWorkspace(workspacePath, featureClasses=4, rows=3000, fields=8, cardinality=(6, 40, 900),
+        distribution='zipf', nullRatio=0.1, domains=2, subtypes=3, seed=7)
+    return workspacePath
+
+
+def makeConfig(workspacePath, outDir, runSections, **globalSettings):
+    '''Repo config with only runSections switched on (plus any other globals settings) & one SQLite source'''
+    with open(os.path.join(repoDir, 'DatabaseSniffer_config.json'), 'r') as configFile:
+        config = json.load(configFile)
+    globals = config["globals"]
+    globals["outDir"] = outDir
+    globals["csvLoggingFilepath"] = os.path.join(outDir, 'logs', 'DatabaseSniffer_log.csv')
+    globals["overWriteOption"] = "YES"
+    globals["mergeCsvsToExcel"] = "NO"
+    globals["excelOutput"] = "NO"
+    globals["workspaceBackend"] = "sqlite"
+    for section, settings in globals.items():
+        if isinstance(settings, dict) and "run" in settings:
+            settings["run"] = "YES" if section in runSections else "NO"
+    globals.update(globalSettings)
+
+    config["sourceDbDict"] = [{
+        "sourceDir": workspacePath,
+        "dataSetsToCheck": ["STANDALONE"],
+        "keyword": KEYWORD,
+        "skipFcList": [],
+        "fcList": [],
+        "excludeSubtypeCountFields": "GLOBAL",
+        "excludeFieldCountFields": "GLOBAL",
+        "includeFieldCountFields": [],
+        "includeSubtypeCountFields": ["STR", "NUM"]
+    }]
+    configPath = os.path.join(os.path.dirname(outDir), os.path.basename(outDir) + '_config.json')
+    with open(configPath, 'w') as configFile:
+        json.dump(config, configFile, indent=4)
+    return configPath
+
+
+def runSniffer(configPath, extraArgs=(), script=None):
+    '''Runs DatabaseSniffer.py (or a script that wraps it) in a subprocess. Returns the CompletedProcess.'''
+    command = [sys.executable, script or os.path.join(repoDir, 'DatabaseSniffer.py'), '-C', configPath] + list(extraArgs)
+    return subprocess.run(command, cwd=repoDir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+
+
+def readOutput(outDir, outputName):
+    '''Rows of an output csv without the export date line'''
+    with open(os.path.join(outDir, '{0}_{1}.csv'.format(KEYWORD, outputName)), 'r', newline='') as csvFile:
+        return [row for row in csv.reader(csvFile) if len(row) > 0 and not row[0].startswith('Data exported')]
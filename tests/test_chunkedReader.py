@@ -0,0 +1,51 @@
+from ChunkedReader import ChunkedReader
+
+
+class Field:
+    def __init__(self, name, type):
+        self.name = name
+        self.type = type
+
+
+class Cursor:
+    '''arcpy.da.SearchCursor look-alike that records whether it was entered & exited'''
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.entered = False
+        self.exited = False
+
+    def __enter__(self):
+        self.entered = True
+        return self
+
+    def __exit__(self, *args):
+        self.exited = True
+
+    def __iter__(self):
+        assert self.entered
+        return iter(self.rows)
+
+
+def test_64_bit_object_ids_are_kept():
+    rows = [(2 ** 31 + i, 'A' if i % 2 else None) for i in range(5)]
+    reader = ChunkedReader(lambda fieldNames: Cursor(rows), [Field('OBJECTID', 'OID'), Field('NAME', 'String')], chunkSize=2)
+    chunks = list(reader.chunks())
+    assert [len(oidChunk) for oidChunk, nameChunk in chunks] == [2, 2, 1]
+    assert [oid for oidChunk, nameChunk in chunks for oid in oidChunk.values.tolist()] == [oid for oid, name in rows]
+    assert [isNull for oidChunk, nameChunk in chunks for isNull in nameChunk.nullMask.tolist()] == [True, False, True, False, True]
+    assert reader.rowsRead == 5
+
+
+def test_cursor_is_closed_when_reading_stops_early():
+    cursors = []
+
+    def cursorFactory(fieldNames):
+        cursors.append(Cursor([(i,) for i in range(10)]))
+        return cursors[-1]
+
+    chunks = ChunkedReader(cursorFactory, [Field('OBJECTID', 'OID')], chunkSize=3).chunks()
+    next(chunks)
+    assert cursors[0].entered and cursors[0].exited is False
+    chunks.close()
+    assert cursors[0].exited
@@ -0,0 +1,49 @@
+import os
+import pytest
+from conftest import makeConfig, runSniffer, readOutput, KEYWORD
+from ColumnarWriter import OUTPUT_FILE_NAMES, outputSchemas
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq
+
+PROFILE_SECTIONS = ["featureCountConfig", "fieldCountConfig", "subtypeConfig", "subtypeCountConfig", "columnarOutputConfig"]
+PROFILE_OUTPUTS = ["featureCounts", "fieldCounts", "subtypes", "subtypeCounts"]
+
+
+def columnarPath(outDir, outputName, extension):
+    return os.path.join(outDir, '{0}_{1}{2}'.format(KEYWORD, OUTPUT_FILE_NAMES[outputName], extension))
+
+
+def test_parquet_outputs_have_the_typed_schema(syntheticWorkspace, tmp_path):
+    outDir = str(tmp_path / 'parquet')
+    process = runSniffer(makeConfig(syntheticWorkspace, outDir, PROFILE_SECTIONS))
+    assert process.returncode == 0, process.stdout
+
+    schemas = outputSchemas(pa)
+    for outputName in PROFILE_OUTPUTS:
+        parquetFile = pq.ParquetFile(columnarPath(outDir, outputName, '.parquet'))
+        assert parquetFile.schema_arrow.equals(schemas[outputName]), outputName
+        # One row group per feature class
+        assert parquetFile.num_row_groups == 4, outputName
+
+    # Same rows as the csv outputs, with the value counts as nested (value, count) lists
+    fieldCounts = pq.read_table(columnarPath(outDir, "fieldCounts", '.parquet')).to_pylist()
+    assert len(fieldCounts) == len(readOutput(outDir, "FieldCounts")) - 1
+    for record in fieldCounts:
+        if record["countStatus"] == "COUNTED":
+            assert sum(valueCount["count"] for valueCount in record["valueCounts"]) + record["tailCount"] == record["featureCount"]
+    subtypeCounts = pq.read_table(columnarPath(outDir, "subtypeCounts", '.parquet')).to_pylist()
+    crossTabbed = [record for record in subtypeCounts if record["crossTab"]]
+    assert len(crossTabbed) > 0
+    for record in crossTabbed:
+        assert sum(cell["count"] for cell in record["crossTab"]) == record["featureCount"]
+
+
+def test_arrow_files_have_one_record_batch_per_feature_class(syntheticWorkspace, tmp_path):
+    outDir = str(tmp_path / 'arrow')
+    process = runSniffer(makeConfig(syntheticWorkspace, outDir, PROFILE_SECTIONS, columnarOutputConfig={"run": "YES", "format": "arrow"}))
+    assert process.returncode == 0, process.stdout
+    with pa.memory_map(columnarPath(outDir, "featureCounts", '.arrow')) as source:
+        reader = pa.ipc.open_file(source)
+        assert reader.schema.equals(outputSchemas(pa)["featureCounts"])
+        assert reader.num_record_batches == 4
+        assert reader.read_all().column("featureCount").to_pylist() == [3000] * 4
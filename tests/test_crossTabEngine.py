@@ -0,0 +1,35 @@
+import numpy as np
+from ChunkedReader import ColumnChunk
+from CrossTabEngine import CrossTabEngine, factorize, NULL_LABEL
+
+
+def objectChunk(fieldName, values):
+    nullMask = np.array([val is None for val in values])
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return ColumnChunk(fieldName, 'String', array, nullMask)
+
+
+def test_factorize_sorts_labels_and_codes_null_rows_last():
+    labels, codes = factorize(np.array([3, 1, 3, 0, 2]), np.array([False, False, False, True, False]))
+    assert labels.tolist() == [1, 2, 3]
+    assert codes.tolist() == [2, 0, 2, 3, 1]
+
+
+def test_factorize_hashes_values_that_cannot_be_sorted():
+    values = objectChunk('VAL', ['b', 2, 'b', None, 1.5, 2]).values
+    labels, codes = factorize(values, np.array([False, False, False, True, False, False]))
+    assert labels.tolist() == ['b', 2, 1.5]
+    assert codes.tolist() == [0, 1, 0, 3, 2, 1]
+
+
+def test_mixed_type_columns_are_crosstabbed():
+    engine = CrossTabEngine('SUBTYPECD', ['VAL'])
+    values = ['b', 2, 'b', None, 1.5, 2]
+    subtypes = [1, 1, 2, 2, None, 1]
+    for start in range(0, len(values), 4):
+        engine.addChunk(objectChunk('SUBTYPECD', subtypes[start:start + 4]), [objectChunk('VAL', values[start:start + 4])])
+
+    crossTab = engine.crossTabs()['VAL']
+    assert sorted(crossTab.cells(), key=str) == sorted([(1, 'b', 1), (1, 2, 2), (2, 'b', 1), (2, None, 1), (None, 1.5, 1)], key=str)
+    assert crossTab.subtypeLabels == [1, 2, NULL_LABEL]
@@ -0,0 +1,209 @@
+import os, csv, json, shutil, sqlite3
+import pytest
+from conftest import makeConfig, runSniffer, readOutput, repoDir
+
+PROFILE_SECTIONS = ["featureCountConfig", "fieldCountConfig", "subtypeConfig", "subtypeCountConfig", "domainValidationConfig"]
+PROFILE_OUTPUTS = ["FeatureCounts", "FieldCounts", "Subtypes", "SubtypeCounts", "DomainViolations"]
+
+# Stops the run in the middle of writing the 3rd feature class's field counts (as a killed process would)
+CRASH_SCRIPT = '''import os, sys
+sys.path.insert(0, {repoDir!r})
+sys.path.insert(0, os.path.join({repoDir!r}, 'helpers'))
+import DatabaseSniffer
+writeResults = DatabaseSniffer.DatabaseSnifferDb._writeResults
+featureClassesWritten = [0]
+
+def crashingWriteResults(self, results):
+    featureClassesWritten[0] += 1
+    if featureClassesWritten[0] == 3:
+        fileWriter = getattr(self, DatabaseSniffer.OUTPUT_FILE_ATTRIBUTES["fieldCounts"][0])
+        fileWriter.write(results["fieldCounts"][:200])
+        fileWriter.flush()
+        os._exit(1)
+    writeResults(self, results)
+
+DatabaseSniffer.DatabaseSnifferDb._writeResults = crashingWriteResults
+DatabaseSniffer.main()
+'''
+
+# Kills the worker process profiling the 2nd feature class (as the out of memory killer would), which breaks the pool
+WORKER_CRASH_SCRIPT = '''import os, sys
+sys.path.insert(0, {repoDir!r})
+sys.path.insert(0, os.path.join({repoDir!r}, 'helpers'))
+import DatabaseSniffer
+profileFeatureClassWorker = DatabaseSniffer._profileFeatureClassWorker
+
+def crashingProfileFeatureClassWorker(task):
+    if task[1] == 'SyntheticFc02':
+        os._exit(1)
+    return profileFeatureClassWorker(task)
+
+DatabaseSniffer._profileFeatureClassWorker = crashingProfileFeatureClassWorker
+DatabaseSniffer.main()
+'''
+
+# Fails the run if the sampling module was imported by a run without sampling
+IMPORT_CHECK_SCRIPT = '''import os, sys
+sys.path.insert(0, {repoDir!r})
+sys.path.insert(0, os.path.join({repoDir!r}, 'helpers'))
+import DatabaseSniffer
+DatabaseSniffer.main()
+sys.exit(1 if 'RowSampler' in sys.modules else 0)
+'''
+
+
+def assertRun(process):
+    assert process.returncode == 0, process.stdout
+
+
+def assertSameOutputs(expectedDir, actualDir, outputNames=PROFILE_OUTPUTS):
+    for outputName in outputNames:
+        assert readOutput(expectedDir, outputName) == readOutput(actualDir, outputName), outputName
+
+
+def test_parallel_workers_write_the_serial_order(syntheticWorkspace, tmp_path):
+    serialDir, parallelDir = str(tmp_path / 'serial'), str(tmp_path / 'parallel')
+    assertRun(runSniffer(makeConfig(syntheticWorkspace, serialDir, PROFILE_SECTIONS, workers=1)))
+    assertRun(runSniffer(makeConfig(syntheticWorkspace, parallelDir, PROFILE_SECTIONS, workers=3)))
+    assertSameOutputs(serialDir, parallelDir)
+
+
+def test_feature_classes_of_a_broken_worker_pool_are_profiled_in_the_main_process(syntheticWorkspace, tmp_path):
+    serialDir, parallelDir = str(tmp_path / 'serial'), str(tmp_path / 'parallel')
+    assertRun(runSniffer(makeConfig(syntheticWorkspace, serialDir, PROFILE_SECTIONS, workers=1)))
+    crashScript = tmp_path / 'crashingWorker.py'
+    crashScript.write_text(WORKER_CRASH_SCRIPT.format(repoDir=repoDir))
+    process = runSniffer(makeConfig(syntheticWorkspace, parallelDir, PROFILE_SECTIONS, workers=3), script=str(crashScript))
+    assertRun(process)
+    assert 'profiling fc SyntheticFc02 in the main process' in process.stdout
+    assertSameOutputs(serialDir, parallelDir)
+
+
+def test_runs_without_sampling_do_not_import_the_sampler(syntheticWorkspace, tmp_path):
+    script = tmp_path / 'importCheck.py'
+    script.write_text(IMPORT_CHECK_SCRIPT.format(repoDir=repoDir))
+    assertRun(runSniffer(makeConfig(syntheticWorkspace, str(tmp_path / 'out'), PROFILE_SECTIONS), script=str(script)))
+
+
+
+def test_sql_pushdown_matches_client_side_counts(syntheticWorkspace, tmp_path):
+    # Value counts, null counts & the subtype crosstabs of every field, aggregated in the database or read
+    clientDir, pushdownDir = str(tmp_path / 'client'), str(tmp_path / 'pushdown')
+    assertRun(runSniffer(makeConfig(syntheticWorkspace, clientDir, PROFILE_SECTIONS)))
+    assertRun(runSniffer(makeConfig(syntheticWorkspace, pushdownDir, PROFILE_SECTIONS + ["sqlPushdownConfig"])))
+    assertSameOutputs(clientDir, pushdownDir)
+    assert len(readOutput(pushdownDir, "SubtypeCounts")) > 1
+
+
+
+def subtypeCountStatuses(syntheticWorkspace, outDir, categoryLimit, showMarginCount):
+    '''First cell of each feature class's STR01 rows: the status, or the crosstab header when the crosstab is written'''
+    with open(os.path.join(repoDir, 'DatabaseSniffer_config.json'), 'r') as configFile:
+        subtypeCountConfig = json.load(configFile)["globals"]["subtypeCountConfig"]
+    subtypeCountConfig.update({"run": "YES", "subtypeCountCategoryLimit": categoryLimit, "subtypeShowMarginCount": showMarginCount})
+    assertRun(runSniffer(makeConfig(syntheticWorkspace, outDir, ["subtypeCountConfig"], subtypeCountConfig=subtypeCountConfig)))
+    rows = readOutput(outDir, "SubtypeCounts")
+    fieldNameIndex = rows[0].index('Field Name')
+    statuses = {}
+    for row in rows[1:]:
+        if row[fieldNameIndex] == 'STR01':
+            statuses.setdefault(row[1], row[fieldNameIndex + 2])
+    return set(statuses.values())
+
+
+def test_total_column_counts_against_the_category_limit(syntheticWorkspace, tmp_path):
+    # STR01 has 7 categories (6 values & Null), 8 columns with the Total margin
+    for showMarginCount in ["YES", "NO"]:
+        assert subtypeCountStatuses(syntheticWorkspace, str(tmp_path / ('limit7' + showMarginCount)), 7, showMarginCount) == set(['EXCEEDED 7 CATEGORY LIMIT. Found 8'])
+        assert subtypeCountStatuses(syntheticWorkspace, str(tmp_path / ('limit8' + showMarginCount)), 8, showMarginCount) == set(['SUBTYPECD'])
+
+
+def readJobSummary(outDir):
+    with open(os.path.join(outDir, 'DatabaseSniffer_JobSummary.csv'), 'r', newline='') as csvFile:
+        return list(csv.DictReader(csvFile))[0]
+
+
+def test_incremental_runs_reuse_unchanged_feature_classes(syntheticWorkspace, tmp_path):
+    workspacePath = str(tmp_path / 'workspace.sqlite')
+    shutil.copyfile(syntheticWorkspace, workspacePath)
+    fullDir, incrementalDir = str(tmp_path / 'full'), str(tmp_path / 'incremental')
+    configPath = makeConfig(workspacePath, incrementalDir, PROFILE_SECTIONS + ["incrementalConfig"])
+
+    assertRun(runSniffer(configPath))
+    assert readJobSummary(incrementalDir)["featureClassesReused"] == '0'
+    assertRun(runSniffer(configPath))
+    assert readJobSummary(incrementalDir)["featureClassesReused"] == '4'
+    assertRun(runSniffer(makeConfig(workspacePath, fullDir, PROFILE_SECTIONS)))
+    assertSameOutputs(fullDir, incrementalDir)
+
+    # A changed row count invalidates that feature class only
+    connection = sqlite3.connect(workspacePath)
+    connection.execute('INSERT INTO SyntheticFc02 (STR01) VALUES (?)', ('V0',))
+    connection.commit()
+    connection.close()
+    assertRun(runSniffer(configPath))
+    assert readJobSummary(incrementalDir)["featureClassesReused"] == '3'
+    assertRun(runSniffer(makeConfig(workspacePath, fullDir, PROFILE_SECTIONS)))
+    assertSameOutputs(fullDir, incrementalDir)
+
+    # Results profiled under another config are not reused
+    with open(configPath, 'r') as configFile:
+        config = json.load(configFile)
+    config["globals"]["fieldCountConfig"]["fieldCountLimit"] = 3
+    with open(configPath, 'w') as configFile:
+        json.dump(config, configFile)
+    assertRun(runSniffer(configPath))
+    assert readJobSummary(incrementalDir)["featureClassesReused"] == '0'
+
+
+def test_resumed_run_matches_a_clean_run(syntheticWorkspace, tmp_path):
+    cleanDir, resumedDir = str(tmp_path / 'clean'), str(tmp_path / 'resumed')
+    assertRun(runSniffer(makeConfig(syntheticWorkspace, cleanDir, PROFILE_SECTIONS)))
+
+    resumedConfig = makeConfig(syntheticWorkspace, resumedDir, PROFILE_SECTIONS + ["checkpointConfig"])
+    crashScript = tmp_path / 'crashingSniffer.py'
+    crashScript.write_text(CRASH_SCRIPT.format(repoDir=repoDir))
+    assert runSniffer(resumedConfig, script=str(crashScript)).returncode != 0
+    assert os.path.exists(os.path.join(resumedDir, '_Test_RunJournal.jsonl'))
+
+    assertRun(runSniffer(resumedConfig, ['--resume']))
+    assert os.path.exists(os.path.join(resumedDir, '_Test_RunJournal.jsonl')) is False
+    assertSameOutputs(cleanDir, resumedDir)
+
+
+def test_plan_only_reads_the_metadata_cache(syntheticWorkspace, tmp_path):
+    outDir = str(tmp_path / 'out')
+    cacheFilepath = os.path.join(outDir, 'DatabaseSniffer_MetadataCache.sqlite')
+    config = makeConfig(syntheticWorkspace, outDir, ["featureCountConfig", "metadataCacheConfig"])
+
+    # Without a cache nothing is created
+    process = runSniffer(config, ['--plan'])
+    assertRun(process)
+    assert 'Total: 4 feature classes' in process.stdout
+    assert os.path.exists(outDir) is False
+
+    # An existing cache is read but left unchanged
+    assertRun(runSniffer(config))
+    with open(cacheFilepath, 'rb') as cacheFile:
+        cacheBytes = cacheFile.read()
+    process = runSniffer(config, ['--plan'])
+    assertRun(process)
+    assert 'Metadata cache: 1 reads from cache, 0 from the workspace' in process.stdout
+    with open(cacheFilepath, 'rb') as cacheFile:
+        assert cacheFile.read() == cacheBytes
+
+
+@pytest.mark.parametrize("sqlPushdown", ["NO", "YES"])
+def test_numeric_stats_do_not_change_the_counts(syntheticWorkspace, tmp_path, sqlPushdown):
+    baseDir, statsDir = str(tmp_path / 'base'), str(tmp_path / 'stats')
+    pushdownSections = ["sqlPushdownConfig"] if sqlPushdown == "YES" else []
+    assertRun(runSniffer(makeConfig(syntheticWorkspace, baseDir, PROFILE_SECTIONS + pushdownSections)))
+    assertRun(runSniffer(makeConfig(syntheticWorkspace, statsDir, PROFILE_SECTIONS + pushdownSections + ["numericStatsConfig"])))
+
+    baseRows, statsRows = readOutput(baseDir, "FieldCounts"), readOutput(statsDir, "FieldCounts")
+    header = baseRows[0]
+    statsColumns = [header.index(name) for name in ["Minimum", "Maximum", "Mean", "Standard Deviation", "Quantiles", "Histogram"]]
+    for baseRow, statsRow in zip(baseRows[1:], statsRows[1:]):
+        assert [cell for i, cell in enumerate(baseRow) if i not in statsColumns] == [cell for i, cell in enumerate(statsRow) if i not in statsColumns]
+        if statsRow[header.index("Field Type")] in ("Integer", "Double") and statsRow[header.index("Field Value Counts")].startswith('{'):
+            assert statsRow[header.index("Minimum")] != '' and statsRow[header.index("Quantiles")] != ''
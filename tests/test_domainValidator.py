@@ -0,0 +1,57 @@
+import numpy as np
+from ChunkedReader import ColumnChunk
+from DomainValidator import DomainRule, FieldDomainCheck, SAMPLE_VALUE_CAPACITY
+
+
+class Domain:
+    def __init__(self, name, domainType, codedValues=None, range=None):
+        self.name = name
+        self.domainType = domainType
+        self.codedValues = codedValues
+        self.range = range
+
+
+def columnChunk(fieldName, values):
+    nullMask = np.array([val is None for val in values])
+    array = np.array([0 if val is None else val for val in values])
+    return ColumnChunk(fieldName, 'Integer', array, nullMask)
+
+
+def test_rows_are_checked_against_the_domain_of_their_subtype():
+    fieldRule = DomainRule(Domain('Material', 'CodedValue', codedValues={1: 'Steel', 2: 'Iron'}))
+    rangeRule = DomainRule(Domain('Depth', 'Range', range=(0, 10)))
+    check = FieldDomainCheck('VAL', fieldRule, {1: rangeRule, 2: None})
+
+    values = [1, 2, 3, 3, None, 5, 12, -1, 7, 7]
+    subtypes = [0, 0, 0, 0, 0, 1, 1, 1, 2, None]
+    for start in range(0, len(values), 4):
+        check.addChunk(columnChunk('VAL', values[start:start + 4]), columnChunk('SUBTYPECD', subtypes[start:start + 4]))
+
+    # Subtype 0 (not a subtype) & NULL subtypes use the field domain, subtype 2 has no domain & isn't checked
+    assert [(subtypeCode, checked, violations, sorted(sampleValues)) for subtypeCode, rule, checked, violations, sampleValues in check.results()] == [
+        (0, 4, 2, [(3, 2, 2)]),
+        (1, 3, 2, [(-1, 1, 1), (12, 1, 1)]),
+        (None, 1, 1, [(7, 1, 1)])]
+
+
+def test_aggregated_counts_match_the_chunks():
+    fieldRule = DomainRule(Domain('Status', 'CodedValue', codedValues={'A': 'Active', 'I': 'Inactive'}))
+    values = np.random.default_rng(4).choice(['A', 'I', 'X', 'Y', 'Z'], size=500, p=[0.5, 0.3, 0.1, 0.06, 0.04])
+    chunked, aggregated = FieldDomainCheck('STATUS', fieldRule), FieldDomainCheck('STATUS', fieldRule)
+    for chunk in np.array_split(values, 6):
+        chunked.addChunk(ColumnChunk('STATUS', 'String', chunk.astype(object), np.zeros(len(chunk), dtype=bool)))
+    labels, counts = np.unique(values, return_counts=True)
+    aggregated.addCounts((None, val, valCount) for val, valCount in zip(labels.tolist(), counts.tolist()))
+    assert list(chunked.results()) == list(aggregated.results())
+    subtypeCode, rule, checked, violations, sampleValues = list(chunked.results())[0]
+    assert (checked, violations) == (500, int(np.isin(values, ['X', 'Y', 'Z']).sum()))
+
+
+def test_violation_samples_become_estimates_past_the_capacity():
+    fieldRule = DomainRule(Domain('Depth', 'Range', range=(0, 10)))
+    check = FieldDomainCheck('DEPTH', fieldRule)
+    check.addCounts([(None, 100, 50)] + [(None, 1000 + i, 1) for i in range(SAMPLE_VALUE_CAPACITY - 1)])
+    assert check.sampleValues(None, 1) == [(100, 50, 50)]
+    check.addCounts([(None, 5000 + i, 1) for i in range(10)])
+    (val, low, high), = check.sampleValues(None, 1)
+    assert val == 100 and low <= 50 <= high
@@ -0,0 +1,45 @@
+import os
+import numpy as np
+from DuplicateKeyFinder import KeyHashSet
+from FieldSketches import hashValues
+
+
+def exactCounts(hashes):
+    uniqueHashes, counts = np.unique(hashes, return_counts=True)
+    return dict(zip(uniqueHashes.tolist(), counts.tolist()))
+
+
+def test_spilled_counts_match_in_memory_counts(tmp_path):
+    keys = np.random.default_rng(5).integers(0, 40000, size=120000)
+    hashes = hashValues(keys)
+    counts = exactCounts(hashes)
+    duplicateCounts = [keyCount for keyCount in counts.values() if keyCount > 1]
+    countHashes = list(counts)[:20]
+
+    # About 65 entries in memory, so the runs are spilled many times
+    hashSet = KeyHashSet(memoryBudgetMB=0.001, spillPartitions=4, spillDir=str(tmp_path))
+    for chunk in np.array_split(hashes, 40):
+        hashSet.add(chunk)
+    assert hashSet.spilled
+    summary = hashSet.summarize(countHashes, topLimit=5)
+
+    assert summary.distinctKeyCount == len(counts)
+    assert summary.duplicateKeyCount == len(duplicateCounts)
+    assert summary.duplicateRowCount == sum(duplicateCounts)
+    assert summary.maxOccurrences == max(counts.values())
+    assert summary.hashCounts == dict((keyHash, counts[keyHash]) for keyHash in countHashes)
+    assert [keyCount for keyHash, keyCount in summary.topDuplicates] == sorted(counts.values(), reverse=True)[:5]
+
+    spillPath = hashSet.spillPath
+    hashSet.close()
+    assert os.path.exists(spillPath) is False
+
+
+def test_repeats_are_flagged_in_memory():
+    hashSet = KeyHashSet()
+    first = hashSet.add(hashValues(np.array([1, 2, 3, 2])))
+    second = hashSet.add(hashValues(np.array([4, 3, 5])))
+    assert first.tolist() == [False, False, False, True]
+    assert second.tolist() == [False, True, False]
+    summary = hashSet.summarize()
+    assert (summary.distinctKeyCount, summary.duplicateKeyCount, summary.duplicateRowCount) == (5, 2, 4)
@@ -0,0 +1,83 @@
+import csv
+from io import StringIO
+import pytest
+import ExcelStreamWriter
+from ExcelStreamWriter import ExcelStreamWriter as Workbook, CsvExcelSink
+from ResultRecords import ResultWriter
+openpyxl = pytest.importorskip("openpyxl")
+
+ROWS = [
+    ['Feature Class', 'Field Name', 'Field Value Counts', 'Feature Count'],
+    [],
+    ['Data exported 10/18/2026 11:02:29'],
+    [],
+    ['Fc01', 'NOTES', 'line1\n\nline3', '3'],
+    ['Fc01', 'NAME', '{\'a,b\': 2; \'say "hi"\': 1}', '12.5'],
+    ['Fc02', 'MEMO', 'x,\ny', ''],
+    ['Fc02', '"quoted"', '\n', '-4']
+]
+
+
+def csvText(rows):
+    buffer = StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(rows)
+    return buffer.getvalue()
+
+
+def trimRow(row):
+    '''Row without its blank trailing cells (a sheet's rows are read back padded to the widest row)'''
+    row = list(row)
+    while len(row) > 0 and row[-1] == '':
+        row.pop()
+    return row
+
+
+def sheetRows(excelFilepath):
+    workbook = openpyxl.load_workbook(excelFilepath)
+    return dict((worksheet.title, [trimRow('' if val is None else str(val) for val in row) for row in worksheet.iter_rows(values_only=True)])
+        for worksheet in workbook.worksheets)
+
+
+def expectedRows(rows):
+    # Numbers are written as numbers & empty cells as blanks. Blank lines are blank rows.
+    return [trimRow(str(CsvExcelSink.toCellValue(val) or '') for val in row) for row in rows]
+
+
+@pytest.mark.parametrize("writeSize", [1, 7, 10000])
+def test_sheet_rows_match_the_csv_records_for_any_split_of_the_text(tmp_path, writeSize):
+    text = csvText(ROWS)
+    csvFilepath, excelFilepath = str(tmp_path / 'output.csv'), str(tmp_path / 'output.xlsx')
+    sink = CsvExcelSink(open(csvFilepath, 'w', newline=''), Workbook(excelFilepath), 'Output', ownsExcelWriter=True)
+    for start in range(0, len(text), writeSize):
+        sink.write(text[start:start + writeSize])
+    sink.close()
+
+    with open(csvFilepath, 'r', newline='') as csvFile:
+        assert csvFile.read() == text
+    assert sink.rowsWritten == len(ROWS)
+    rows = sheetRows(excelFilepath)["Output"]
+    assert rows == expectedRows(ROWS)
+    assert rows[4][2] == 'line1\n\nline3'
+
+
+def test_text_without_a_final_line_break_is_the_last_row(tmp_path):
+    text = ResultWriter.formatRow(ROWS[0]) + '\n' + csvText(ROWS[4:]).rstrip('\n')
+    excelFilepath = str(tmp_path / 'output.xlsx')
+    sink = CsvExcelSink(None, Workbook(excelFilepath), 'Output', ownsExcelWriter=True)
+    sink.writeExcel(text)
+    sink.close()
+    assert sink.rowsWritten == 1 + len(ROWS[4:])
+    assert sheetRows(excelFilepath)["Output"][-1] == ['Fc02', '"quoted"', '\n', '-4']
+
+
+def test_full_sheets_continue_on_a_new_sheet_with_the_header(tmp_path, monkeypatch):
+    monkeypatch.setattr(ExcelStreamWriter, 'EXCEL_MAX_ROWS', 3)
+    rows = [['Name', 'Count']] + [['row{0}'.format(i), str(i)] for i in range(5)]
+    excelFilepath = str(tmp_path / 'output.xlsx')
+    sink = CsvExcelSink(None, Workbook(excelFilepath), 'Output', ownsExcelWriter=True)
+    sink.writeExcel(csvText(rows))
+    sink.close()
+    assert sheetRows(excelFilepath) == {
+        'Output': [['Name', 'Count'], ['row0', '0'], ['row1', '1']],
+        'Output_2': [['Name', 'Count'], ['row2', '2'], ['row3', '3']],
+        'Output_3': [['Name', 'Count'], ['row4', '4']]}
@@ -0,0 +1,50 @@
+from FieldMatcher import FieldMatcher
+
+
+def decisions(matcher, fieldNames):
+    return dict((fieldName, (matcher.decide(fieldName).included, matcher.decide(fieldName).excluded, matcher.decide(fieldName).counted))
+        for fieldName in fieldNames)
+
+
+def test_plain_entries_match_anywhere_in_the_name_ignoring_case():
+    matcher = FieldMatcher([], ['FacilityID', 'last_edit'])
+    assert decisions(matcher, ['FACILITYID', 'OLDFACILITYID2', 'LAST_EDITED_DATE', 'FACILITY', 'NAME']) == {
+        'FACILITYID': (False, True, False),
+        'OLDFACILITYID2': (False, True, False),
+        'LAST_EDITED_DATE': (False, True, False),
+        'FACILITY': (False, False, True),
+        'NAME': (False, False, True)}
+
+
+def test_glob_entries_match_the_whole_name():
+    matcher = FieldMatcher([], ['glob:*ID', 'glob:GlobalID?'])
+    assert decisions(matcher, ['FACILITYID', 'IDENTIFIER', 'GLOBALID2', 'GLOBALID']) == {
+        'FACILITYID': (False, True, False),
+        'IDENTIFIER': (False, False, True),
+        'GLOBALID2': (False, True, False),
+        'GLOBALID': (False, True, False)}
+
+
+def test_regex_entries_and_special_characters_of_plain_entries():
+    matcher = FieldMatcher([], ['re:^last_edit', 'A.B'])
+    assert decisions(matcher, ['LAST_EDITED_USER', 'PRE_LAST_EDIT', 'A.B_CODE', 'AXB_CODE']) == {
+        'LAST_EDITED_USER': (False, True, False),
+        'PRE_LAST_EDIT': (False, False, True),
+        'A.B_CODE': (False, True, False),
+        'AXB_CODE': (False, False, True)}
+
+
+def test_include_list_decides_what_is_counted():
+    matcher = FieldMatcher(['type', 'glob:STATUS'], ['SUBTYPE'])
+    assert decisions(matcher, ['ASSETTYPE', 'SUBTYPE', 'STATUS', 'STATUSDATE', 'NAME']) == {
+        'ASSETTYPE': (True, False, True),
+        'SUBTYPE': (True, True, True),
+        'STATUS': (True, False, True),
+        'STATUSDATE': (False, False, False),
+        'NAME': (False, False, False)}
+
+
+def test_decisions_are_cached_by_field_name():
+    matcher = FieldMatcher([], ['ID'])
+    assert matcher.decide('FACILITYID') is matcher.decide('FACILITYID')
+    assert matcher.decide('FACILITYID') is not matcher.decide('NAME')
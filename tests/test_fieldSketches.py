@@ -0,0 +1,55 @@
+import numpy as np
+from FieldSketches import hashValues, HyperLogLog, SpaceSaving
+
+
+def objectArray(values):
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def test_text_hash_does_not_depend_on_the_other_values_of_the_chunk():
+    # A value hashes the same whatever the length of the longest value in its chunk
+    alone = hashValues(objectArray(['ab', 'x']))
+    withLongValue = hashValues(objectArray(['ab', 'a much longer value', 'x', '']))
+    assert alone[0] == withLongValue[0]
+    assert alone[1] == withLongValue[2]
+    # Values that are a prefix of each other (or padded with NUL characters) still differ
+    hashes = hashValues(objectArray(['a', 'a\x00', 'ab', '', 'é', 'e']))
+    assert len(set(hashes.tolist())) == 6
+
+
+def test_distinct_estimate_is_the_same_for_any_chunking():
+    rnd = np.random.default_rng(3)
+    values = objectArray(['V{0}'.format(code) * int(code % 7 + 1) for code in rnd.integers(0, 20000, size=60000).tolist()])
+    trueDistinct = len(set(values.tolist()))
+
+    whole = HyperLogLog(12)
+    whole.add(values)
+    chunked = HyperLogLog(12)
+    for chunk in np.array_split(values, 13):
+        chunked.add(chunk)
+    merged = HyperLogLog(12)
+    for chunk in np.array_split(values, 5):
+        part = HyperLogLog(12)
+        part.add(chunk)
+        merged.merge(part)
+
+    assert np.array_equal(whole.registers, chunked.registers)
+    assert np.array_equal(whole.registers, merged.registers)
+    # Relative standard error is about 1.04 / sqrt(4096) = 1.6%
+    assert abs(whole.estimate() - trueDistinct) / trueDistinct < 0.06
+
+
+def test_small_cardinalities_are_counted_exactly():
+    sketch = HyperLogLog(14)
+    for chunk in np.array_split(np.arange(1500) % 700, 4):
+        sketch.add(chunk)
+    assert sketch.estimate() == 700
+
+
+def test_top_values_are_exact_under_capacity():
+    sketch = SpaceSaving(10)
+    sketch.addCounts(objectArray(['a', 'b', 'c']), np.array([5, 3, 1]))
+    sketch.addCounts(objectArray(['b', 'd']), np.array([4, 2]))
+    assert sketch.topN(3) == [('b', 7, 7), ('a', 5, 5), ('d', 2, 2)]
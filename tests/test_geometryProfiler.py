@@ -0,0 +1,68 @@
+import numpy as np
+from ChunkedReader import ColumnChunk
+from GeometryProfiler import GeometryProfiler
+
+
+class Extent:
+    def __init__(self, XMin, YMin, XMax, YMax):
+        self.XMin, self.YMin, self.XMax, self.YMax = XMin, YMin, XMax, YMax
+
+
+class Geometry:
+    '''arcpy Geometry look-alike of a polygon'''
+
+    def __init__(self, pointCount, partCount=1, length=1.0, area=1.0, extent=(0.0, 0.0, 1.0, 1.0)):
+        self.pointCount = pointCount
+        self.partCount = partCount
+        self.length = length
+        self.area = area
+        self.extent = Extent(*extent) if pointCount > 0 else None
+
+
+def objectChunk(fieldName, values):
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return ColumnChunk(fieldName, 'Geometry', array, np.array([val is None for val in values]))
+
+
+def integerChunk(fieldName, values):
+    return ColumnChunk(fieldName, 'SmallInteger', np.array([0 if val is None else val for val in values]),
+        np.array([val is None for val in values]))
+
+
+def test_geometry_counts_per_subtype():
+    geometries = [Geometry(5), None, Geometry(0, partCount=0, length=0.0, area=0.0), Geometry(12, partCount=2, extent=(-3.0, 2.0, 4.0, 9.0)),
+        Geometry(4, length=0.0, area=0.0), None, Geometry(1, area=0.0, extent=(10.0, 10.0, 10.0, 10.0)), Geometry(300)]
+    subtypes = [1, 1, 1, 1, 2, 2, None, 2]
+
+    profiler = GeometryProfiler('Polygon', subtypeField=object())
+    for start in range(0, len(geometries), 3):
+        profiler.addChunk(objectChunk('SHAPE@', geometries[start:start + 3]), integerChunk('SUBTYPECD', subtypes[start:start + 3]))
+    assert profiler.rowCount == 8
+
+    counts = dict((subtypeCode, (stats.rowCount, stats.nullCount, stats.emptyCount, stats.zeroLengthCount, stats.zeroAreaCount, stats.multipartCount))
+        for subtypeCode, stats in profiler.results())
+    assert list(counts) == [1, 2, None]
+    assert counts == {1: (4, 1, 1, 0, 0, 1), 2: (3, 1, 0, 1, 1, 0), None: (1, 0, 0, 0, 1, 0)}
+
+    stats = profiler.subtypeStats[1]
+    assert stats.extent == [-3.0, 0.0, 4.0, 9.0]
+    assert stats.vertexDistribution() == [(4, 7, 1), (8, 15, 1)]
+    assert (stats.vertexStats.minValue, stats.vertexStats.maxValue, stats.partStats.maxValue) == (5, 12, 2)
+    assert profiler.subtypeStats[2].vertexDistribution() == [(4, 7, 1), (256, 511, 1)]
+
+
+def test_geometry_counts_without_subtypes_are_the_same_for_any_chunking():
+    rnd = np.random.default_rng(6)
+    geometries = [None if pointCount == 0 else Geometry(int(pointCount), partCount=int(pointCount % 3) + 1)
+        for pointCount in rnd.integers(0, 2000, size=1000).tolist()]
+    results = []
+    for chunkSize in [1000, 97]:
+        profiler = GeometryProfiler('Polyline')
+        for start in range(0, len(geometries), chunkSize):
+            profiler.addChunk(objectChunk('SHAPE@', geometries[start:start + chunkSize]))
+        (subtypeCode, stats), = profiler.results()
+        results.append((subtypeCode, stats.rowCount, stats.nullCount, stats.multipartCount, stats.vertexDistribution(), stats.extent))
+    assert results[0] == results[1]
+    assert results[0][1:4] == (1000, geometries.count(None), sum(1 for g in geometries if g is not None and g.partCount > 1))
+    assert sum(binCount for low, high, binCount in results[0][4]) == 1000 - geometries.count(None)
@@ -0,0 +1,44 @@
+import shutil
+import sqlite3
+from SqliteBackend import SqliteBackend
+from MetadataCache import MetadataCache, CachingBackend
+
+
+def readFieldNames(workspacePath, cachePath, fc='SyntheticFc01'):
+    '''Field names read through a new cached backend (as a new run would) & the backend's hits & misses'''
+    backend = SqliteBackend(workspacePath)
+    metadataCache = MetadataCache(cachePath)
+    cachingBackend = CachingBackend(backend, metadataCache)
+    try:
+        fieldNames = [field.name for field in cachingBackend.listFields(fc)]
+        return fieldNames, cachingBackend.hits, cachingBackend.misses
+    finally:
+        metadataCache.close()
+        backend.close()
+
+
+def test_schema_change_invalidates_the_cache(syntheticWorkspace, tmp_path):
+    workspacePath, cachePath = str(tmp_path / 'workspace.sqlite'), str(tmp_path / 'cache' / 'metadata.sqlite')
+    shutil.copy(syntheticWorkspace, workspacePath)
+
+    fieldNames, hits, misses = readFieldNames(workspacePath, cachePath)
+    assert (hits, misses) == (0, 1)
+    assert readFieldNames(workspacePath, cachePath) == (fieldNames, 1, 0)
+
+    # Data edits keep the fingerprint
+    connection = sqlite3.connect(workspacePath)
+    connection.execute('INSERT INTO SyntheticFc01 (STR01) VALUES (?)', ('NEW VALUE',))
+    connection.commit()
+    assert readFieldNames(workspacePath, cachePath) == (fieldNames, 1, 0)
+
+    # A new column changes the table definition & is read from the workspace
+    connection.execute('ALTER TABLE SyntheticFc01 ADD COLUMN NEWFIELD TEXT')
+    connection.commit()
+    assert readFieldNames(workspacePath, cachePath) == (fieldNames + ['NEWFIELD'], 0, 1)
+    assert readFieldNames(workspacePath, cachePath) == (fieldNames + ['NEWFIELD'], 1, 0)
+
+    # So does an edit of the schema side tables (a coded value domain)
+    connection.execute("UPDATE GDB_CodedValues SET codeName = codeName || ' (renamed)'")
+    connection.commit()
+    connection.close()
+    assert readFieldNames(workspacePath, cachePath) == (fieldNames + ['NEWFIELD'], 0, 1)
@@ -0,0 +1,69 @@
+import numpy as np
+from NumericStats import NumericStats
+from SqlAggregator import SqlAggregator, SqliteSQLExecute
+
+PROBABILITIES = [0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0]
+
+
+def addInChunks(stats, values, chunkCount):
+    for chunk in np.array_split(values, chunkCount):
+        stats.addValues(chunk)
+    return stats
+
+
+def test_quantiles_are_exact_while_distinct_values_fit():
+    values = np.random.default_rng(1).integers(-50, 400, size=20000).astype(np.float64)
+    stats = addInChunks(NumericStats(maxCentroids=1000), values, 7)
+    assert stats.exact
+    assert np.allclose(stats.quantiles(PROBABILITIES), np.quantile(values, PROBABILITIES))
+    assert stats.count == len(values)
+    assert stats.minValue == values.min() and stats.maxValue == values.max()
+    assert np.isclose(stats.mean, values.mean())
+    assert np.isclose(stats.standardDeviation, values.std(ddof=1))
+
+
+def test_compressed_quantiles_are_close():
+    values = np.random.default_rng(2).lognormal(3.0, 1.0, size=100000)
+    stats = addInChunks(NumericStats(maxCentroids=200), values, 11)
+    assert stats.exact is False
+    # Quantile estimates within 1% of the rank of the exact quantile
+    for p, estimate in zip(PROBABILITIES, stats.quantiles(PROBABILITIES)):
+        rank = np.searchsorted(np.sort(values), estimate) / float(len(values))
+        assert abs(rank - p) < 0.01
+    assert np.isclose(stats.mean, values.mean())
+    assert np.isclose(stats.standardDeviation, values.std(ddof=1))
+
+
+def test_merged_workers_match_one_pass():
+    values = np.random.default_rng(3).normal(10.0, 4.0, size=30000).round(1)
+    onePass = addInChunks(NumericStats(), values, 1)
+    merged = NumericStats()
+    for part in np.array_split(values, 4):
+        merged.merge(addInChunks(NumericStats(), part, 3))
+    assert np.allclose(merged.quantiles(PROBABILITIES), np.quantile(values, PROBABILITIES))
+    assert np.isclose(merged.mean, onePass.mean)
+    assert np.isclose(merged.standardDeviation, onePass.standardDeviation)
+    assert [binCount for low, high, binCount in merged.histogram(10)] == [binCount for low, high, binCount in onePass.histogram(10)]
+
+
+def test_database_summary_has_moments_only():
+    values = np.array([2.0, 4.0, 4.0, 99.0, 6.0])
+    stats = NumericStats()
+    shifted = values - values.min()
+    stats.addSummary(len(values), values.min(), values.max(), shifted.sum(), (shifted * shifted).sum())
+    assert np.isclose(stats.mean, values.mean())
+    assert np.isclose(stats.standardDeviation, values.std(ddof=1))
+    assert stats.quantiles([0.5]) == [None]
+    assert stats.histogram(10) == []
+
+
+def test_database_summary_of_large_values_with_a_small_spread():
+    values = 1e9 + np.random.default_rng(5).normal(0.0, 0.1, size=1000).round(3)
+    sqlExecutor = SqliteSQLExecute(':memory:')
+    sqlExecutor.execute('CREATE TABLE Fc01 (VAL DOUBLE)')
+    sqlExecutor.connection.executemany('INSERT INTO Fc01 VALUES (?)', [(val,) for val in values.tolist()])
+    stats = NumericStats()
+    stats.addSummary(*SqlAggregator(sqlExecutor).numericSummaries('Fc01', ['VAL'])['VAL'])
+    sqlExecutor.close()
+    assert np.isclose(stats.mean, values.mean(), rtol=0, atol=1e-6)
+    assert np.isclose(stats.standardDeviation, values.std(ddof=1), rtol=1e-6)
@@ -0,0 +1,25 @@
+import csv
+from io import StringIO
+from ResultRecords import FeatureClassResult, FieldCountResult, SubtypeCountResult, ResultWriter, CROSSTAB_SEPARATOR
+
+
+def test_values_with_commas_quotes_and_line_breaks_round_trip():
+    featureClassResult = FeatureClassResult('DATASET', 'Fc, "quoted"', 'Simple', 'Point', 3)
+    fieldResult = FieldCountResult(featureClassResult, 'NAME', 'Name, alias', 'String', '50', '0')
+    fieldResult.fieldCounts = str({'a,b': 2, 'say "hi"': 1})
+    fieldResult.topValues = 'line1\n\nline3'
+    subtypeResult = SubtypeCountResult(featureClassResult, 'NAME', ['1', 'x\r\ny', '', 'Total'])
+
+    resultWriter = ResultWriter()
+    resultWriter.writeRecords([featureClassResult, fieldResult, subtypeResult])
+    assert resultWriter.recordsWritten == 3
+
+    rows = list(csv.reader(StringIO(resultWriter.getvalue())))
+    assert rows == [[str(cell) for cell in record.cells()] for record in [featureClassResult, fieldResult, subtypeResult]]
+    assert rows[1][len(featureClassResult.cells()) + 5] == "{'a,b': 2, 'say \"hi\"': 1}"
+    assert 'line1\n\nline3' in rows[1]
+    assert rows[2][6] == CROSSTAB_SEPARATOR
+
+
+def test_header_row_has_no_line_break():
+    assert ResultWriter.formatRow(['Field Name', 'Count, Total', 'Say "hi"']) == 'Field Name,"Count, Total","Say ""hi"""'
@@ -0,0 +1,46 @@
+import numpy as np
+from RowSampler import SamplePlan, proportionBounds, normalQuantile
+
+
+def test_bounds_contain_the_sample_proportion_and_narrow_with_the_sample():
+    low, high = proportionBounds(30, 100, 100000)
+    assert low < 0.3 < high
+    smallWidth = high - low
+    low, high = proportionBounds(300, 1000, 100000)
+    assert low < 0.3 < high and high - low < smallWidth
+    # A value never seen still has a non-zero upper bound
+    assert proportionBounds(0, 1000, 100000)[1] > 0
+    # A sample of every row has no margin
+    assert proportionBounds(30, 100, 100) == (0.3, 0.3)
+
+
+def test_count_bounds_cover_the_true_count_at_the_confidence_level():
+    populationRows = 20000
+    rnd = np.random.default_rng(11)
+    # OIDs 1..populationRows, 12% of the rows have the value
+    hasValue = rnd.random(populationRows + 1) < 0.12
+    trueCount = int(hasValue[1:].sum())
+
+    covered = 0
+    trials = 400
+    for seed in range(trials):
+        plan = SamplePlan('OBJECTID', 1, populationRows, populationRows, 500, seed=seed, confidenceLevel=0.95)
+        plan.sampleRows = len(plan.sampleOids)
+        low, high = plan.countBounds(int(hasValue[plan.sampleOids].sum()))
+        covered += low <= trueCount <= high
+    assert covered / float(trials) >= 0.92
+
+
+def test_sample_oids_make_up_for_gaps_in_the_oid_range():
+    # Half of the OIDs between 1 & 20000 were deleted
+    plan = SamplePlan('OBJECTID', 1, 20000, 10000, 1000, seed=3)
+    assert len(plan.sampleOids) == 2000
+    assert len(np.unique(plan.sampleOids)) == 2000
+    assert plan.sampleOids.min() >= 1 and plan.sampleOids.max() <= 20000
+    assert list(plan.whereClauses(1500))[1].startswith('OBJECTID IN (')
+
+
+def test_normal_quantiles():
+    for probability, z in [(0.5, 0.0), (0.8, 0.8416212335729143), (0.95, 1.6448536269514722), (0.975, 1.959963984540054),
+            (0.995, 2.5758293035489004), (0.025, -1.959963984540054)]:
+        assert abs(normalQuantile(probability) - z) < 1e-9